@@ -33,7 +33,7 @@ class AeViz(Plotting):
     def movie(self, qt1=None, qt2=None, qt3=None, qt4=None, top_qt=None,
               fields: Literal['velocity', 'Bfield', 'all']=None,
               plane: Literal['xy', 'yz']='xz', 
-              start_time=None, end_time=None, lims=None):
+              start_time=None, end_time=None, lims=None, n_workers=None):
         if fields == 'all':
             vf, bf = True, True
         elif fields == 'velocity':
@@ -45,7 +45,8 @@ class AeViz(Plotting):
 
         self.make_movie(qt1=qt1, qt2=qt2, qt3=qt3, qt4=qt4, top=top_qt,
               plane=plane, start_time=start_time, lims=lims,
-              end_time=end_time, vfield=vf, Bfield=bf, top_time=True)
+              end_time=end_time, vfield=vf, Bfield=bf, top_time=True,
+              n_workers=n_workers)
 
     @fig_window_open
     def save_plot(self, name, kwargs_savefig={}, **kwargs):
@@ -1,4 +1,6 @@
 from AeViz.utils.files.file_utils import list_module_functions
+from AeViz.units.aerray import aerray
+from functools import wraps
 import numpy as np
 import os
 import types
@@ -9,6 +11,8 @@ class cell:
     Initialization parameters:
         path_folder: (string) path to the simulation folder
         dim: (int, optional) dimension of the supernova simulation (1, 2, or 3)
+    The grid quantities are computed once for each ghost cells status
+    and then returned as read-only arrays sharing the cached data.
     """
     def __init__(self, path_folder=None, dim=None,
                  radius=None, theta=None, phi=None,
@@ -30,18 +34,16 @@ class cell:
                                                           'grid.e.dat'))[:, 1:]
             self.__radius_file = np.loadtxt(os.path.join(self.path_grid,
                                                          'grid.x.dat'))[:, 1:]
+            theta_file = np.loadtxt(os.path.join(self.path_grid, 'grid.y.dat'))
             try:
-                self.__theta_file = np.loadtxt(os.path.join(self.path_grid,
-                                                            'grid.y.dat'))[:, 1:]
+                self.__theta_file = theta_file[:, 1:]
             except:
-                self.__theta_file = np.loadtxt(os.path.join(self.path_grid,
-                                                            'grid.y.dat'))[1:]
+                self.__theta_file = theta_file[1:]
+            phi_file = np.loadtxt(os.path.join(self.path_grid, 'grid.z.dat'))
             try:
-                self.__phi_file = np.loadtxt(os.path.join(self.path_grid,
-                                                          'grid.z.dat'))[:, 1:]
+                self.__phi_file = phi_file[:, 1:]
             except:
-                self.__phi_file = np.loadtxt(os.path.join(self.path_grid, 
-                                                          'grid.z.dat'))[1:]
+                self.__phi_file = phi_file[1:]
         else:
             assert radius.ndim == 2, "Radius must be a 3D array"
             assert theta.ndim == 2, "Theta must be a 3D array"
@@ -57,6 +59,7 @@ class cell:
             if (self.__phi_file).size > 4:
                 dim += 1
         self.dim = dim
+        self.__geometry = {}
         if neu >= 1:
             self.__load_neu_methods()
         if geom == 1:
@@ -72,6 +75,36 @@ class cell:
         """
         return self.dim
     
+    def __cached_method(self, func):
+        """
+        Binds a grid method taking the ghost object, whose results are
+        kept in the geometry cache under the method name and the ghost
+        cells status. The cached arrays are read-only, each call returns
+        a new aerray sharing their data.
+        """
+        @wraps(func)
+        def method(ghost):
+            key = (func.__name__,
+                   tuple(ghost.save_ghost_cells_status().values()))
+            if key not in self.__geometry:
+                data = func(self, ghost)
+                if isinstance(data, np.ndarray):
+                    data.flags.writeable = False
+                self.__geometry[key] = data
+            data = self.__geometry[key]
+            if isinstance(data, aerray):
+                data = data.view(aerray)
+                if isinstance(data.limits, list):
+                    data.limits = data.limits.copy()
+            return data
+        return method
+
+    def clear_geometry_cache(self):
+        """
+        Empties the geometry cache.
+        """
+        self.__geometry = {}
+
     def __load_neu_methods(self):
         """
         Method that loads the neutrino grid methods
@@ -88,7 +121,7 @@ class cell:
         import AeViz.cell.cell_methods.cartesian_methods
         funcs = list_module_functions(AeViz.cell.cell_methods.cartesian_methods)
         for name, obj in funcs:
-            setattr(self, name, types.MethodType(obj, self))
+            setattr(self, name, self.__cached_method(obj))
 
     def __load_spherical_methods(self):
         """
@@ -97,4 +130,4 @@ class cell:
         import AeViz.cell.cell_methods.spherical_methods
         funcs = list_module_functions(AeViz.cell.cell_methods.spherical_methods)
         for name, obj in funcs:
-            setattr(self, name, types.MethodType(obj, self))
\ No newline at end of file
+            setattr(self, name, self.__cached_method(obj))
\ No newline at end of file
@@ -75,6 +75,37 @@ class ghost:
                            'phi': [self.p_l, self.p_r]}
         del updated_parameters
         
+    def restrict(self, **kwargs):
+        """
+        Method that removes further cells on top of the current ones,
+        to restrict the arrays to a region of the grid. Unlike
+        update_ghost_cells, the number of cells is added to the current
+        status and it is not bounded by the number of ghost cells. To
+        undo it, save the status beforehand and restore it with
+        update_ghost_cells.
+        Parameters:
+            r_l: (int) cells removed at the beginning of the radius
+                array
+            r_r: (int) cells removed at the end of the radius array
+            t_l: (int) cells removed at the beginning of the theta
+                angle array
+            t_r: (int) cells removed at the end of the theta angle
+                array
+            p_l: (int) cells removed at the beginning of the phi angle
+                array
+            p_r: (int) cells removed at the end of the phi angle array
+        """
+        for key, value in kwargs.items():
+            if key not in self.__options_default:
+                raise TypeError(key + " is not a valid option")
+            if value < 0:
+                raise TypeError("The number of removed cells MUST be " \
+                    "positive")
+            self.__setattr__(key, self.__getattribute__(key) + int(value))
+        self.__options_1D = {'radius': [self.r_l, self.r_r],
+                           'theta': [self.t_l, self.t_r],
+                           'phi': [self.p_l, self.p_r]}
+
     def save_ghost_cells_status(self):
         """
         Method that allows to save the current ghost cells options
@@ -95,6 +126,28 @@ class ghost:
         """
         return self.__options_1D
 
+    def hyperslab(self, dim, *selection):
+        """
+        Class method that returns the selection of the physical cells of
+        a dataset of the timestep files, whose first three axes are phi,
+        theta and radius. Slicing the dataset with it reads only the
+        physical cells, in a contiguous array.
+        Parameters:
+            dim: (int) dimension of the supernova simulation
+            selection: (optional) selection of the remaining axes, as
+            in dataset[..., selection]
+        Method result:
+            hyperslab: (tuple) selection of the dataset
+        """
+        assert dim in (1, 2, 3), "Simulation MUST be 1, 2 or 3D"
+        spatial = [slice(None), slice(None),
+                   slice(self.r_l, -self.r_r if self.r_r else None)]
+        if dim > 1:
+            spatial[1] = slice(self.t_l, -self.t_r if self.t_r else None)
+        if dim > 2:
+            spatial[0] = slice(self.p_l, -self.p_r if self.p_r else None)
+        return tuple(spatial) + (Ellipsis, ) + selection
+
     def remove_ghost_cells(self, array, dim, quantity_1D: 
                            Literal['radius', 'theta', 'phi'] = None):
         """
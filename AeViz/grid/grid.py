@@ -1,4 +1,3 @@
-from scipy.interpolate import (griddata, interp1d)
 import numpy as np
 from AeViz.units import aerray, u
 
@@ -25,17 +24,20 @@ class grid:
         self.radius = radius
         self.theta = theta
         self.phi = phi
+        ## Radial windows (see region_of_interest) can have less than
+        ## 50 cells
+        r_0_log = self.radius[min(50, len(self.radius) - 1)]
         if self.dim == 1:
             self.__default_grid_parameters = {'interpolation_method': 'cubic',
                                     'r_0': self.radius[0],
-                                    'r_0_log': self.radius[50],
+                                    'r_0_log': r_0_log,
                                     'r_max': self.radius[-1],
                                     'n_r_lin': int(0.5*self.radius.shape[0]),
                                     'n_r_log': int(0.5*self.radius.shape[0])}
         elif self.dim == 2:
             self.__default_grid_parameters = {'interpolation_method': 'cubic',
                                     'r_0': self.radius[0],
-                                    'r_0_log': self.radius[50],
+                                    'r_0_log': r_0_log,
                                     'r_max': self.radius[-1],
                                     'n_r_lin': int(0.5*self.radius.shape[0]),
                                     'n_r_log': int(0.5*self.radius.shape[0]),
@@ -45,7 +47,7 @@ class grid:
         else:
             self.__default_grid_parameters = {'interpolation_method': 'cubic',
                                     'r_0': self.radius[0],
-                                    'r_0_log': self.radius[50],
+                                    'r_0_log': r_0_log,
                                     'r_max': self.radius[-1],
                                     'n_r_lin': int(0.5*self.radius.shape[0]),
                                     'n_r_log': int(0.5*self.radius.shape[0]),
@@ -127,6 +129,7 @@ class grid:
         return self.__3D_cartesian_grid(r_new, theta_new, phi_new)
     
     def interpolate_quantity(self, grid, quantity, new_grid):
+        from scipy.interpolate import griddata, interp1d
         if self.dim == 1:
             f = interp1d(grid, quantity, 'cubic')
             return f(new_grid)
@@ -87,6 +87,7 @@ class Data(object):
             if type(self.loaded_data) is h5py.File:
                 self.loaded_data.close()
             elif type(self.loaded_data) is Simulation:
+                self.loaded_data.close_files()
                 del self.loaded_data
             self.loaded_data = None
     
@@ -0,0 +1,110 @@
+"""
+This module contains the functions that reduce the lines and the meshes
+to the resolution at which they are drawn, keeping their extrema. This
+is a utility module.
+
+"""
+import numpy as np
+from AeViz.units import aerray
+
+def axes_pixels(ax):
+    """
+    Returns the width and the height of the axes, in pixels.
+    """
+    return (max(int(ax.bbox.width), 1), max(int(ax.bbox.height), 1))
+
+def visible_slice(x, lims):
+    """
+    Slice of the increasing coordinate x that covers the interval lims,
+    with one more point on each side so that the lines and the cells
+    reach the borders of the axes.
+    """
+    if lims is None:
+        return slice(None)
+    start = np.searchsorted(x, min(lims), 'left') - 1
+    stop = np.searchsorted(x, max(lims), 'right') + 1
+    return slice(max(start, 0), min(stop, len(x)))
+
+def _is_increasing(x):
+    return len(x) < 2 or bool(np.all(np.diff(x) > 0))
+
+def minmax_indices(x, y, n_buckets, xlim=None):
+    """
+    Indices of the points of the line (x, y) to draw on n_buckets
+    pixels. The visible points are split in n_buckets groups with the
+    same number of points, and the minimum and the maximum of each
+    group are kept in their original order, together with the first and
+    the last point. Peaks (e.g. the bounce spike) are therefore never
+    lost. Lines with x not increasing, or already with less than four
+    points per bucket, are kept whole.
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    if x.ndim != 1 or y.shape != x.shape or not _is_increasing(x):
+        return np.arange(len(y))
+    visible = visible_slice(x, xlim)
+    indices = np.arange(len(x))[visible]
+    if len(indices) <= 4 * n_buckets:
+        return indices
+    y = y[visible]
+    bucket_size = len(y) // n_buckets
+    n_full = bucket_size * n_buckets
+    buckets = y[:n_full].reshape(n_buckets, bucket_size)
+    offsets = np.arange(n_buckets) * bucket_size
+    selected = [np.argmin(buckets, axis=1) + offsets,
+                np.argmax(buckets, axis=1) + offsets]
+    if n_full < len(y):
+        selected += [np.array([n_full + np.argmin(y[n_full:]),
+                               n_full + np.argmax(y[n_full:])])]
+    selected = np.unique(np.concatenate(selected + [np.array([0,
+                                                             len(y) - 1])]))
+    return indices[selected]
+
+def _block_extrema(data, factor, axis):
+    """
+    Reduces the axis of data by factor, keeping the value with the
+    largest magnitude of each block.
+    """
+    if factor <= 1:
+        return data
+    starts = np.arange(0, data.shape[axis], factor)
+    maxima = np.maximum.reduceat(data, starts, axis=axis)
+    minima = np.minimum.reduceat(data, starts, axis=axis)
+    return np.where(np.abs(minima) > np.abs(maxima), minima, maxima)
+
+def _block_centres(x, factor):
+    starts = np.arange(0, len(x), factor)
+    return np.add.reduceat(x, starts) / np.diff(np.append(starts, len(x)))
+
+def decimate_mesh(x, y, data, shape, xlim=None, ylim=None):
+    """
+    Reduces the mesh of data, defined at the centres x and y, to at most
+    shape=(nx, ny) cells within the limits. The cells are grouped in
+    blocks, placed at the mean of their centres, and each block takes
+    the value with the largest magnitude, so that the peaks stay
+    visible.
+    Returns the visible slices of x and y, the reduction factors and
+    the reduced data, to be passed with the coordinates to
+    decimate_centres.
+    """
+    x, y, data = np.asarray(x), np.asarray(y), np.asarray(data)
+    xvis = visible_slice(x, xlim) if _is_increasing(x) else slice(None)
+    yvis = visible_slice(y, ylim) if _is_increasing(y) else slice(None)
+    data = data[yvis, xvis]
+    fx = int(np.ceil(data.shape[1] / shape[0]))
+    fy = int(np.ceil(data.shape[0] / shape[1]))
+    data = _block_extrema(_block_extrema(data, fx, 1), fy, 0)
+    return xvis, yvis, fx, fy, data
+
+def decimate_centres(x, visible, factor):
+    """
+    Visible centres of x grouped in blocks of factor cells, as done by
+    decimate_mesh. The units of an aerray are kept.
+    """
+    x = x[visible]
+    if factor <= 1:
+        return x
+    centres = _block_centres(np.asarray(x), factor)
+    if isinstance(x, aerray):
+        return aerray(centres, x.unit, x.name, x.label, x.cmap, x.limits,
+                      x.log)
+    return centres
@@ -2,11 +2,15 @@ from AeViz.plot_utils.plot_creation import PlotCreation
 from matplotlib import ticker
 import numpy as np
 from matplotlib.colors import LogNorm, SymLogNorm, Normalize
+from matplotlib.collections import QuadMesh
 from AeViz.plot_utils.limits_utils import set2Dlims
 from AeViz.plot_utils.figure_utils import cbar_loaction
 from AeViz.units import aerray
 from AeViz.units import u
 from AeViz.plot_utils.utils import get_1Dhist_data, get_2Dhist_data
+from AeViz.plot_utils.decimation_utils import (axes_pixels, minmax_indices,
+                                               decimate_mesh,
+                                               decimate_centres)
 import warnings
 
 
@@ -24,6 +28,15 @@ class PlottingUtils(PlotCreation):
         containing the plot parameters.
         """
         self.__reset_params()
+        ## Draw the 2D slices as meshes instead of contourf, so that
+        ## their data can be replaced in place (e.g. in the movies)
+        self.mesh2D = False
+        ## Hammer projection of the (phi, theta) grids, kept across the
+        ## figures as it depends on the grid only
+        self.hammer_meshes = {}
+        ## Draw the lines and the meshes reduced to the resolution of
+        ## the axes (see set_decimation)
+        self.decimation = False
         PlotCreation.__init__(self)
 
     def to(self, unit, plot='A', axis=None):
@@ -93,6 +106,10 @@ class PlottingUtils(PlotCreation):
                                 unit)
                     except:
                         pass
+        if axis is None and all([d in [2, -1, -2, -3, -52] for d in
+                                 self.plot_dim[plot]]) and \
+            self.__update_colors(plot):
+            return
         self.__redo_plot()
 
     def xlim(self, xlim, axd_letter="A"):
@@ -203,27 +220,32 @@ class PlottingUtils(PlotCreation):
                 self.cbar_log[ax_letter] = True
             else:
                 self.cbar_log[ax_letter] = False
-            self.__redo_plot()
+            if not self.__update_colors(ax_letter):
+                self.__redo_plot()
 
     def rebin(self, bins, axd_letter="A"):
         self.nbins[axd_letter] = bins
-        self.__redo_plot()
+        if not self.__update_colors(axd_letter):
+            self.__redo_plot()
 
     def cmap(self, cmap, axd_letter="A"):
         """
         Change the colormap of the plot at the corresponding letter, if
-        it is a 2D plot. The plot then needs to be redone.
+        it is a 2D plot. Only its colors are updated.
         """
         self.cmap_color[axd_letter] = cmap
-        self.__redo_plot()
+        if not self.__update_colors(axd_letter, cmap_only=True):
+            self.__redo_plot()
 
     def cbar_levels(self, cbar_levels, axd_letter="A"):
         """
         Change the colorbar levels of the plot at the corresponding
-        letter, if it is a 2D plot. The plot then needs to be redone.
+        letter, if it is a 2D plot. Only its colored data and colorbar
+        are drawn again.
         """
         self.cbar_lv[axd_letter] = cbar_levels
-        self.__redo_plot()
+        if not self.__update_colors(axd_letter):
+            self.__redo_plot()
 
     def title(self, title, axd_letter='A'):
         """
@@ -256,6 +278,19 @@ class PlottingUtils(PlotCreation):
             self.axd[axd_letter].set_ylabel(ylabel + f' [{unit:latex}]')
         self.__save_labels(axd_letter)
 
+    def set_decimation(self, decimation=True):
+        """
+        Switches the decimation of the plots on or off. When it is on,
+        the lines are drawn with the minimum and the maximum of the
+        points falling on each pixel of the axes, and the meshes reduced
+        to a cell per pixel, keeping the values with the largest
+        magnitude, and rasterized in the vector formats. They are
+        decimated again when the limits of the axes change.
+        """
+        self.decimation = decimation
+        if self.fig_is_open() and self.plot_dim:
+            self.__redo_plot()
+
     def update_legend(self, legend, axd_letter="A", loc='upper right', ncols=1):
         """
         Plot the legend of the plot at the corresponding letter. The
@@ -308,6 +343,7 @@ class PlottingUtils(PlotCreation):
             grid = getattr(data, plane)
         if ax_letter not in self.plot_dim:
             self.file[ax_letter] = [file]
+            self.quantity[ax_letter] = [kwargs.get('quantity')]
             self.plane[ax_letter] = [plane]
             self.grid[ax_letter] = [grid]
             self.data[ax_letter] = [data.data]
@@ -344,6 +380,7 @@ class PlottingUtils(PlotCreation):
             prevent duplicates for the 1D cases
             """
             self.file[ax_letter].append(file)
+            self.quantity[ax_letter].append(kwargs.get('quantity'))
             self.plane[ax_letter].append(plane)
             self.grid[ax_letter].append(grid)
             self.data[ax_letter].append(data.data)
@@ -391,6 +428,7 @@ class PlottingUtils(PlotCreation):
         """
         keys = [
             self.file,
+            self.quantity,
             self.plane,
             self.plot_dim,
             self.grid,
@@ -413,7 +451,9 @@ class PlottingUtils(PlotCreation):
             self.line_color,
             self.lw,
             self.field,
-            self.field_type]
+            self.field_type,
+            self.field_artists,
+            self.decimated]
         for key in keys:
             if ax_letter_out in key:
                 key[ax_letter_in] = key[ax_letter_out]
@@ -424,6 +464,7 @@ class PlottingUtils(PlotCreation):
         """
         keys = [
             self.file,
+            self.quantity,
             self.plane,
             self.plot_dim,
             self.grid,
@@ -446,7 +487,9 @@ class PlottingUtils(PlotCreation):
             self.line_color,
             self.lw,
             self.field,
-            self.field_type]
+            self.field_type,
+            self.field_artists,
+            self.decimated]
         for key in keys:
             if ax_letter in key:
                 key.pop(ax_letter)
@@ -457,6 +500,7 @@ class PlottingUtils(PlotCreation):
         clears them.
         """
         self.file = {}
+        self.quantity = {}
         self.plane = {}
         self.plot_dim = {}
         self.grid = {}
@@ -483,6 +527,13 @@ class PlottingUtils(PlotCreation):
         self.field_type = {}
         self.sim_dimension = {}
         self.nbins = {}
+        ## Colored artist (contourf or mesh) and colorbar of each plot
+        self.mappables = {}
+        self.cbars = {}
+        ## Arrows or field lines of each field of the plot
+        self.field_artists = {}
+        ## Decimated lines and mesh of each plot
+        self.decimated = {}
 
     def __normalize_format_cbar(self, ax_letter):
         """
@@ -565,16 +616,29 @@ class PlottingUtils(PlotCreation):
             sh = 'auto'
         else:
             sh = 'gouraud'
-        pcm = self.axd[ax_letter].pcolormesh(self.grid[ax_letter][indx][0],
-                                             self.grid[ax_letter][indx][1],
-                                             self.data[ax_letter][indx].value,
-                                             norm=norm,
-                                             cmap=self.cmap_color[ax_letter],
-                                             shading=sh)
+        if self.axd[ax_letter].name == 'hammer' and sh == 'gouraud':
+            X, Y = self.__hammer_mesh(ax_letter, indx)
+            ## The projected coordinates carry no units, the ones of the
+            ## axes (and so their labels) come from the grid
+            self.axd[ax_letter].xaxis.update_units(
+                self.grid[ax_letter][indx][0])
+            self.axd[ax_letter].yaxis.update_units(
+                self.grid[ax_letter][indx][1])
+            ## The coordinates are already projected, only the affine
+            ## part of the transformation is left to the drawing
+            pcm = self.axd[ax_letter].pcolormesh(
+                X, Y, self.data[ax_letter][indx].value, norm=norm,
+                cmap=self.cmap_color[ax_letter], shading=sh,
+                transform=self.axd[ax_letter].transAffine +
+                self.axd[ax_letter].transAxes)
+        else:
+            pcm = self.__draw_mesh(ax_letter, indx, norm=norm,
+                                   cmap=self.cmap_color[ax_letter], shading=sh)
         cbar = self.fig.colorbar(pcm, cax=self.axd[ax_letter.lower()],
                                  format=ticker.FuncFormatter(fmt),
                                  location=cbar_loaction(
                                      self.cbar_position[ax_letter]))
+        self.mappables[ax_letter], self.cbars[ax_letter] = pcm, cbar
         if self.data[ax_letter][indx].unit == u.dimensionless_unscaled:
             ulab = ''
         else:
@@ -582,28 +646,139 @@ class PlottingUtils(PlotCreation):
         cbar.set_label(self.cbar_label[ax_letter])
         self.set_labels(ax_letter + ulab)
 
+    def __hammer_mesh(self, ax_letter, indx):
+        """
+        Returns the (phi, theta) grid of the plot at the corresponding
+        letter and index, projected on the Hammer plane. The projection
+        is computed once per grid and stored in hammer_meshes.
+        """
+        phi, theta = (np.asarray(self.grid[ax_letter][indx][0].value),
+                      np.asarray(self.grid[ax_letter][indx][1].value))
+        key = (phi.tobytes(), theta.tobytes())
+        if key not in self.hammer_meshes:
+            X, Y = np.meshgrid(phi, theta)
+            X, Y = self.axd[ax_letter].transProjection.transform(
+                np.column_stack((X.ravel(), Y.ravel()))).T
+            X, Y = X.reshape(len(theta), -1), Y.reshape(len(theta), -1)
+            X.flags.writeable, Y.flags.writeable = False, False
+            self.hammer_meshes[key] = (X, Y)
+        return self.hammer_meshes[key]
+
+    def __draw_mesh(self, ax_letter, indx, **kwargs):
+        """
+        Draws the indx-th mesh of the plot at the corresponding letter,
+        decimated to the resolution of the axes within its current
+        limits if the decimation is on, and returns it.
+        """
+        X, Y = self.grid[ax_letter][indx]
+        data = self.data[ax_letter][indx].value
+        if not self.decimation or np.ndim(X) != 1 or np.ndim(Y) != 1 or \
+            data.shape != (len(Y), len(X)):
+            return self.axd[ax_letter].pcolormesh(X, Y, data, **kwargs)
+        ax = self.axd[ax_letter]
+        ax.xaxis.update_units(X)
+        ax.yaxis.update_units(Y)
+        ## Limits still to be autoscaled do not crop the mesh
+        xlim = None if ax.get_autoscalex_on() else ax.get_xlim()
+        ylim = None if ax.get_autoscaley_on() else ax.get_ylim()
+        xvis, yvis, fx, fy, data = decimate_mesh(ax.convert_xunits(X),
+                                                 ax.convert_yunits(Y), data,
+                                                 axes_pixels(ax), xlim, ylim)
+        entry = self.__decimation_entry(ax_letter)
+        entry['mesh'] = (indx, kwargs, xlim, ylim, axes_pixels(ax))
+        return ax.pcolormesh(decimate_centres(X, xvis, fx),
+                             decimate_centres(Y, yvis, fy), data,
+                             rasterized=True, **kwargs)
+
+    def __plot_line(self, ax_letter, x, y, **kwargs):
+        """
+        Plots the line (x, y) on the axes at the corresponding letter,
+        decimated to their width if the decimation is on.
+        """
+        if not self.decimation:
+            return self.axd[ax_letter].plot(x, y, **kwargs)
+        indices = minmax_indices(x, y, axes_pixels(self.axd[ax_letter])[0])
+        lines = self.axd[ax_letter].plot(x[indices], y[indices], **kwargs)
+        self.__decimation_entry(ax_letter)['lines'].append((lines[0], x, y))
+        return lines
+
+    def __decimation_entry(self, ax_letter):
+        """
+        Decimated lines and mesh of the axes at the corresponding letter.
+        The first time, the axes are set to decimate them again when
+        their limits change.
+        """
+        ax = self.axd[ax_letter]
+        entry = self.decimated.get(ax_letter)
+        if entry is None or entry['axes'] is not ax:
+            entry = {'axes': ax, 'letter': ax_letter, 'lines': [],
+                     'mesh': None}
+            ax.callbacks.connect('xlim_changed',
+                                 lambda ax: self.__redecimate(entry))
+            ax.callbacks.connect('ylim_changed',
+                                 lambda ax: self.__redecimate(entry))
+            self.decimated[ax_letter] = entry
+        return entry
+
+    def __redecimate(self, entry):
+        """
+        Decimates again the lines and the mesh of the entry within the
+        new limits of its axes.
+        """
+        ax_letter, ax = entry['letter'], entry['axes']
+        if self.decimated.get(ax_letter) is not entry:
+            return
+        xlim = None if ax.get_autoscalex_on() else ax.get_xlim()
+        for (line, x, y) in entry['lines']:
+            indices = minmax_indices(ax.convert_xunits(x), y,
+                                     axes_pixels(ax)[0], xlim)
+            line.set_data(x[indices], y[indices])
+        if entry['mesh'] is None or ax_letter not in self.mappables:
+            return
+        indx, kwargs, old_xlim, old_ylim, pixels = entry['mesh']
+        ylim = None if ax.get_autoscaley_on() else ax.get_ylim()
+        if (xlim, ylim, axes_pixels(ax)) == (old_xlim, old_ylim, pixels):
+            return
+        ## The colorbar keeps the normalization and the colormap of the
+        ## new mesh, which are the same objects
+        kwargs['norm'] = self.mappables[ax_letter].norm
+        kwargs['cmap'] = self.mappables[ax_letter].cmap
+        self.mappables[ax_letter].remove()
+        pcm = self.__draw_mesh(ax_letter, indx, **kwargs)
+        cbar = self.cbars[ax_letter]
+        cbar.mappable, pcm.colorbar = pcm, cbar
+        pcm.colorbar_cid = pcm.callbacks.connect('changed', cbar.update_normal)
+        self.mappables[ax_letter] = pcm
+
     def __plot2Dfield(self, ax_letter, grid_number):
         """
         Add a 2D field to the plot. It can be a velocity field or a
         magnetic field.
         """
+        self.field_artists[ax_letter] = []
         for i in range(len(self.field_type[ax_letter])):
-            if self.field_type[ax_letter][i] == 'v':
-                skip = (slice(None, None, 5), slice(None, None, 5))
-                self.axd[ax_letter].quiver(self.grid[ax_letter][grid_number][0][skip],
-                                           self.grid[ax_letter][grid_number][1][skip],
-                                           self.field[ax_letter][i][0][skip].value,
-                                           self.field[ax_letter][i][1][skip].value,
-                                           linewidths=0.01,
-                                           color='black',
-                                           angles='xy'
-                                           )
-            elif self.field_type[ax_letter][i] == 'B':
-                self.axd[ax_letter].contour(self.grid[ax_letter][grid_number][0],
-                                            self.grid[ax_letter][grid_number][1],
-                                            self.field[ax_letter][i], 45,
-                                            colors='black',
-                                            linewidths=0.2)
+            self.field_artists[ax_letter].append(
+                self.__draw_field(ax_letter, grid_number, i))
+
+    def __draw_field(self, ax_letter, grid_number, i):
+        """
+        Draws the i-th field of the plot and returns its artist.
+        """
+        grid = self.grid[ax_letter][grid_number]
+        field = self.field[ax_letter][i]
+        if self.field_type[ax_letter][i] == 'v':
+            skip = (slice(None, None, 5), slice(None, None, 5))
+            return self.axd[ax_letter].quiver(grid[0][skip], grid[1][skip],
+                                              field[0][skip].value,
+                                              field[1][skip].value,
+                                              linewidths=0.01,
+                                              color='black',
+                                              angles='xy'
+                                              )
+        elif self.field_type[ax_letter][i] == 'B':
+            return self.axd[ax_letter].contour(grid[0], grid[1], field, 45,
+                                               colors='black',
+                                               linewidths=0.2)
 
     def __plot2D(self, ax_letter):
         """
@@ -620,7 +795,16 @@ class PlottingUtils(PlotCreation):
             indx = self.plot_dim[ax_letter].index(2)
         except:
             indx = self.plot_dim[ax_letter].index(-1)
-        pcm = self.axd[ax_letter].contourf(self.grid[ax_letter][indx][0],
+        if self.mesh2D:
+            pcm = self.axd[ax_letter].pcolormesh(
+                                           self.grid[ax_letter][indx][0],
+                                           self.grid[ax_letter][indx][1],
+                                           self.data[ax_letter][indx].value,
+                                           norm=norm,
+                                           cmap=self.cmap_color[ax_letter],
+                                           shading='gouraud')
+        else:
+            pcm = self.axd[ax_letter].contourf(self.grid[ax_letter][indx][0],
                                            self.grid[ax_letter][indx][1],
                                            self.data[ax_letter][indx].value,
                                            norm=norm,
@@ -632,7 +816,8 @@ class PlottingUtils(PlotCreation):
         cbar = self.fig.colorbar(pcm, cax=self.axd[ax_letter.lower()],
                                  format=ticker.FuncFormatter(fmt),
                                  location=cbar_loaction(
-            self.cbar_position[ax_letter]))
+            self.cbar_position[ax_letter]), extend='both')
+        self.mappables[ax_letter], self.cbars[ax_letter] = pcm, cbar
         if self.data[ax_letter][indx].unit == u.dimensionless_unscaled:
             ulab = ''
         else:
@@ -641,10 +826,7 @@ class PlottingUtils(PlotCreation):
         # Moved the label to avoid overlapping with the cbar
         if self.cbar_position[ax_letter] in ['L', 'R'] and self.plot_dim == 2:
             self.axd[ax_letter].yaxis.labelpad = -10
-        # Hides every other tick label to avoid overlapping
-        if self.cbar_position[ax_letter] in ['T', 'B']:
-            for lb in cbar.ax.xaxis.get_ticklabels()[::2]:
-                lb.set_visible(False)
+        self.__hide_cbar_ticklabels(ax_letter)
         if self.axd[ax_letter].xaxis.get_units() is None:
             self.axd[ax_letter].xaxis.set_units((self.grid[ax_letter][indx][0].label,
                                                 self.grid[ax_letter][indx][0].unit))
@@ -653,14 +835,27 @@ class PlottingUtils(PlotCreation):
                                                 self.grid[ax_letter][indx][1].unit))
         self.set_labels(ax_letter)
 
+    def __hide_cbar_ticklabels(self, ax_letter):
+        """
+        Hides every other tick label of horizontal colorbars to avoid
+        overlapping.
+        """
+        if self.cbar_position[ax_letter] in ['T', 'B']:
+            for lb in self.cbars[ax_letter].ax.xaxis.get_ticklabels()[::2]:
+                lb.set_visible(False)
+
     def __plot1D(self, ax_letter, redo=False):
         """
         Adds a 1D plot to the selected axes. If we pass a list of data,
         it will plot all of them.
         """
         if not redo:
+            ## Decimated lines are compared with their whole data
+            decimated = {line: (x, y) for (line, x, y) in
+                         self.decimated.get(ax_letter, {}).get('lines', [])}
             lines = self.axd[ax_letter].get_lines()
-            lines = [ln.get_data() for ln in lines if len(ln.get_data()) == 2]
+            lines = [decimated.get(ln, ln.get_data()) for ln in lines
+                     if len(ln.get_data()) == 2]
             for indx in range(len(self.plot_dim[ax_letter])):
                 if self.plot_dim[ax_letter][indx] not in [1, -4]:
                     continue
@@ -682,9 +877,10 @@ class PlottingUtils(PlotCreation):
                                         to_plot = False
                                         break
                         if to_plot:
-                            self.axd[ax_letter].plot(self.grid[ax_letter][indx],
-                                                self.data[ax_letter][indx][i],
-                                                **kw)
+                            self.__plot_line(ax_letter,
+                                             self.grid[ax_letter][indx],
+                                             self.data[ax_letter][indx][i],
+                                             **kw)
                 else:
                     ## Check if the line is already plotted
                     to_plot = True
@@ -695,9 +891,9 @@ class PlottingUtils(PlotCreation):
                                     to_plot = False
                                     break
                     if to_plot:
-                        self.axd[ax_letter].plot(self.grid[ax_letter][indx],
-                                                self.data[ax_letter][indx],
-                                                **kw)
+                        self.__plot_line(ax_letter,
+                                         self.grid[ax_letter][indx],
+                                         self.data[ax_letter][indx], **kw)
         else:
             for indx in range(len(self.plot_dim[ax_letter])):
                 if self.plot_dim[ax_letter][indx] not in [1, -4]:
@@ -711,12 +907,12 @@ class PlottingUtils(PlotCreation):
                     kw['ls'] = self.ls[ax_letter][indx]
                 if type(self.data[ax_letter][indx]) == list:
                     for data in self.data[ax_letter][indx]:
-                        self.axd[ax_letter].plot(self.grid[ax_letter][indx],
-                                                 data, **kw)
+                        self.__plot_line(ax_letter,
+                                         self.grid[ax_letter][indx], data,
+                                         **kw)
                 else:
-                    self.axd[ax_letter].plot(self.grid[ax_letter][indx],
-                                             self.data[ax_letter][indx],
-                                             **kw)
+                    self.__plot_line(ax_letter, self.grid[ax_letter][indx],
+                                     self.data[ax_letter][indx], **kw)
         self.set_labels(ax_letter)
 
     def __plot1DBars(self, ax_letter):
@@ -767,6 +963,7 @@ class PlottingUtils(PlotCreation):
                                      self.cbar_position[ax_letter]),
                                  extend='both'
                                  )
+        self.mappables[ax_letter], self.cbars[ax_letter] = pcm, cbar
         if bins.unit == u.dimensionless_unscaled:
             ulab = ''
         else:
@@ -774,11 +971,89 @@ class PlottingUtils(PlotCreation):
         cbar.set_label(self.cbar_label[ax_letter] + ulab)
         self.set_labels(ax_letter)
 
+    def __update_colors(self, ax_letter, cmap_only=False):
+        """
+        Updates the colored data (contourf or mesh) of the plot at the
+        corresponding letter and its colorbar, leaving the rest of the
+        figure untouched. With cmap_only the colormap is changed in
+        place, otherwise the colored data and the colorbar are drawn
+        again. Returns False if the whole figure has to be redone.
+        """
+        if not self.fig_is_open() or ax_letter not in self.mappables or \
+            self.mappables[ax_letter].axes is not self.axd.get(ax_letter):
+            return False
+        if cmap_only:
+            self.mappables[ax_letter].set_cmap(self.cmap_color[ax_letter])
+            ## The update of the colorbar shows again all the tick labels
+            if (2 in self.plot_dim[ax_letter]) or \
+                (-1 in self.plot_dim[ax_letter]):
+                self.__hide_cbar_ticklabels(ax_letter)
+            return True
+        ## Arrows have the same zorder of the colored data, so they would
+        ## end up below it
+        if 'v' in self.field_type.get(ax_letter, []):
+            return False
+        self.mappables.pop(ax_letter).remove()
+        self.cbars.pop(ax_letter)
+        ## The locator of the old colorbar would shrink the new one again
+        self.axd[ax_letter.lower()].cla()
+        self.axd[ax_letter.lower()].set_axes_locator(None)
+        dm = self.plot_dim[ax_letter]
+        if (2 in dm) or (-1 in dm):
+            self.__plot2D(ax_letter)
+        elif (-2 in dm) or (-3 in dm):
+            self.__plot2Dmesh(ax_letter)
+        elif (-52 in dm):
+            self.__plot2DHist(ax_letter)
+        self._PlotCreation__setup_aspect()
+        return True
+
+    def __update_2Ddata(self, ax_letter, file, data):
+        """
+        Replaces the 2D slice, or the sky map, of the plot at the
+        corresponding letter with the data of another file on the same
+        grid, keeping the normalization and the colorbar. Only the meshes
+        (see mesh2D) can be updated, returns False otherwise.
+        """
+        if 2 in self.plot_dim[ax_letter]:
+            indx = self.plot_dim[ax_letter].index(2)
+        else:
+            indx = self.plot_dim[ax_letter].index(-2)
+        if not isinstance(self.mappables.get(ax_letter), QuadMesh) or \
+            data.shape != self.data[ax_letter][indx].shape:
+            return False
+        self.file[ax_letter][indx] = file
+        self.data[ax_letter][indx] = data
+        self.mappables[ax_letter].set_array(data.value)
+        return True
+
+    def __update_field(self, ax_letter, i, field):
+        """
+        Replaces the i-th field of the plot at the corresponding letter.
+        The arrows are moved in place, while the field lines, which
+        depend on the whole field, are drawn again.
+        """
+        self.field[ax_letter][i] = field
+        artist = self.field_artists[ax_letter][i]
+        if self.field_type[ax_letter][i] == 'v':
+            skip = (slice(None, None, 5), slice(None, None, 5))
+            ## Scale the arrows again on the new field
+            artist.scale = None
+            artist.set_UVC(field[0][skip].value, field[1][skip].value)
+        else:
+            artist.remove()
+            self.field_artists[ax_letter][i] = self.__draw_field(
+                ax_letter, self.plot_dim[ax_letter].index(2), i)
+
     def __redo_plot(self):
         """
         We replot everything in the figure. What is done depends on the
         type of plot we are dealing with.
         """
+        self.mappables = {}
+        self.cbars = {}
+        self.field_artists = {}
+        self.decimated = {}
         if any([ax.name == 'hammer' for ax in self.axd.values()]):
             self._PlotCreation__close_figure()
             self._PlotCreation__setup_axd(self.number, self.form_factor,
@@ -0,0 +1,108 @@
+import os
+import numpy as np
+import cv2
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+
+## Resolution of the frames, as the one of the saved plots
+MOVIE_DPI = 300
+## Frames being rendered or waiting to be encoded, for each worker
+FRAMES_AHEAD = 2
+
+def render_frames(plotting, files, frame_setup, n_workers=None):
+    """
+    Iterator over the RGBA frames of the movie, one for each file in
+    files and in the same order, drawn with the settings in frame_setup
+    by Plotting.__movie_frame.
+    With more than one worker the frames are rendered by a pool of
+    processes, each with its own instance of the class of plotting, its
+    Simulation and an Agg canvas, and handed back as raw buffers. At
+    most FRAMES_AHEAD frames per worker are in flight, so the memory
+    does not grow with the length of the movie.
+    Otherwise they are rendered on the figure of plotting.
+    """
+    if n_workers is None:
+        n_workers = min(4, os.cpu_count() or 1)
+    n_workers = min(n_workers, len(files))
+    if n_workers < 2:
+        for file in files:
+            yield plotting._Plotting__movie_frame(file, *frame_setup)
+        return
+    simulation = plotting.loaded_data
+    ## Do not let the workers inherit an opened file
+    simulation.close_files()
+    plotting_setup = (type(plotting), simulation.simulation_name,
+                      os.path.dirname(simulation.path), simulation.dim,
+                      getattr(simulation, 'tob', None), simulation.no_new,
+                      plotting._Plotting__simple_labelling,
+                      plotting._Plotting__no_nu, plotting.decimation)
+    files = iter(files)
+    with ProcessPoolExecutor(max_workers=n_workers,
+                             initializer=_start_worker,
+                             initargs=(plotting_setup, )) as executor:
+        pending = deque(executor.submit(_render_frame, file, frame_setup)
+                        for file in islice(files, FRAMES_AHEAD * n_workers))
+        while pending:
+            frame = pending.popleft().result()
+            for file in islice(files, 1):
+                pending.append(executor.submit(_render_frame, file,
+                                               frame_setup))
+            yield frame
+
+def write_movie(frames, path, fps=10.0):
+    """
+    Encodes the RGBA frames in a vp8 webm video, with the size of the
+    first frame.
+    """
+    video_writer = None
+    try:
+        for frame in frames:
+            if video_writer is None:
+                height, width, _ = frame.shape
+                fourcc = cv2.VideoWriter_fourcc(*'vp80')
+                video_writer = cv2.VideoWriter(path, fourcc, fps,
+                                               (width, height))
+            video_writer.write(cv2.cvtColor(frame, cv2.COLOR_RGBA2BGR))
+    finally:
+        if video_writer is not None:
+            video_writer.release()
+
+def figure_to_rgba(fig, dpi=MOVIE_DPI):
+    """
+    Draws the figure at the given dpi and returns the (height, width, 4)
+    array of its pixels.
+    """
+    from io import BytesIO
+    with BytesIO() as buffer:
+        fig.savefig(buffer, format='rgba', dpi=dpi)
+        width, height = (fig.get_size_inches() * dpi).astype(int)
+        return np.frombuffer(buffer.getvalue(),
+                             dtype=np.uint8).reshape(height, width, 4)
+
+## Worker state, each process of the pool draws on its own figure
+_worker = {}
+
+def _start_worker(plotting_setup):
+    import matplotlib
+    from matplotlib._pylab_helpers import Gcf
+    ## The figures inherited from the parent belong to its backend, drop
+    ## them without touching their windows
+    Gcf.figs.clear()
+    matplotlib.use('Agg', force=True)
+    from AeViz.quantities_plotting import plotting_helpers
+    plotting_helpers.TERMINAL = False
+    plotting_class, name, path, dim, tob, no_new, simple_labelling, no_nu, \
+        decimation = plotting_setup
+    plotting = plotting_class()
+    plotting.Load(name, path, dim)
+    if tob is not None:
+        plotting.loaded_data.tob = tob
+    plotting.loaded_data.no_new = no_new
+    if simple_labelling:
+        plotting.set_simple_labelling(no_nu)
+    plotting.decimation = decimation
+    _worker['plotting'] = plotting
+
+def _render_frame(file, frame_setup):
+    return _worker['plotting']._Plotting__movie_frame(file, *frame_setup)
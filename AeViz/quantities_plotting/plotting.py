@@ -13,8 +13,11 @@ from AeViz.quantities_plotting.plotting_helpers import (recognize_quantity,
                                                         plot_profile_panel,
                                                         plot_hammer_panel,
                                                         remove_labelling)
+from AeViz.quantities_plotting import plotting_helpers
+from AeViz.quantities_plotting.movie_utils import (render_frames,
+                                                   write_movie,
+                                                   figure_to_rgba)
 from AeViz.utils.decorators.grid import _get_plane_indices
-import cv2
 
 class Plotting(PlottingUtils, Data):
     def __init__(self):
@@ -22,6 +25,8 @@ class Plotting(PlottingUtils, Data):
         Data.__init__(self)
         self.__simple_labelling = False
         self.__no_nu = False
+        ## Settings and time marks of the last movie frame
+        self.__movie = None
         
     def set_simple_labelling(self, no_nu=False):
         if self.__simple_labelling:
@@ -908,15 +913,21 @@ class Plotting(PlottingUtils, Data):
     
     def make_movie(self, qt1=None, qt2=None, qt3=None, qt4=None, top=None,
               plane='xz', start_time=None, end_time=None,
-              vfield=False, Bfield=False, top_time=False, lims=None):
+              vfield=False, Bfield=False, top_time=False, lims=None,
+              n_workers=None):
         """
         Makes a movie with the quantities specified by the user.
+        If plane is a radius instead of a plane, the frames are Hammer
+        projections of the sphere at that radius (see plotHammer),
+        without the top panel and the fields.
+        The frames are rendered by n_workers processes (see
+        render_frames) and passed to the encoder as raw buffers.
         """
-        TMN = globals()["TERMINAL"]
-        globals()["TERMINAL"] = False
         number_of_quantities = sum(x is not None for x in [qt1, qt2, qt3, qt4])
-        if number_of_quantities != 2:
+        if number_of_quantities != 2 or not isinstance(plane, str):
             top = None
+        if not isinstance(plane, str):
+            vfield, Bfield = False, False
         if start_time is not None:
             start_time_ind = self.loaded_data.find_file_from_time(start_time)
             start_time_ind = self.loaded_data.hdf_file_list.index(
@@ -934,64 +945,136 @@ class Plotting(PlottingUtils, Data):
             save_name = '_'.join(filter(None, [qt1, qt2, qt3, qt4]))
         else:
             save_name = qt1
-        frame_folder = os.path.join(self.save_path, save_name)
-        if not os.path.exists(frame_folder):
-            os.mkdir(frame_folder)
-        frame_list = []
-        for (fi, f) in enumerate(
-            self.loaded_data.hdf_file_list[start_time_ind:end_time_ind]):
+        if top is not None:
+            ## Compute the time series once, before the workers need it
+            self._Data__get_data_from_name(name=top, file=None)
+        frame_setup = (plane, qt1, qt2, qt3, qt4, top, start_time, end_time,
+                       vfield, Bfield, top_time, lims)
+        files = self.loaded_data.hdf_file_list[start_time_ind:end_time_ind]
+        terminal = plotting_helpers.TERMINAL
+        plotting_helpers.TERMINAL = False
+        try:
+            write_movie(render_frames(self, files, frame_setup, n_workers),
+                        os.path.join(self.save_path, save_name + '.webm'))
+        finally:
+            plotting_helpers.TERMINAL = terminal
+
+    def __movie_frame(self, file, *frame_setup):
+        """
+        Draws the frame of the movie of a single file and returns its
+        RGBA pixels. The figure is built for the first frame only, the
+        following ones with the same settings just replace the data of
+        its artists.
+        """
+        if self.__movie is None or self.__movie['setup'] != frame_setup or \
+            not self.fig_is_open() or not self.__update_movie_frame(file):
+            self.__draw_movie_frame(file, *frame_setup)
+        return figure_to_rgba(self.fig)
+
+    def __draw_movie_frame(self, file, plane, qt1, qt2, qt3, qt4, top,
+                           start_time, end_time, vfield, Bfield, top_time,
+                           lims):
+        """
+        Builds the figure of a movie frame from scratch, with the 2D
+        slices drawn as meshes to be updated by __update_movie_frame.
+        """
+        mesh2D, self.mesh2D = self.mesh2D, True
+        try:
             self.Close()
-            self.plot2D(f, plane, None, qt1, qt2, qt3, qt4)
+            if isinstance(plane, str):
+                self.plot2D(file, plane, qt1, qt2, qt3, qt4)
+            else:
+                self.plotHammer(file, plane, qt1, qt2, qt3, qt4)
             if lims is not None:
                 self.xlim(lims, 'A')
+            time_line = None
             if top is not None:
-                self.plot1D(None, top, 'time', None, None)
+                self.plot1D(None, top, 'time', overplot=False)
                 if top_time:
-                    self.axd['A'].axvline(
-                        self.loaded_data.time(f),
+                    time_line = self.axd['A'].axvline(
+                        self.loaded_data.time(file),
                         color='black', lw=0.75, ls='dashed')
-                    self.xlim((start_time, end_time), 'A')
+                    if start_time is not None or end_time is not None:
+                        xlim = self.axd['A'].get_xlim()
+                        self.xlim((xlim[0] if start_time is None else
+                                   start_time,
+                                   xlim[1] if end_time is None else
+                                   end_time), 'A')
             if vfield:
                 if 'C' in self.axd and 'D' in self.axd:
-                    self.add_2Dfield(f, 'C', 'velocity', plane, None)
-                    self.add_2Dfield(f, 'D', 'velocity', plane, None)
+                    self.add_2Dfield('C', 'velocity')
+                    self.add_2Dfield('D', 'velocity')
                 elif 'C' in self.axd:
-                    self.add_2Dfield(f, 'C', 'velocity', plane, None)
+                    self.add_2Dfield('C', 'velocity')
                 elif 'B' in self.axd:
-                    self.add_2Dfield(f, 'B', 'velocity', plane, None)
+                    self.add_2Dfield('B', 'velocity')
                 else:
-                    self.add_2Dfield(f, 'A', 'velocity', plane, None)
+                    self.add_2Dfield('A', 'velocity')
             if Bfield:
                 if top is not None:
-                    self.add_2Dfield(f, 'B', 'Bfield', plane, None)
+                    self.add_2Dfield('B', 'Bfield')
                 else:
                     if 'C' in self.axd and 'D' in self.axd:
-                        self.add_2Dfield(f, 'A', 'Bfield', plane, None)
-                        self.add_2Dfield(f, 'B', 'Bfield', plane, None)
+                        self.add_2Dfield('A', 'Bfield')
+                        self.add_2Dfield('B', 'Bfield')
                     else:
-                        self.add_2Dfield(f, 'A', 'Bfield', plane, None)
-            save_path = os.path.join(frame_folder,
-                                     'frame_{:04d}.png'.format(fi))
-            frame_list.append(save_path)
-            self.fig.savefig(save_path, dpi=300)
-        globals()["TERMINAL"] = TMN
-        ## RENDER MOVIE
-        frame = cv2.imread(frame_list[0])
-        height, width, channels = frame.shape
+                        self.add_2Dfield('A', 'Bfield')
+        finally:
+            self.mesh2D = mesh2D
+        ## Time stamp on the first slice or sky map
+        ax_letter = min(ax_letter for ax_letter in self.plot_dim if
+                        2 in self.plot_dim[ax_letter] or
+                        -2 in self.plot_dim[ax_letter])
+        time_text = self.axd[ax_letter].text(
+            0.03, 0.97, self.__time_stamp(file), va='top', ha='left',
+            transform=self.axd[ax_letter].transAxes)
+        self.__movie = {'setup': (plane, qt1, qt2, qt3, qt4, top, start_time,
+                                  end_time, vfield, Bfield, top_time, lims),
+                        'plane': plane, 'time_line': time_line,
+                        'time_text': time_text}
 
-        # Define the video codec and create a VideoWriter object
-        fourcc = cv2.VideoWriter_fourcc(*'vp80')
-        video_writer = cv2.VideoWriter(
-            os.path.join(self.save_path, save_name + '.webm'), 
-            fourcc, 10.0, (width, height))
-
-        # Write each frame to the video
-        for frame_name in frame_list:
-            frame = cv2.imread(frame_name)
-            video_writer.write(frame)
+    def __update_movie_frame(self, file):
+        """
+        Replaces the 2D slices (or sky maps), the fields and the time
+        marks of the movie figure with the ones of file. Returns False
+        if the figure has to be built again.
+        """
+        plane = self.__movie['plane']
+        if isinstance(plane, str):
+            dim = 2
+            self.ghost.update_ghost_cells(t_l=3, t_r=3, p_l=3, p_r=3)
+        else:
+            ## The sky maps are drawn with the default ghost cells
+            dim = -2
+        try:
+            for ax_letter in self.plot_dim:
+                if dim not in self.plot_dim[ax_letter]:
+                    continue
+                indx = self.plot_dim[ax_letter].index(dim)
+                data = self._Data__get_data_from_name(
+                    self.quantity[ax_letter][indx], file, plane=plane)
+                if not self._PlottingUtils__update_2Ddata(ax_letter, file,
+                                                          data.data):
+                    return False
+                for (i, field_type) in enumerate(
+                    self.field_type.get(ax_letter, [])):
+                    if field_type == 'v':
+                        field = self.__velocity_field(file, plane)
+                    else:
+                        field = self.loaded_data.stream_function(
+                            file, plane.lower())
+                    self._PlottingUtils__update_field(ax_letter, i, field)
+        finally:
+            self.ghost.restore_default()
+        if self.__movie['time_line'] is not None:
+            time = self.loaded_data.time(file).value
+            self.__movie['time_line'].set_xdata([time, time])
+        self.__movie['time_text'].set_text(self.__time_stamp(file))
+        return True
 
-        # Release the video writer and print a success message
-        video_writer.release()
+    def __time_stamp(self, file):
+        time = self.loaded_data.time(file)
+        return '{} = {:.2f} ms'.format(time.label, time.to(u.ms).value)
 
     def Close(self):
         """
@@ -999,11 +1082,20 @@ class Plotting(PlottingUtils, Data):
         """
         self._PlotCreation__close_figure()
         self._PlottingUtils__reset_params()
+        self.__movie = None
 
     def __addVelocity_field(self, file, axd_letter, plane, grid_number):
         """
         Plots the 2D velocity field in the plane specified by the user.
         """
+        self._PlottingUtils__update_fields_params(
+            axd_letter, self.__velocity_field(file, plane), 'v')
+        self._PlottingUtils__plot2Dfield(axd_letter, grid_number)
+
+    def __velocity_field(self, file, plane):
+        """
+        Components of the velocity in the plane specified by the user.
+        """
         ## Get the plane indices
         index_theta, index_phi = _get_plane_indices(self, plane)
         vr = self._Data__get_data_from_name('radial_velocity', file)
@@ -1053,8 +1145,7 @@ class Plotting(PlottingUtils, Data):
                      -vtheta * np.cos(theta)[:, None] * np.sin(phi)
                 vy = vr * np.cos(theta)[:, None] - \
                       vtheta * np.sin(theta)[:, None]
-        self._PlottingUtils__update_fields_params(axd_letter, (vx, vy), 'v')
-        self._PlottingUtils__plot2Dfield(axd_letter, grid_number)
+        return vx, vy
 
     def __addBfield(self, file, axd_letter, plane, grid_number):
         """
@@ -260,7 +260,8 @@ def plot_panel(plotting_object, letter, file, quantity, cbars, plane,
                                             data=data,
                                             cbar_position=cbars[letter],
                                             dim=2,
-                                            sim_dim=plotting_object.sim_dim)
+                                            sim_dim=plotting_object.sim_dim,
+                                            quantity=quantity)
     ## MAKE THE PLOT
     plotting_object._PlottingUtils__plot2D(letter)
     plot_number = plotting_object.plot_dim[letter].index(2)
@@ -336,12 +337,14 @@ def plot_hammer_panel(plotting_object, letter, file, quantity, cbars, plane,
         if a != 1.0:
             data *= a
     plotting_object._PlottingUtils__update_params(
+                                                  file=file,
                                                   ax_letter=letter,
                                                   plane=('phi', 'theta'),
                                                   data=data,
                                                   cbar_position=cbars[letter],
                                                   dim=-2,
-                                                  sim_dim=plotting_object.sim_dim)
+                                                  sim_dim=plotting_object.sim_dim,
+                                                  quantity=quantity)
     plotting_object._PlottingUtils__plot2Dmesh(letter)
     plotting_object.xlim(None, letter)
     plotting_object.ylim(None, letter)
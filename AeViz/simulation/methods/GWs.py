@@ -52,7 +52,8 @@ def GW_Amplitudes(self, distance=None, tob_corrected=True,
         Column 4: x polarization equatorial plane
         Column 5: x polarization polar plane
     """
-    data = load_file(self._Simulation__log_path, self._Simulation__grw_path)
+    data = load_file(self._Simulation__log_path, self._Simulation__grw_path,
+                     self.storage_path)
     
     n = 1
     if lower_refinement:
@@ -4,7 +4,8 @@ from AeViz.units.aeseries import aerray, aeseries
 from AeViz.utils.decorators.simulation import (smooth, derive, hdf_isopen,
                                         subtract_tob, sum_tob, mask_points,
                                         notrino_used,
-                                        finite_differences)
+                                        finite_differences,
+                                        region_of_interest)
 from AeViz.utils.decorators.grid import get_grid, get_radius
 import numpy as np
 from typing import Literal
\ No newline at end of file
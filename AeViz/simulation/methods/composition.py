@@ -10,6 +10,7 @@ imported into the Simulation class.
 ## COMPOSITION DATA
 ## -----------------------------------------------------------------
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -17,13 +18,16 @@ imported into the Simulation class.
 @finite_differences
 @hdf_isopen
 def Ye(self, file_name, **kwargs):
-    data = aerray(self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['hydro/data'][..., self.hydroTHD_index['hydro']
-        ['I_YE']]), self.dim), u.g / u.cm ** 3) / self.rho(file_name)
+    data = aerray(np.squeeze(
+        self._Simulation__data_h5['hydro/data'][
+            self.ghost.hyperslab(self.dim,
+                                 self.hydroTHD_index['hydro']['I_YE'])]),
+        u.g / u.cm ** 3) / self.rho(file_name)
     data.set(name='Ye', label= r'$Y_\mathrm{e}$', limits=[0.0, 0.5],
              cmap='gist_rainbow', log=False)
     return data
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -31,12 +35,14 @@ def Ye(self, file_name, **kwargs):
 @finite_differences
 @hdf_isopen
 def neutron_fraction(self, file_name, **kwargs):
-    data = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['thd/data'][..., self.hydroTHD_index['thd']
-                                    ['I_COMP'][0]]), self.dim)
+    data = np.squeeze(
+        self._Simulation__data_h5['thd/data'][
+            self.ghost.hyperslab(self.dim,
+                                 self.hydroTHD_index['thd']['I_COMP'][0])])
     return aerray(data, u.dimensionless_unscaled, 'neutron_fraction',
                   r'$X_\mathrm{n}$', 'cividis', [0, 1], False)
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -44,12 +50,14 @@ def neutron_fraction(self, file_name, **kwargs):
 @finite_differences
 @hdf_isopen
 def proton_fraction(self, file_name, **kwargs):
-    data = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['thd/data'][..., self.hydroTHD_index['thd']
-                                    ['I_COMP'][1]]), self.dim)
+    data = np.squeeze(
+        self._Simulation__data_h5['thd/data'][
+            self.ghost.hyperslab(self.dim,
+                                 self.hydroTHD_index['thd']['I_COMP'][1])])
     return aerray(data, u.dimensionless_unscaled, 'proton_fraction',
                   r'$X_\mathrm{p}$', 'viridis', [0, 1], False)
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -57,12 +65,14 @@ def proton_fraction(self, file_name, **kwargs):
 @finite_differences
 @hdf_isopen
 def alpha_fraction(self, file_name, **kwargs):
-    data = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['thd/data'][..., self.hydroTHD_index['thd']
-                                    ['I_COMP'][2]]), self.dim)
+    data = np.squeeze(
+        self._Simulation__data_h5['thd/data'][
+            self.ghost.hyperslab(self.dim,
+                                 self.hydroTHD_index['thd']['I_COMP'][2])])
     return aerray(data, u.dimensionless_unscaled, 'alpha_fraction',
                   r'$X_\alpha$', 'plasma', [0, 1], False)
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -70,12 +80,14 @@ def alpha_fraction(self, file_name, **kwargs):
 @finite_differences
 @hdf_isopen
 def heavy_fraction(self, file_name, **kwargs):
-    data = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['thd/data'][..., self.hydroTHD_index['thd']
-                                    ['I_COMP'][3]]), self.dim)
+    data = np.squeeze(
+        self._Simulation__data_h5['thd/data'][
+            self.ghost.hyperslab(self.dim,
+                                 self.hydroTHD_index['thd']['I_COMP'][3])])
     return aerray(data, u.dimensionless_unscaled, 'heavy_fraction',
                   r'$X_\mathrm{h}$', 'magma', [0, 1], False)
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -83,12 +95,14 @@ def heavy_fraction(self, file_name, **kwargs):
 @finite_differences
 @hdf_isopen
 def Abar(self, file_name, **kwargs):
-    data = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['thd/data'][..., self.hydroTHD_index['thd']
-                                    ['I_COMP'][4]]), self.dim)
+    data = np.squeeze(
+        self._Simulation__data_h5['thd/data'][
+            self.ghost.hyperslab(self.dim,
+                                 self.hydroTHD_index['thd']['I_COMP'][4])])
     return aerray(data, u.dimensionless_unscaled, 'Abar',
                   r'$\bar{A}$', 'gist_rainbow_r', [4, 80], False)
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -96,13 +110,15 @@ def Abar(self, file_name, **kwargs):
 @finite_differences
 @hdf_isopen
 def Zbar(self, file_name, **kwargs):
-    data = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['thd/data'][..., self.hydroTHD_index['thd']
-                                    ['I_COMP'][5]]), self.dim)
+    data = np.squeeze(
+        self._Simulation__data_h5['thd/data'][
+            self.ghost.hyperslab(self.dim,
+                                 self.hydroTHD_index['thd']['I_COMP'][5])])
     return aerray(data, u.dimensionless_unscaled, 'Zbar',
                   r'$\bar{Z}$', 'nipy_spectral', [1, 34], False)
 
 ## CHEMICAL POTENTIAL
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -110,12 +126,14 @@ def Zbar(self, file_name, **kwargs):
 @finite_differences
 @hdf_isopen
 def electron_chemical_potential(self, file_name, **kwargs):
-    data = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['thd/data'][..., self.hydroTHD_index['thd']
-                                    ['I_CPOT'][0]]), self.dim)
+    data = np.squeeze(
+        self._Simulation__data_h5['thd/data'][
+            self.ghost.hyperslab(self.dim,
+                                 self.hydroTHD_index['thd']['I_CPOT'][0])])
     return aerray(data, u.erg / u.g, 'electron_chemical_potential',
                   r'$\mu_\mathrm{e}$', 'coolwarm', [0.1, 300], True)
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -123,12 +141,14 @@ def electron_chemical_potential(self, file_name, **kwargs):
 @finite_differences
 @hdf_isopen
 def neutron_chemical_potential(self, file_name, **kwargs):
-    data = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['thd/data'][..., self.hydroTHD_index['thd']
-                                    ['I_CPOT'][1]]), self.dim)
+    data = np.squeeze(
+        self._Simulation__data_h5['thd/data'][
+            self.ghost.hyperslab(self.dim,
+                                 self.hydroTHD_index['thd']['I_CPOT'][1])])
     return aerray(data, u.erg / u.g, 'neutron_chemical_potential',
                   r'$\mu_\mathrm{n}$', 'bwr', [-2e2, 2e3], True)
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -136,12 +156,14 @@ def neutron_chemical_potential(self, file_name, **kwargs):
 @finite_differences
 @hdf_isopen
 def proton_chemical_potential(self, file_name, **kwargs):
-    data = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['thd/data'][..., self.hydroTHD_index['thd']
-                                    ['I_CPOT'][2]]), self.dim)
+    data = np.squeeze(
+        self._Simulation__data_h5['thd/data'][
+            self.ghost.hyperslab(self.dim,
+                                 self.hydroTHD_index['thd']['I_CPOT'][2])])
     return aerray(data, u.erg / u.g, 'proton_chemical_potential',
                   r'$\mu_\mathrm{p}$', 'seismic', [-2e2, 3e3], True)
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -149,8 +171,9 @@ def proton_chemical_potential(self, file_name, **kwargs):
 @finite_differences
 @hdf_isopen
 def neutrino_chemical_potential(self, file_name, **kwargs):
-    data = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['thd/data'][..., self.hydroTHD_index['thd']
-                                        ['I_CPOT'][3]]), self.dim)
+    data = np.squeeze(
+        self._Simulation__data_h5['thd/data'][
+            self.ghost.hyperslab(self.dim,
+                                 self.hydroTHD_index['thd']['I_CPOT'][3])])
     return aerray(data, u.erg / u.g, 'neutrino_chemical_potential',
                   r'$\mu_\nu$', 'Spectral_r', [-2e2, 3e3], True)
\ No newline at end of file
@@ -11,6 +11,7 @@ of the Simulation class
 ## HYDRODYNAMICAL DATA
 ## -----------------------------------------------------------------
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -18,12 +19,14 @@ of the Simulation class
 @finite_differences
 @hdf_isopen
 def rho(self, file_name, **kwargs):
-    data = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['hydro/data']
-        [..., self.hydroTHD_index['hydro']['I_RH']]), self.dim)
+    data = np.squeeze(
+        self._Simulation__data_h5['hydro/data'][
+            self.ghost.hyperslab(self.dim,
+                                 self.hydroTHD_index['hydro']['I_RH'])])
     return aerray(data, u.g / u.cm**3, 'density', r'$\rho$', 'viridis',
                   [1e4, 1e15], log=True)
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -36,17 +39,20 @@ def mass(self, file_name, **kwargs):
     return data
 
 ## ENERGY
+@region_of_interest
 @get_grid
 @smooth
 @finite_differences
 @hdf_isopen
 def MHD_energy(self, file_name, **kwargs):
-    data = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['hydro/data']\
-            [..., self.hydroTHD_index['hydro']['I_EN']]), self.dim)
+    data = np.squeeze(
+        self._Simulation__data_h5['hydro/data'][
+            self.ghost.hyperslab(self.dim,
+                                 self.hydroTHD_index['hydro']['I_EN'])])
     return aerray(data, u.erg / u.cm**3, 'MHD_energy',
                   r'$E$', 'nipy_spectral', [1e24, 1e35], log=True)
 
+@region_of_interest
 @get_grid
 @smooth
 @finite_differences
@@ -58,6 +64,7 @@ def rotational_energy(self, file_name, **kwargs):
              limits=[1e24, 1e35])
     return data
 
+@region_of_interest
 @get_grid
 @smooth
 @finite_differences
@@ -85,6 +92,7 @@ def kinetic_energy(self, file_name, comp:Literal['tot', 'r', 'th', 'ph']='tot',
     return data
 
 ## VELOCITY
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -96,12 +104,13 @@ def radial_velocity(self, file_name, **kwargs):
         ivx = 'I_VELX'
     else:
         ivx = 'I_VX'
-    data = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['thd/data'][..., self.hydroTHD_index['thd']
-                                    [ivx]]), self.dim)
+    data = np.squeeze(
+        self._Simulation__data_h5['thd/data'][
+            self.ghost.hyperslab(self.dim, self.hydroTHD_index['thd'][ivx])])
     return aerray(data, u.cm / u.s, 'velocity_radial', r'$v_r$', 'Spectral_r',
                   [-3e10, 3e10], log=True)
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -113,12 +122,13 @@ def theta_velocity(self, file_name, **kwargs):
         ivy = 'I_VELY'
     else:
         ivy = 'I_VY'
-    data = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['thd/data'][..., self.hydroTHD_index['thd']
-                                    [ivy]]), self.dim)
+    data = np.squeeze(
+        self._Simulation__data_h5['thd/data'][
+            self.ghost.hyperslab(self.dim, self.hydroTHD_index['thd'][ivy])])
     return aerray(data, u.cm / u.s, 'velocity_theta', r'$v_\theta$',
                   'Spectral_r', [-3e10, 3e10], log=True)
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -130,13 +140,14 @@ def phi_velocity(self, file_name, **kwargs):
         ivz = 'I_VELZ'
     else:
         ivz = 'I_VZ'
-    data =  self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['thd/data'][..., self.hydroTHD_index['thd']
-                                    [ivz]]), self.dim)
+    data =  np.squeeze(
+        self._Simulation__data_h5['thd/data'][
+            self.ghost.hyperslab(self.dim, self.hydroTHD_index['thd'][ivz])])
     return aerray(data, u.cm / u.s, 'velocity_phi', r'$v_\phi$',
                   'cividis', [1e7, 3e10], log=True)
 
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -144,12 +155,14 @@ def phi_velocity(self, file_name, **kwargs):
 @finite_differences
 @hdf_isopen
 def soundspeed(self, file_name, **kwargs):
-    data = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['thd/data'][..., self.hydroTHD_index['thd']
-                                    ['I_CSND']]), self.dim)
+    data = np.squeeze(
+        self._Simulation__data_h5['thd/data'][
+            self.ghost.hyperslab(self.dim,
+                                 self.hydroTHD_index['thd']['I_CSND'])])
     return aerray(data, u.cm / u.s, 'soundspeed', r'$c_\mathrm{s}$',
                   'nipy_spectral', [1e8, 1e10], log=True)
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -19,10 +19,12 @@ def __CT_magnetic_fields(self, file_name, **kwargs):
     streamlines. If you want to plot the actual magnetic fields use
     the 'magnetic_field' method.
     """
-    data = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['mag_CT/data'][...]), self.dim)
+    data = np.squeeze(
+        self._Simulation__data_h5['mag_CT/data'][
+            self.ghost.hyperslab(self.dim)])
     return aerray(data, u.G, 'cell_magnetic_fields')
 
+@region_of_interest
 @get_grid
 @smooth
 @finite_differences
@@ -32,8 +34,9 @@ def magnetic_fields(self, file_name, comp:Literal['all', 'r', 'th', 'ph']='all',
     """
     Magnetic field at the cells center.
     """
-    data = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['mag_vol/data'][...]), self.dim)
+    data = np.squeeze(
+        self._Simulation__data_h5['mag_vol/data'][
+            self.ghost.hyperslab(self.dim)])
     if comp == 'all':
         return (aerray(data[..., 0], u.G, 'B_r', r'$B_r$', 'coolwarm', [-1e15, 1e15],
                     True), 
@@ -51,6 +54,7 @@ def magnetic_fields(self, file_name, comp:Literal['all', 'r', 'th', 'ph']='all',
         return aerray(data[..., 2], u.G, 'B_phi', r'$B_\phi$', 'coolwarm',
                     [-1e15, 1e15], True)
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -63,6 +67,7 @@ def poloidal_magnetic_fields(self, file_name, **kwargs):
              log=True, cmap='inferno')
     return data
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -72,6 +77,7 @@ def toroidal_magnetic_fields(self, file_name, **kwargs):
     _, _, Bphi = self.magnetic_fields(file_name)
     return Bphi
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -104,6 +110,7 @@ def stream_function(self, file_name, plane):
     return strfct2D(self.__CT_magnetic_fields(file_name), self.cell, 
                     self.ghost, plane)
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
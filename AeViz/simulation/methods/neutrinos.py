@@ -12,6 +12,7 @@ imported into the Simulation class.
 
 ## ENERGY DEPENDENT
 
+@region_of_interest
 @get_grid
 @smooth
 @hdf_isopen
@@ -22,11 +23,13 @@ def neutrino_energy_density(self, file_name, **kwargs):
     Now with NOTRINO case!
     """
     if not kwargs['notrino']:
-        nu_ene = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['neutrino/e'][..., 0]), self.dim)
+        nu_ene = np.squeeze(
+        self._Simulation__data_h5['neutrino/e'][
+            self.ghost.hyperslab(self.dim, 0)])
     else:
-        nu_ene = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['notrino/notrino_e'][...]), self.dim)
+        nu_ene = np.squeeze(
+        self._Simulation__data_h5['notrino/notrino_e'][
+            self.ghost.hyperslab(self.dim)])
         # Adding a fictitious to account for missing energy bin and thus
         # (hopefully) not having to change a lot in the library
         nu_ene = np.expand_dims(nu_ene, axis = -2)
@@ -40,6 +43,7 @@ def neutrino_energy_density(self, file_name, **kwargs):
                   r'$E_{\nu_\mathrm{x}}$', 'plasma', [1e28, 1e32], True)
             )
 
+@region_of_interest
 @get_grid
 @smooth
 @hdf_isopen
@@ -51,11 +55,13 @@ def neutrino_momenta(self, file_name, **kwargs):
     Now with NOTRINO case!
     """
     if not kwargs['notrino']:
-        nu_flux = self.ghost.remove_ghost_cells(np.squeeze(
-            self._Simulation__data_h5['neutrino/e'][..., 1:]), self.dim)
+        nu_flux = np.squeeze(
+            self._Simulation__data_h5['neutrino/e'][
+                self.ghost.hyperslab(self.dim, slice(1, None))])
     else:
-        nu_flux = self.ghost.remove_ghost_cells(np.squeeze(
-            self._Simulation__data_h5['notrino/notrino_f'][...]), self.dim)
+        nu_flux = np.squeeze(
+            self._Simulation__data_h5['notrino/notrino_f'][
+                self.ghost.hyperslab(self.dim)])
         # Adding a fictitious to account for missing energy bin and thus
         # (hopefully) not having to change a lot in the library
         nu_flux = np.expand_dims(nu_flux, axis = -2)
@@ -88,6 +94,7 @@ def neutrino_momenta(self, file_name, **kwargs):
                 [[-1e40, 1e40], [-1e39, 1e39], [-1e39, 1e39]], True)
             )
 
+@region_of_interest
 @get_grid
 @smooth
 @hdf_isopen
@@ -99,11 +106,13 @@ def neutrino_energy_opacity(self, file_name, **kwargs):
     Now with NOTRINO case!
     """
     if not kwargs['notrino']:
-        nu_opac = self.ghost.remove_ghost_cells(np.squeeze(
-            self._Simulation__data_h5['neutrino/oe'][..., 0]), self.dim)
+        nu_opac = np.squeeze(
+            self._Simulation__data_h5['neutrino/oe'][
+                self.ghost.hyperslab(self.dim, 0)])
     else:
-        nu_opac = self.ghost.remove_ghost_cells(np.squeeze(
-            self._Simulation__data_h5['notrino/notrino_kae'][...]), self.dim)
+        nu_opac = np.squeeze(
+            self._Simulation__data_h5['notrino/notrino_kae'][
+                self.ghost.hyperslab(self.dim)])
         # Adding a fictitious to account for missing energy bin and thus
         # (hopefully) not having to change a lot in the library
         nu_opac = np.expand_dims(nu_opac, axis = -2)
@@ -117,6 +126,7 @@ def neutrino_energy_opacity(self, file_name, **kwargs):
             )
     
 
+@region_of_interest
 @get_grid
 @smooth
 @hdf_isopen
@@ -128,12 +138,14 @@ def neutrino_momenta_opacities(self, file_name, **kwargs):
     Now with NOTRINO case!
     """
     if not kwargs['notrino']:
-        nu_opac = self.ghost.remove_ghost_cells(np.squeeze(
-            self._Simulation__data_h5['neutrino/oe'][..., 1:]), self.dim)
+        nu_opac = np.squeeze(
+            self._Simulation__data_h5['neutrino/oe'][
+                self.ghost.hyperslab(self.dim, slice(1, None))])
     else:
         notrino = True
-        nu_opac = self.ghost.remove_ghost_cells(np.squeeze(
-            self._Simulation__data_h5['notrino/notrino_ktr'][...]), self.dim)
+        nu_opac = np.squeeze(
+            self._Simulation__data_h5['notrino/notrino_ktr'][
+                self.ghost.hyperslab(self.dim)])
         # Adding a fictitious to account for missing energy bin and thus
         # (hopefully) not having to change a lot in the library
         nu_opac = np.expand_dims(nu_opac, axis = -2)
@@ -169,6 +181,7 @@ def neutrino_momenta_opacities(self, file_name, **kwargs):
                 [[-1e40, 1e40], [-1e39, 1e39], [-1e39, 1e39]], True)
             )
 
+@region_of_interest
 @get_grid
 @smooth
 @hdf_isopen
@@ -178,6 +191,7 @@ def neutrino_absorption_opacity(self, file_name, **kwargs):
     """
     return neutrino_energy_opacity(self, file_name, **kwargs)
 
+@region_of_interest
 @get_grid
 @smooth
 @hdf_isopen
@@ -188,6 +202,7 @@ def neutrino_transport_opacities(self, file_name, **kwargs):
     return neutrino_momenta_opacities(self, file_name, **kwargs)
 
 
+@region_of_interest
 @get_grid
 @smooth
 @hdf_isopen
@@ -224,6 +239,7 @@ def neutrino_scattering_opacities(self, file_name, **kwargs):
         ksc_nux.label = r'$\kappa_{\mathrm{sc}, \nu_\mathrm{x}}$'
     return (ksc_nue, ksc_nua, ksc_nux)
 
+@region_of_interest
 @get_grid
 @smooth
 @hdf_isopen
@@ -232,9 +248,9 @@ def neutrino_number_density(self, file_name, **kwargs):
     # If notrino is used, the number density is returned in  the output,
     # and there is no need to compute it.
     if kwargs['notrino']:
-        ndens = self.ghost.remove_ghost_cells(np.squeeze(
-            self._Simulation__data_h5['notrino/notrino_n'][...]), 
-            self.dim)
+        ndens = np.squeeze(
+            self._Simulation__data_h5['notrino/notrino_n'][
+                self.ghost.hyperslab(self.dim)])
         ndens = np.expand_dims(ndens, axis = -2)
         return (aerray(ndens[..., 0], u.cm ** (-3), 'Nnue',
                   r'$N_{\nu_\mathrm{e}}$', 'gnuplot', [1e33, 1e36], True),
@@ -257,6 +273,7 @@ def neutrino_number_density(self, file_name, **kwargs):
                         ['gnuplot', 'gnuplot_2', 'CMRmap']) for ed in edens]
         return tuple(edens)
 
+@region_of_interest
 @get_grid
 @smooth
 def neutrino_mean_energy(self, file_name,
@@ -287,6 +304,7 @@ def neutrino_mean_energy(self, file_name,
     elif comp == 'nux':
         return mean_ene[2]
     
+@region_of_interest
 @hdf_isopen
 @notrino_used
 def neutrino_luminosity(self, file_name, 
@@ -321,6 +339,7 @@ def neutrino_luminosity(self, file_name,
     
 ## GREY
 
+@region_of_interest
 @get_grid
 @smooth
 @hdf_isopen
@@ -330,17 +349,20 @@ def neutrino_energy_density_grey(self, file_name,
                                  **kwargs):
     if not kwargs['notrino']:
         try:
-            nu_ene = self.ghost.remove_ghost_cells(np.squeeze(
-                self._Simulation__data_h5['/neutrinogrey/egrey'][..., 0]), self.dim)
+            nu_ene = np.squeeze(
+                self._Simulation__data_h5['/neutrinogrey/egrey'][
+                    self.ghost.hyperslab(self.dim, 0)])
             nu_ene[..., 2] /= 4
         except:
-            nu_ene = self.ghost.remove_ghost_cells(np.squeeze(
-                    self._Simulation__data_h5['neutrino/e'][..., 0]), self.dim)
+            nu_ene = np.squeeze(
+                    self._Simulation__data_h5['neutrino/e'][
+                        self.ghost.hyperslab(self.dim, 0)])
             nu_ene[..., 2] /= 4
             nu_ene = np.sum(nu_ene, axis=self.dim)
     else:
-        nu_ene = self.ghost.remove_ghost_cells(np.squeeze(
-            self._Simulation__data_h5['notrino/notrino_e'][...]), self.dim)
+        nu_ene = np.squeeze(
+            self._Simulation__data_h5['notrino/notrino_e'][
+                self.ghost.hyperslab(self.dim)])
     if comp == 'all':
         return (aerray(nu_ene[..., 0], u.erg / u.cm ** 3, 'nue_edens',
                     r'$E_{\nu_\mathrm{e}}$', 'viridis', [1e28, 1e32], True),
@@ -361,6 +383,7 @@ def neutrino_energy_density_grey(self, file_name,
         aerray(nu_ene[..., 2], u.erg / u.cm ** 3, 'nux_edens',
                     r'$E_{\nu_\mathrm{x}}$', 'plasma', [1e28, 1e32], True)
 
+@region_of_interest
 @get_grid
 @smooth
 @hdf_isopen
@@ -372,15 +395,18 @@ def neutrino_momenta_grey(self, file_name, **kwargs):
     """
     if not kwargs['notrino']:
         try:
-            nu_flux =  self.ghost.remove_ghost_cells(np.squeeze(
-                self._Simulation__data_h5['/neutrinogrey/egrey'][..., 1:]), self.dim)
+            nu_flux =  np.squeeze(
+                self._Simulation__data_h5['/neutrinogrey/egrey'][
+                    self.ghost.hyperslab(self.dim, slice(1, None))])
         except:
-            nu_flux = self.ghost.remove_ghost_cells(np.squeeze(
-                    self._Simulation__data_h5['neutrino/e'][..., 1:]), self.dim)
+            nu_flux = np.squeeze(
+                    self._Simulation__data_h5['neutrino/e'][
+                        self.ghost.hyperslab(self.dim, slice(1, None))])
             nu_flux = np.sum(nu_flux, axis=self.dim)
     else:
-        nu_flux = self.ghost.remove_ghost_cells(np.squeeze(
-                self._Simulation__data_h5['notrino/notrino_f'][...]), self.dim)
+        nu_flux = np.squeeze(
+                self._Simulation__data_h5['notrino/notrino_f'][
+                    self.ghost.hyperslab(self.dim)])
         
     if self.dim == 1 or kwargs['notrino']:
         nu_flux[..., 2] /= 4
@@ -410,6 +436,7 @@ def neutrino_momenta_grey(self, file_name, **kwargs):
                 [[-1e40, 1e40], [-1e39, 1e39], [-1e39, 1e39]], True)
             )
 
+@region_of_interest
 @get_grid
 @smooth
 def neutrino_number_density_grey(self, file_name,
@@ -433,12 +460,14 @@ def neutrino_number_density_grey(self, file_name,
     
 # BLACK BODY
 
+@region_of_interest
 @get_grid
 @smooth
 @hdf_isopen
 def neutrino_number_density_BB(self, file_name, **kwargs):
-    ndens = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['notrino/notrino_nBB'][...]), self.dim)
+    ndens = np.squeeze(
+        self._Simulation__data_h5['notrino/notrino_nBB'][
+            self.ghost.hyperslab(self.dim)])
     ndens = np.expand_dims(ndens, axis = -2)
     return (aerray(ndens[..., 0], u.cm ** (-3), 'Nnue_BB',
                 r'$N_{\nu_\mathrm{e}}^\mathrm{BB}$', 'gnuplot', [1e33, 1e36], 
@@ -451,6 +480,7 @@ def neutrino_number_density_BB(self, file_name, **kwargs):
                 True)
             )
     
+@region_of_interest
 @get_grid
 @smooth
 @hdf_isopen
@@ -459,8 +489,9 @@ def neutrino_energy_density_BB(self, file_name, **kwargs):
     Neutrino energy density, black body equivalent.
     Now with NOTRINO case!
     """
-    nu_ene = self.ghost.remove_ghost_cells(np.squeeze(
-    self._Simulation__data_h5['notrino/notrino_eBB'][...]), self.dim)
+    nu_ene = np.squeeze(
+    self._Simulation__data_h5['notrino/notrino_eBB'][
+        self.ghost.hyperslab(self.dim)])
     nu_ene = np.expand_dims(nu_ene, axis = -2)
     nu_ene[..., 2] /= 4
     return (aerray(nu_ene[..., 0], u.erg / u.cm ** 3, 'nue_edens_BB',
@@ -5,6 +5,7 @@ from AeViz.utils.physics.load_save_radii_utils import calculate_radius
 from AeViz.utils.physics.PNS_ang_mom_nu_utils import calculate_angular_mom_PNS_nu
 from AeViz.utils.physics.load_save_neutrinos import calculate_luminosity
 from AeViz.utils.physics.inertia import calculate_moment_inertia
+from AeViz.utils.physics.fused_postprocessing import fused_postprocessing
 import os
 from typing import Literal
 
@@ -84,6 +85,25 @@ def bounce_compactness(self, mass = None):
     else:
         return compactness
 
+## -----------------------------------------------------------------
+## POSTPROCESSING
+## -----------------------------------------------------------------
+
+def postprocess(self, rmax=None, neutrinos=True, profiles=True, GWs=True,
+                isodensity=False, inertia=False, save_checkpoints=True,
+                n_workers=None):
+    """
+    Computes time, radii, masses and energies, kick velocity, profiles,
+    NE220 (2D) or Qdot (3D) and, optionally, isodensity lines and
+    inertia moment with a single pass over the output files.
+    Every quantity is saved in the same file it would be saved by its
+    own method, so they can be read afterwards in the usual way.
+    If n_workers is greater than one, the timesteps are split among
+    that many processes.
+    """
+    fused_postprocessing(self, rmax, neutrinos, profiles, GWs, isodensity,
+                         inertia, save_checkpoints, n_workers)
+
 ## -----------------------------------------------------------------
 ## RADII DATA
 ## -----------------------------------------------------------------
@@ -575,6 +595,7 @@ def mass_accretion_500km(self, tob_corrected=True, save_checkpoints=True,
                                          no_new=self.no_new)
     return data
 
+@region_of_interest
 @get_grid
 @smooth
 @hdf_isopen
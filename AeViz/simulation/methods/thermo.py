@@ -11,6 +11,7 @@ imported into the Simulation class.
 ## -----------------------------------------------------------------
 
 ## THERMODYNAMICAL
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -18,12 +19,14 @@ imported into the Simulation class.
 @finite_differences
 @hdf_isopen
 def gas_pressure(self, file_name, **kwargs):
-    data =  self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['thd/data'][..., self.hydroTHD_index['thd']
-                                    ['I_PGAS']]), self.dim)
+    data =  np.squeeze(
+        self._Simulation__data_h5['thd/data'][
+            self.ghost.hyperslab(self.dim,
+                                 self.hydroTHD_index['thd']['I_PGAS'])])
     return aerray(data, u.Ba, name='gas_pressure', label=r'$P_\mathrm{gas}$',
                   cmap='gist_rainbow_r', limits=[1e25, 1e34], log=True)
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -31,12 +34,14 @@ def gas_pressure(self, file_name, **kwargs):
 @finite_differences
 @hdf_isopen
 def temperature(self, file_name, **kwargs):
-    data = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['thd/data'][..., self.hydroTHD_index['thd']
-                                    ['I_TMPR']]), self.dim)
+    data = np.squeeze(
+        self._Simulation__data_h5['thd/data'][
+            self.ghost.hyperslab(self.dim,
+                                 self.hydroTHD_index['thd']['I_TMPR'])])
     return aerray(data, u.MeV, name='temperature', label=r'$T$',
                   cmap='inferno', limits=[0, 40], log=False)
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -44,12 +49,14 @@ def temperature(self, file_name, **kwargs):
 @finite_differences
 @hdf_isopen
 def enthalpy(self, file_name, **kwargs):
-    data = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['thd/data'][..., self.hydroTHD_index['thd']
-                                    ['I_ENTH']]), self.dim)
+    data = np.squeeze(
+        self._Simulation__data_h5['thd/data'][
+            self.ghost.hyperslab(self.dim,
+                                 self.hydroTHD_index['thd']['I_ENTH'])])
     return aerray(data, u.erg, 'enthalpy', r'$H$', 'gist_stern', [1e25, 1e36],
                   True)
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -57,12 +64,14 @@ def enthalpy(self, file_name, **kwargs):
 @finite_differences
 @hdf_isopen
 def entropy(self, file_name, **kwargs):
-    data = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['thd/data'][..., self.hydroTHD_index['thd']
-                                    ['I_ENTR']]), self.dim)
+    data = np.squeeze(
+        self._Simulation__data_h5['thd/data'][
+            self.ghost.hyperslab(self.dim,
+                                 self.hydroTHD_index['thd']['I_ENTR'])])
     return aerray(data, u.kBol / u.bry, 'entropy', r'$s$', 'gist_rainbow_r',
                   [1.5, 15], False)
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -70,13 +79,15 @@ def entropy(self, file_name, **kwargs):
 @finite_differences
 @hdf_isopen
 def adiabatic_index(self, file_name, **kwargs):
-    data = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['thd/data'][..., self.hydroTHD_index['thd']
-                                    ['I_GAMM']]), self.dim)
+    data = np.squeeze(
+        self._Simulation__data_h5['thd/data'][
+            self.ghost.hyperslab(self.dim,
+                                 self.hydroTHD_index['thd']['I_GAMM'])])
     return aerray(data, u.dimensionless_unscaled, 'adiabatic_index',
                   r'$\Gamma$', 'cividis', [0.5, 3.5], False)
 
 ## RELATIVITY AND GRAVITY
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -84,12 +95,14 @@ def adiabatic_index(self, file_name, **kwargs):
 @finite_differences
 @hdf_isopen
 def lorentz(self, file_name, **kwargs):
-    data = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['thd/data'][..., self.hydroTHD_index['thd']
-                                    ['I_LRTZ']]), self.dim)
+    data = np.squeeze(
+        self._Simulation__data_h5['thd/data'][
+            self.ghost.hyperslab(self.dim,
+                                 self.hydroTHD_index['thd']['I_LRTZ'])])
     return aerray(data, u.dimensionless_unscaled, 'lorentz_factor',
                   r'$\gamma$', 'gist_rainbow', [1, 1.1], False)
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -107,6 +120,7 @@ def gravitational_potential(self, file_name, **kwargs):
     return aerray(data, u.erg / u.g, 'gravitational_potential', r'\Phi',
                   'magma', [-1e22, -1e15], True)
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -119,6 +133,7 @@ def gravitational_energy(self, file_name, **kwargs):
              limits=[-1e22, -1e15], cmap='magma')
     return data
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -140,6 +155,7 @@ def lapse_function(self, file_name, **kwargs):
     return alpha
     
 ## ENERGY
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -147,12 +163,14 @@ def lapse_function(self, file_name, **kwargs):
 @finite_differences
 @hdf_isopen
 def internal_energy(self, file_name, **kwargs):
-    data = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['thd/data'][..., self.hydroTHD_index['thd']
-                                    ['I_EINT']]), self.dim)
+    data = np.squeeze(
+        self._Simulation__data_h5['thd/data'][
+            self.ghost.hyperslab(self.dim,
+                                 self.hydroTHD_index['thd']['I_EINT'])])
     return aerray(data, u.erg / u.cm**3, 'internal_energy',
                   r'$E_\mathrm{int}$', 'nipy_spectral', [1e24, 1e35], log=True)
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -165,6 +183,7 @@ def specific_internal_energy(self, file_name, **kwargs):
              limits=[1e16, 1e20], log=True)
     return data
 
+@region_of_interest
 @get_grid
 @mask_points
 @smooth
@@ -172,8 +191,9 @@ def specific_internal_energy(self, file_name, **kwargs):
 @finite_differences
 @hdf_isopen
 def nu_heat(self, file_name, **kwargs):
-    data = self.ghost.remove_ghost_cells(np.squeeze(
-        self._Simulation__data_h5['thd/data'][..., self.hydroTHD_index['thd']
-                                    ['I_HEAT']]), self.dim)
+    data = np.squeeze(
+        self._Simulation__data_h5['thd/data'][
+            self.ghost.hyperslab(self.dim,
+                                 self.hydroTHD_index['thd']['I_HEAT'])])
     return aerray(data, u.erg / u.cm ** 3, 'neutrino_heat', r'$Q_\nu$',
                   'Spectral_r', [-1e31, 1e32], True)
\ No newline at end of file
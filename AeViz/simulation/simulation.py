@@ -10,11 +10,14 @@ from AeViz.utils.files.parfiles import (load_parfile,
 from AeViz.utils.files.path_utils import (pltf, simulation_local_storage_folder,
                                           local_storage_folder, 
                                           find_simulation)
-from AeViz.utils.decorators.simulation import hdf_isopen
-from AeViz.utils.files.file_utils import list_module_functions
-from AeViz.utils.utils import time_array
+from AeViz.utils.decorators.simulation import (hdf_isopen,
+                                                region_of_interest)
+from AeViz.utils.files.file_utils import list_module_functions, load_file
+from AeViz.utils.files.hdf_snapshot import HDFSnapshot, prefetch_snapshots
+from AeViz.utils.files.field_cache import FieldCache, HDFPool
+from AeViz.utils.files.time_index import TimeIndex
 import numpy as np
-import types, os
+import types, os, h5py, importlib
 from AeViz.utils.decorators.grid import get_grid
 from AeViz.utils.decorators.simulation import subtract_tob
 from AeViz.units.aeseries import aeseries
@@ -22,11 +25,13 @@ from AeViz.units.aeseries import aeseries
 
 class Simulation:
     def __init__(self, simulation_name, simulation_folder_path=None,
-                 dim = None):
+                 dim = None, lazy=True):
         """
         Simulation class initialization. This is the class that should
         be called when loading up a simulation.
-        Methods are loaded at runtime based on the simulation type.
+        Methods are loaded at runtime based on the simulation type. If
+        lazy, each method is imported and bound on first access and the
+        time of bounce is computed when first needed.
         """
         # Let's set up the main parameters that define a simulation,
         # dimension, geometry, path and name
@@ -39,11 +44,11 @@ class Simulation:
             self.evolved_qts, self.lapse_form = get_simulation_info(parfile)
         self.ghost_cells = get_stencils(parfile)
         self.hydroTHD_index = get_indices_from_parfile(parfile)
+        self.storage_path = simulation_local_storage_folder(pltf(), 
+                                                self.simulation_name, self.dim)
         self.cell = cell(self.path, self.dim, geom=self.GEOM,
                          neu=self.evolved_qts['neudim'])
         self.ghost = ghost(self.ghost_cells)
-        self.storage_path = simulation_local_storage_folder(pltf(), 
-                                                self.simulation_name, self.dim)
         self.utils_path = os.path.join(local_storage_folder(pltf()), '.utils')
         del parfile
         if self.GEOM == 2:
@@ -71,30 +76,53 @@ class Simulation:
         ## Opened file name
         self.__data_h5 = None
         self.__opened_hdf_file = ''
+        ## Cache of the fields read from the opened files
+        self.field_cache = FieldCache()
+        ## Cartesian meshes of the 2D projections, see get_grid
+        self.projection_grids = {}
+        ## Timestep files kept open
+        self.hdf_pool = HDFPool(self.field_cache)
         self.hdf_file_list = self.__get_hdf_file_list()
-        ## Load the methods based on the simulation type
-        self.__load_hydro_methods()
-        self.__load_THD_methods()
-        self.__load_composition_methods()
-        self.__load_global_methods()
+        ## Times of the files, read when first needed
+        self.time_index = TimeIndex(self.__hdf_path, self.storage_path)
         self.no_new = True ## We do not compute the new postprocessing
-        if self.evolved_qts['magdim'] > 0:
-            self.__load_magnetic_fields_methods()
-        if self.evolved_qts['neudim'] > 0:
-            self.__load_neutrinos_methods()
-        if self.GEOM == 2:
-            self.__load_supernova_methods()
-            self.__load_instabilities_methods()
-            self.__load_spherical_harmonics_methods()
-            self.__load_spherical_symmetry_methods()
-            if self.dim > 1:
-                self.__load_GWs_methods()
-            self.tob = self.time_of_bounce()
+        self.n_workers = 1 ## Processes used by the postprocessing sweeps
+        ## Files read ahead during the sweeps and their memory limit
+        self.prefetch_depth = 2
+        self.prefetch_bytes = 2**30
+        ## Methods based on the simulation type, bound on first access
+        ## unless lazy is False
+        self.__methods = {}
+        self.__method_modules = self.__get_method_modules()
+        ## Time of bounce, computed on first access
+        self.__tob = None
+        if not lazy:
+            self.load_methods()
+            if self.GEOM == 2:
+                self.tob = self.time_of_bounce()
 
     ## -----------------------------------------------------------------
     ## UTILITIES
     ## -----------------------------------------------------------------
 
+    ## TIME OF BOUNCE
+    @property
+    def tob(self):
+        """
+        Time of bounce of the supernova simulations, computed on first
+        access.
+        """
+        if self.__tob is None:
+            if self.GEOM != 2:
+                raise AttributeError("'Simulation' object has no attribute "
+                                     "'tob'")
+            self.__tob = self.time_of_bounce()
+        return self.__tob
+
+    @tob.setter
+    def tob(self, tob):
+        self.__tob = tob
+
     ## FILE LIST AND FILE SEARCH
     def __get_hdf_file_list(self):
         """
@@ -107,52 +135,195 @@ class Simulation:
         file_list.sort()
         return file_list
 
+    def update_file_list(self):
+        """
+        Lists again the 'timestep' files, to include the ones written
+        after the simulation was loaded. Only the new files are added
+        to the time index.
+        """
+        self.hdf_file_list = self.__get_hdf_file_list()
+        self.time_index.refresh(self.hdf_file_list)
+
     def find_file_from_time(self, time_to_find, return_index=False,
-                            tob_corrected=True):
+                            tob_corrected=True, mode='ceil'):
         """
         Returns the name of the file corresponding to the given time. If
         return_index is True, returns the index of the file in the 
-        hdf_file_list. If time_in_ms is True, the time to giveis in ms,
-        otherwise is in s.
+        hdf_file_list. The time is in s if not an aerray, and it can be
+        an array of times, in which case a list of files is returned.
+        Modes:
+            ceil: first file at or after the time
+            floor: last file at or before the time
+            nearest: file closest in time
         """
         if not isinstance(time_to_find, aerray):
             time_to_find = aerray(time_to_find, u.s)
-        time_to_find = time_to_find.to(u.s)
-        
-        file_list = self.hdf_file_list
-        time = time_array(self)
-        if not tob_corrected and self.GEOM == 2:
-            time += self.tob
-        index = np.argmax(time>=time_to_find)
+        time_to_find = time_to_find.to(u.s).value
+        offset = 0
+        if tob_corrected and self.GEOM == 2:
+            offset = self.tob.to(u.s).value
+        index = self.time_index.lookup(self.hdf_file_list, time_to_find,
+                                       mode, offset)
+        if np.ndim(index) == 0:
+            index = int(index)
+            file = self.hdf_file_list[index]
+        else:
+            file = [self.hdf_file_list[i] for i in index]
         if return_index:
-            return file_list[index], index
-        return file_list[index]
+            return file, index
+        return file
+    
+    ## SNAPSHOTS
+    def load_snapshot(self, file_name, snapshot=None):
+        """
+        Opens the selected file as an in-memory snapshot: each dataset
+        is read from disk only once and then shared by every method
+        called on this timestep, until another file is opened.
+        An already opened snapshot of the file (e.g. from
+        prefetch_snapshots) can be given instead.
+        """
+        if isinstance(self.__data_h5, HDFSnapshot):
+            self.__data_h5.close()
+        self.__opened_hdf_file = file_name
+        if snapshot is None:
+            snapshot = HDFSnapshot(os.path.join(self.__hdf_path, file_name))
+        self.__data_h5 = snapshot
+
+    def prefetch_snapshots(self, file_names):
+        """
+        Iterator over the snapshots of the selected files, reading in
+        background the datasets of the next prefetch_depth files while
+        the current one is processed.
+        """
+        return prefetch_snapshots([os.path.join(self.__hdf_path, file_name)
+                                   for file_name in file_names],
+                                  self.prefetch_depth, self.prefetch_bytes)
+
+    def release_snapshot(self):
+        """
+        Closes the currently opened snapshot and frees its cached data.
+        """
+        if isinstance(self.__data_h5, HDFSnapshot):
+            self.__data_h5.close()
+        self.__data_h5 = None
+        self.__opened_hdf_file = ''
+
+    def close_files(self):
+        """
+        Closes the opened snapshot and all the files kept open by the
+        file pool.
+        """
+        self.release_snapshot()
+        self.hdf_pool.close()
     
     ## ERROR
+    @region_of_interest
     @get_grid
     @hdf_isopen
     def error(self, file_name, **kwargs):
-        data = self.ghost.remove_ghost_cells(np.squeeze(
-            self.__data_h5['thd/data'][..., self.hydroTHD_index['thd']
-                                          ['I_EOSERR']]), self.dim)
+        data = np.squeeze(
+            self.__data_h5['thd/data'][
+                self.ghost.hyperslab(self.dim,
+                                     self.hydroTHD_index['thd']['I_EOSERR'])])
         return aerray(data, u.dimensionless_unscaled, 'error', 
                       r'$\mathrm{Error}$',
                       cmap='seismic', limits=[0, 1], log=False)
     
     @subtract_tob
     def global_error(self, tob_corrected=True, **kwargs):
-        data = np.loadtxt(os.path.join(self.__log_path, self.__erg_data))
+        data = load_file(self.__log_path, self.__erg_data, self.storage_path)
         return aeseries(
             aerray(data[:, -1], u.dimensionless_unscaled, 'error', 
                       r'$\mathrm{Error cells}$',
                       cmap='seismic', limits=[1, 1e3], log=True),
             time = aerray(data[:,2], u.s, 'time', r'$t$', None,
-                          [0, data[-1, 2]], False))
+                          [0, data[-1, 2]], None))
     
     ## QOF
     def neglect_new(self):
         self.no_new = not self.no_new
 
+    def set_workers(self, n_workers):
+        """
+        Sets the number of processes among which the timesteps are
+        split when computing the postprocessing quantities.
+        """
+        self.n_workers = max(1, int(n_workers))
+
+    def set_prefetch(self, depth=None, max_bytes=None):
+        """
+        Sets how many timestep files are read ahead during the sweeps
+        and the maximum memory in bytes they can take. Zero depth
+        disables the prefetching.
+        """
+        if depth is not None:
+            self.prefetch_depth = max(0, int(depth))
+        if max_bytes is not None:
+            self.prefetch_bytes = max_bytes
+
+    def set_cache_size(self, max_bytes):
+        """
+        Sets the maximum size in bytes of the cache of the fields read
+        from the timestep files. Zero disables the cache.
+        """
+        self.field_cache.resize(max_bytes)
+
+    def set_file_pool(self, max_files=None, rdcc_nbytes=None):
+        """
+        Sets how many timestep files are kept open at the same time and
+        the size in bytes of the HDF5 chunk cache of each of them.
+        Changing the chunk cache size closes the opened files.
+        """
+        if rdcc_nbytes not in (None, self.hdf_pool.rdcc_nbytes):
+            self.release_snapshot()
+        self.hdf_pool.resize(max_files, rdcc_nbytes)
+
+    def set_block_reader(self, enabled=True, variables=None, nvar_first=None):
+        """
+        Reads the whole hydro/data and thd/data blocks of each file at
+        once, instead of a strided selection of the file for each
+        variable. The methods then return read-only views of the block,
+        so their results cannot be modified in place.
+        The field cache is enlarged to hold the blocks of one file.
+        Input:
+            enabled: switches the block reader on or off
+            variables: names of the indices to load (e.g. ['I_RH',
+                       'I_PGAS']), by default all of them. The other
+                       variables are read one by one.
+            nvar_first: stores the blocks with the variables along the
+                        first axis, so that each of them is contiguous
+                        in memory. By default only in 3D.
+        """
+        if not enabled:
+            self.field_cache.set_blocks()
+            return
+        if nvar_first is None:
+            nvar_first = self.dim == 3
+        blocks = {}
+        for group in ['hydro', 'thd']:
+            if variables is None:
+                blocks[group + '/data'] = None
+                continue
+            indices = []
+            for name in variables:
+                if self.hydroTHD_index[group].get(name) is not None:
+                    indices += list(np.atleast_1d(
+                        self.hydroTHD_index[group][name]))
+            if indices:
+                blocks[group + '/data'] = sorted(set(int(i) for i in indices))
+        block_bytes = 0
+        with h5py.File(os.path.join(self.__hdf_path, self.hdf_file_list[0]),
+                       'r') as data_h5:
+            for (key, indices) in blocks.items():
+                if key not in data_h5:
+                    continue
+                nvar = data_h5[key].shape[-1] if indices is None \
+                    else len(indices)
+                block_bytes += data_h5[key].size // data_h5[key].shape[-1] \
+                    * nvar * data_h5[key].dtype.itemsize
+        self.field_cache.set_blocks(blocks, nvar_first)
+        self.field_cache.resize(max(self.field_cache.max_bytes, block_bytes))
+
     ## TIME
     @hdf_isopen
     def time(self, file_name, tob_corrected=True):
@@ -167,122 +338,137 @@ class Simulation:
         return data
     
     ## METHOD LOADING
-    def __load_hydro_methods(self):
-        import AeViz.simulation.methods.hydro
-        funcs = list_module_functions(AeViz.simulation.methods.hydro)
-        for name, obj in funcs:
-            method_name = name
-            if name == 'omega' and self.GEOM != 2 and self.dim < 2:
-                continue
-            if 'velocity' in name:
-                if self.evolved_qts['veldim'] < 1:
-                    continue
-                if 'theta' in name and self.evolved_qts['veldim'] < 2:
-                    continue
-                if 'phi' in name and self.evolved_qts['veldim'] < 3:
-                    continue
-                if self.GEOM == 1:
-                    method_name = method_name.replace('radial', 'x').\
-                        replace('theta', 'y').replace('phi', 'z')
-            setattr(self, method_name, types.MethodType(obj, self))
-            
-    def __load_THD_methods(self):
-        import AeViz.simulation.methods.thermo
-        funcs = list_module_functions(AeViz.simulation.methods.thermo)
-        for name, obj in funcs:
-            if name == 'entropy' and self.evolved_qts['entropie'] < 1:
-                continue
-            if name == 'temperature' and self.evolved_qts['tempratr'] < 1:
-                continue
-            if name == 'lorentz' and not self.relativistic:
-                continue
-            setattr(self, name, types.MethodType(obj, self))
-    
-    def __load_composition_methods(self):
-        import AeViz.simulation.methods.composition
-        funcs = list_module_functions(AeViz.simulation.methods.composition)
-        for name, obj in funcs:
-            if name == 'Ye' and self.evolved_qts['y_edim'] < 1:
-                continue
-            if self.evolved_qts['comp_dim'] < 1 and name in ['heavy_fraction',
-                                                             'Abar', 'Zbar',
-                                                             'proton_fraction',
-                                                             'neutron_fraction',
-                                                             'alpha_fraction']:
-                continue
-            if self.evolved_qts['cpot_dim'] < 1 and 'chemical_potential' in \
-                name:
-                continue
-            setattr(self, name, types.MethodType(obj, self))
-    
-    def __load_neutrinos_methods(self):
-        import AeViz.simulation.methods.neutrinos
-        funcs = list_module_functions(AeViz.simulation.methods.neutrinos)
-        for name, obj in funcs:
-            setattr(self, name, types.MethodType(obj, self))
-        try:
-            import snewpy
-            import AeViz.simulation.methods.snewpy
-            funcs = list_module_functions(AeViz.simulation.methods.snewpy)
-            for name, obj in funcs:
-                setattr(self, name, types.MethodType(obj, self))
-        except:
-            pass
+    def __getattr__(self, name):
+        """
+        Binds the methods of the simulation on first access. The modules
+        of the capability table are imported one at a time, until the
+        one defining the method is found.
+        """
+        if (name.startswith('__') and name.endswith('__')) or \
+            hasattr(type(self), name) or \
+                '_Simulation__method_modules' not in vars(self):
+            raise AttributeError(f"'Simulation' object has no attribute "
+                                 f"'{name}'")
+        while name not in self.__methods and self.__method_modules:
+            self.__import_methods(*self.__method_modules.pop(0))
+        if name not in self.__methods:
+            raise AttributeError(f"'Simulation' object has no attribute "
+                                 f"'{name}'")
+        method = types.MethodType(self.__methods[name], self)
+        setattr(self, name, method)
+        return method
 
-    
-    def __load_magnetic_fields_methods(self):
-        import AeViz.simulation.methods.magnetic_fields
-        funcs = list_module_functions(AeViz.simulation.methods.magnetic_fields)
-        for name, obj in funcs:
-            if ('poloidal' in name or 'toroidal' in name) and self.GEOM != 2:
-                continue
-            setattr(self, name, types.MethodType(obj, self))
-    
-    def __load_GWs_methods(self):
-        import AeViz.simulation.methods.GWs
-        funcs = list_module_functions(AeViz.simulation.methods.GWs)
-        for name, obj in funcs:
-            setattr(self, name, types.MethodType(obj, self))
-        try:
-            import PyEMD
-            import AeViz.simulation.methods.IMFs
-            funcs = list_module_functions(AeViz.simulation.methods.IMFs)
-            for name, obj in funcs:
+    def __dir__(self):
+        self.load_methods()
+        return list(super().__dir__()) + list(self.__methods.keys())
+
+    def load_methods(self):
+        """
+        Imports all the methods modules of the capability table, instead
+        of waiting for the first access to each method.
+        """
+        while self.__method_modules:
+            self.__import_methods(*self.__method_modules.pop(0))
+        for name, obj in self.__methods.items():
+            if name not in vars(self):
                 setattr(self, name, types.MethodType(obj, self))
-        except:
-            pass
-    
-    def __load_global_methods(self):
-        import AeViz.simulation.methods.global_methods
-        funcs = list_module_functions(AeViz.simulation.methods.global_methods)
-        for name, obj in funcs:
-            if 'neutrino' in name and self.evolved_qts['neudim'] < 1:
-                continue
-            if 'Ye' in name and self.evolved_qts['y_edim'] < 1:
-                continue
-            setattr(self, name, types.MethodType(obj, self))
-    
-    def __load_supernova_methods(self):
-        import AeViz.simulation.methods.supernova
-        funcs = list_module_functions(AeViz.simulation.methods.supernova)
-        for name, obj in funcs:
-            setattr(self, name, types.MethodType(obj, self))
 
-    def __load_instabilities_methods(self):
-        import AeViz.simulation.methods.instabilities
-        funcs = list_module_functions(AeViz.simulation.methods.instabilities)
-        for name, obj in funcs:
-            setattr(self, name, types.MethodType(obj, self))
+    def __get_method_modules(self):
+        """
+        Capability table of the simulation: methods modules available
+        for its evolved quantities and geometry, each with the function
+        that selects (and renames) its methods and the optional package
+        it depends on. The optional ones (snewpy and PyEMD are slow to
+        import) are listed last.
+        """
+        modules = [('hydro', self.__hydro_method_name, None),
+                   ('thermo', self.__THD_method_name, None),
+                   ('composition', self.__composition_method_name, None),
+                   ('global_methods', self.__global_method_name, None)]
+        if self.evolved_qts['magdim'] > 0:
+            modules.append(('magnetic_fields',
+                            self.__magnetic_fields_method_name, None))
+        if self.evolved_qts['neudim'] > 0:
+            modules.append(('neutrinos', None, None))
+        if self.GEOM == 2:
+            modules.extend([('supernova', None, None),
+                            ('instabilities', None, None),
+                            ('sph_harmonics', None, None),
+                            ('other_spherical_sym', None, None)])
+            if self.dim > 1:
+                modules.append(('GWs', None, None))
+        if self.evolved_qts['neudim'] > 0:
+            modules.append(('snewpy', None, 'snewpy'))
+        if self.GEOM == 2 and self.dim > 1:
+            modules.append(('IMFs', None, 'PyEMD'))
+        return modules
+
+    def __import_methods(self, module_name, method_name, package):
+        """
+        Imports a methods module and adds its methods to the ones that
+        can be bound. Modules whose optional package is not installed
+        are skipped.
+        """
+        if package is not None:
+            try:
+                importlib.import_module(package)
+            except:
+                return
+        module = importlib.import_module('AeViz.simulation.methods.' +
+                                         module_name)
+        for name, obj in list_module_functions(module):
+            if method_name is not None:
+                name = method_name(name)
+                if name is None:
+                    continue
+            self.__methods[name] = obj
 
-    def __load_spherical_harmonics_methods(self):
-        import AeViz.simulation.methods.sph_harmonics
-        funcs = list_module_functions(AeViz.simulation.methods.sph_harmonics)
-        for name, obj in funcs:
-            setattr(self, name, types.MethodType(obj, self))
-    
-    def __load_spherical_symmetry_methods(self):
-        import AeViz.simulation.methods.other_spherical_sym
-        funcs = list_module_functions(
-            AeViz.simulation.methods.other_spherical_sym)
-        for name, obj in funcs:
-            setattr(self, name, types.MethodType(obj, self))
\ No newline at end of file
+    def __hydro_method_name(self, name):
+        if name == 'omega' and self.GEOM != 2 and self.dim < 2:
+            return None
+        if 'velocity' in name:
+            if self.evolved_qts['veldim'] < 1:
+                return None
+            if 'theta' in name and self.evolved_qts['veldim'] < 2:
+                return None
+            if 'phi' in name and self.evolved_qts['veldim'] < 3:
+                return None
+            if self.GEOM == 1:
+                name = name.replace('radial', 'x').\
+                    replace('theta', 'y').replace('phi', 'z')
+        return name
+
+    def __THD_method_name(self, name):
+        if name == 'entropy' and self.evolved_qts['entropie'] < 1:
+            return None
+        if name == 'temperature' and self.evolved_qts['tempratr'] < 1:
+            return None
+        if name == 'lorentz' and not self.relativistic:
+            return None
+        return name
+
+    def __composition_method_name(self, name):
+        if name == 'Ye' and self.evolved_qts['y_edim'] < 1:
+            return None
+        if self.evolved_qts['comp_dim'] < 1 and name in ['heavy_fraction',
+                                                         'Abar', 'Zbar',
+                                                         'proton_fraction',
+                                                         'neutron_fraction',
+                                                         'alpha_fraction']:
+            return None
+        if self.evolved_qts['cpot_dim'] < 1 and 'chemical_potential' in \
+            name:
+            return None
+        return name
+
+    def __magnetic_fields_method_name(self, name):
+        if ('poloidal' in name or 'toroidal' in name) and self.GEOM != 2:
+            return None
+        return name
+
+    def __global_method_name(self, name):
+        if 'neutrino' in name and self.evolved_qts['neudim'] < 1:
+            return None
+        if 'Ye' in name and self.evolved_qts['y_edim'] < 1:
+            return None
+        return name
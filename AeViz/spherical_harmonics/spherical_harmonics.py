@@ -46,11 +46,50 @@ class AssociatedLegendrePolynomials:
                 summ += factorial(k) / factorial(k-m) * \
                     binom((l + k - 1) / 2, l) * x ** (k - m) * binom(l, k)
             return (-1)**m * 2**l * (1 - x ** 2) ** (m / 2) * summ
+
+    def P_norm_table(self, lmax, x):
+        """
+        Calculates all the normalized associated Legendre polynomials
+        sqrt((2l+1)/(4π) (l-m)!/(l+m)!) P^m_l(x) with 0 <= m <= l <= lmax,
+        using the stable three-term recurrences
+        P_mm = -sqrt((2m+1)/(2m)) sqrt(1-x^2) P_m-1m-1, P_00 = 1/sqrt(4π)
+        P_m+1m = sqrt(2m+3) x P_mm
+        P_lm = a_lm (x P_l-1m - b_lm P_l-2m)
+        with a_lm = sqrt((4l^2-1)/(l^2-m^2)) and
+        b_lm = sqrt(((l-1)^2-m^2)/(4(l-1)^2-1)).
+        Unlike the closed form, they do not lose precision at high l:
+        the two agree to round-off below l=30, while the m-summed
+        decompositions with l >= 30 differ by up to a few 1e-3.
+        Takes as input:
+            lmax: maximum degree of the polynomials
+            x: value at which the polynomials are evaluated, array or
+                scalar
+        Returns:
+            array with shape (lmax+1, lmax+1, *x.shape), indexed as
+            [l, m], zero for m > l
+        """
+        x = np.asarray(x, dtype=float)
+        sin_x = np.sqrt(np.clip(1 - x ** 2, 0, None))
+        table = np.zeros((lmax + 1, lmax + 1) + x.shape)
+        table[0, 0] = 1 / np.sqrt(4 * np.pi)
+        for m in range(lmax + 1):
+            if m > 0:
+                table[m, m] = -np.sqrt((2 * m + 1) / (2 * m)) * sin_x * \
+                    table[m - 1, m - 1]
+            if m < lmax:
+                table[m + 1, m] = np.sqrt(2 * m + 3) * x * table[m, m]
+            for l in range(m + 2, lmax + 1):
+                a_lm = np.sqrt((4 * l ** 2 - 1) / (l ** 2 - m ** 2))
+                b_lm = np.sqrt(((l - 1) ** 2 - m ** 2) / \
+                    (4 * (l - 1) ** 2 - 1))
+                table[l, m] = a_lm * (x * table[l - 1, m] - \
+                    b_lm * table[l - 2, m])
+        return table
     
 
 class SphericalHarmonics(AssociatedLegendrePolynomials):
     def __init__(self):
-        pass
+        self.__bases = {}
     
     def Ylm(self, m, l, theta, phi):
         """
@@ -101,6 +140,77 @@ class SphericalHarmonics(AssociatedLegendrePolynomials):
         else:
             return np.sqrt(2) * (-1) ** m * self.Ylm(m, l, theta, phi).real
 
+    def Ylm_norm_basis(self, lmax, theta, phi, msum=False):
+        """
+        Calculates Ylm_norm for all the degrees up to lmax on the
+        (phi, theta) grid, from the recurrence relations of
+        P_norm_table. The basis is computed once per grid and then
+        cached.
+        Takes as input:
+            lmax: maximum degree of the harmonics
+            theta: polar angle, array
+            phi: azimutal angle, array or scalar
+            msum: sums the harmonics of the same degree over m
+        Returns:
+            array with shape (harmonic, *grid), with the harmonics
+            ordered by l and then by m from -l to l, or by l only if
+            msum. The grid is (phi, theta) if phi has more than one
+            element, (theta) otherwise.
+        """
+        theta = np.asarray(theta, dtype=float)
+        phi = np.asarray(phi, dtype=float)
+        key = (lmax, msum, theta.tobytes(), phi.tobytes())
+        if key in self.__bases:
+            return self.__bases[key]
+        x = np.cos(theta)
+        if phi.size > 1:
+            phi = phi[..., None]
+            x = x[None, ...]
+        Plm = self.P_norm_table(lmax, x)
+        grid_shape = np.broadcast(x, phi).shape
+        if msum:
+            basis = np.zeros((lmax + 1, ) + grid_shape)
+        else:
+            basis = np.zeros(((lmax + 1) ** 2, ) + grid_shape)
+        harm_index = 0
+        for l in range(lmax + 1):
+            for m in range(-l, l + 1):
+                if m < 0:
+                    Ylm = -np.sqrt(2) * Plm[l, -m] * np.sin(-m * phi)
+                elif m == 0:
+                    Ylm = Plm[l, 0] * np.ones(phi.shape)
+                else:
+                    Ylm = np.sqrt(2) * (-1) ** m * Plm[l, m] * \
+                        np.cos(m * phi)
+                if msum:
+                    basis[l] += Ylm
+                else:
+                    basis[harm_index] = Ylm
+                    harm_index += 1
+        self.__bases[key] = basis
+        return basis
+
+    def project(self, data, lmax, theta, phi, dOmega, msum=False):
+        """
+        Projects data on the real spherical harmonics Ylm_norm up to
+        lmax, with a single tensor product over the angles.
+        Takes as input:
+            data: array with the angles first and the radius last
+            lmax: maximum degree of the harmonics
+            theta: polar angle, array
+            phi: azimutal angle, array or scalar
+            dOmega: solid angle of the cells
+            msum: sums the coefficients of the same degree over m
+        Returns:
+            coefficients Σ_Ω data Ylm_norm dΩ, with shape
+            (harmonic, radius)
+        """
+        basis = self.Ylm_norm_basis(lmax, theta, phi, msum)
+        data = np.asarray(data) * np.asarray(dOmega)[..., None]
+        angles = basis.ndim - 1
+        return np.tensordot(basis, data, axes=(list(range(1, angles + 1)),
+                                               list(range(angles))))
+
     def spin_weighted_Ylm(self, s, m, l, theta, phi):
         """
         Calculates the spin weighted spherical harmonic of order m and
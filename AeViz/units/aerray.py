@@ -65,6 +65,28 @@ class aerray(np.ndarray):
         self.limits = getattr(obj, 'limits', None)
         self.log = getattr(obj, 'log', False)
 
+    def __reduce__(self):
+        """
+        Keep the attributes when pickling (e.g. when sending the array
+        to another process).
+        """
+        reconstruct, arguments, state = super().__reduce__()
+        return reconstruct, arguments, (state, self.unit, self.name,
+                                        self.label, self.cmap, self.limits,
+                                        self.log)
+
+    def __setstate__(self, state):
+        if len(state) != 7:
+            ## Pickled without the attributes
+            super().__setstate__(state)
+            self.unit, self.name, self.label, self.cmap, self.limits, \
+                self.log = u.dimensionless_unscaled, None, None, None, None, \
+                False
+            return
+        super().__setstate__(state[0])
+        self.unit, self.name, self.label, self.cmap, self.limits, \
+            self.log = state[1:]
+
     def __getitem__(self, indices):
         """
         Redefine the item getter
@@ -4,11 +4,10 @@ import numpy as np
 from AeViz.units import u
 from AeViz.utils.files.string_utils import apply_symbol, merge_strings
 import numpy as np
-import scipy.signal
+import sys
 import warnings
 from typing import Literal
 from AeViz.utils.math_utils import IDL_derivative
-from scipy.integrate import cumulative_simpson, cumulative_trapezoid
 
 def get_selection_indices(a, b):
     """
@@ -412,7 +411,9 @@ class aeseries:
             return self.fft(**kwargs)
         elif func == np.fft.rfft:
             return self.rfft(**kwargs)
-        elif func in [scipy.signal.stft, scipy.signal.ShortTimeFFT]:
+        elif 'scipy.signal' in sys.modules and \
+            func in [sys.modules['scipy.signal'].stft,
+                     sys.modules['scipy.signal'].ShortTimeFFT]:
             return self.stft(**kwargs)
         else:
             return aeseries(func, **{
@@ -580,6 +581,7 @@ class aeseries:
         filters are avaiable: lowpass, highpass and bandpass
         returns the absolute value of the fft
         """
+        import scipy.signal
         def butter_filter(signal, fs, cutoff, btype, order=4):
             nyquist = 0.5 * fs
             normal_cutoff = np.array(cutoff) / nyquist
@@ -660,6 +662,7 @@ class aeseries:
         """
         linearly integrate along the selected axis
         """
+        from scipy.integrate import cumulative_simpson
         if axis not in self.__axis_names:
             raise AttributeError("Axis not found in the aeseries")
         xvar = getattr(self, axis)
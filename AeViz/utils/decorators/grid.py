@@ -49,10 +49,7 @@ def get_grid(func):
             for dd in data:
                 outdata.append(_get_indices(args[0], dd, kwargs['plane']))
         elif kwargs['plane'] in ['xy', 'yx', 'xz', 'zx', 'zy', 'yz']:
-            gr = grid(args[0].dim, args[0].cell.radius(args[0].ghost),
-                                       args[0].cell.theta(args[0].ghost),
-                                       args[0].cell.phi(args[0].ghost))
-            X, Y = gr.cartesian_grid_2D(kwargs['plane'], 64)
+            gr, X, Y = _projection_grid(args[0], kwargs['plane'])
             index_theta, index_phi = _get_plane_indices(args[0],
                                                         kwargs['plane'])
             for dd in data:
@@ -68,10 +65,7 @@ def get_grid(func):
                                mass=gmass)) 
         elif kwargs['plane'] in ['xz_phi_avg', 'zx_phi_avg', 'yz_phi_avg',
                                  'zy_phi_avg']:
-            gr = grid(args[0].dim, args[0].cell.radius(args[0].ghost),
-                                       args[0].cell.theta(args[0].ghost),
-                                       args[0].cell.phi(args[0].ghost))
-            X, Y = gr.cartesian_grid_2D(kwargs['plane'], 64)
+            _, X, Y = _projection_grid(args[0], kwargs['plane'])
             for dd in data:
                 outdata.append(aeseries(
                     function_average(dd, args[0].dim, 'only_phi', 
@@ -85,6 +79,29 @@ def get_grid(func):
             return outdata
     return wrapper
 
+def _projection_grid(sim, plane, theta_points=64):
+    """
+    Grid object and cartesian mesh (X, Y) of the plane, which depend
+    only on the ghost cells status. They are computed once for each
+    plane and status and kept in the projection_grids dictionary of
+    the Simulation. The meshes are read-only, each call returns new
+    aerrays sharing their data.
+    """
+    key = (plane, theta_points,
+           tuple(sim.ghost.save_ghost_cells_status().values()))
+    cache = getattr(sim, 'projection_grids', {})
+    if key not in cache:
+        gr = grid(sim.dim, sim.cell.radius(sim.ghost),
+                  sim.cell.theta(sim.ghost), sim.cell.phi(sim.ghost))
+        X, Y = gr.cartesian_grid_2D(plane, theta_points)
+        X.flags.writeable = False
+        Y.flags.writeable = False
+        cache[key] = (gr, X, Y)
+    gr, X, Y = cache[key]
+    X, Y = X.view(aerray), Y.view(aerray)
+    X.limits, Y.limits = list(X.limits), list(Y.limits)
+    return gr, X, Y
+
 def _get_plane_indices(sim, plane):
     """
     Get the indices associated to the plane. In particular, for 3D
@@ -1,27 +1,41 @@
-import h5py, os
+import os
 from AeViz.utils.math_utils import IDL_derivative
-from . import wraps, np, aerray, aeseries
+from . import wraps, np, aerray, aeseries, u
 import inspect
 from AeViz.utils.files.string_utils import merge_strings
+from AeViz.utils.files.hdf_snapshot import HDFSnapshot
 import warnings
 from AeViz.units.aerray import apply_monkey_patch, remove_monkey_patch
 from AeViz.utils.decorators.grid import _get_plane_avgs
-from scipy.ndimage import uniform_filter
-try:
-    from astropy.convolution import (convolve, Gaussian1DKernel,
-                                     Gaussian2DKernel, Box1DKernel,
-                                     Box2DKernel)
-except:
-    remove_monkey_patch()
-    from astropy.convolution import (convolve, Gaussian1DKernel,
-                                     Gaussian2DKernel, Box1DKernel,
-                                     Box2DKernel)
-    apply_monkey_patch()
+
+def astropy_convolution():
+    """
+    Imports the astropy convolution kernels only when the data are
+    smoothed, since astropy.convolution is slow to import.
+    Returns:
+        convolve, Gaussian1DKernel, Gaussian2DKernel, Box1DKernel,
+        Box2DKernel
+    """
+    try:
+        from astropy.convolution import (convolve, Gaussian1DKernel,
+                                         Gaussian2DKernel, Box1DKernel,
+                                         Box2DKernel)
+    except:
+        remove_monkey_patch()
+        from astropy.convolution import (convolve, Gaussian1DKernel,
+                                         Gaussian2DKernel, Box1DKernel,
+                                         Box2DKernel)
+        apply_monkey_patch()
+    return (convolve, Gaussian1DKernel, Gaussian2DKernel, Box1DKernel,
+            Box2DKernel)
 
 def hdf_isopen(func):
     """
     Takes as input the Simulation object and either the file name, or
-    file index or time. If the file is not open, it opens it.
+    file index or time. If the file is not open, it takes it from the
+    file pool of the simulation, which keeps the recently used files
+    open. The selections of its datasets are cached in the field cache
+    of the simulation.
     """
     @wraps(func)
     def wrapper(*args, **kwargs):
@@ -32,16 +46,78 @@ def hdf_isopen(func):
         else:
             file = args[1]
         if file != args[0]._Simulation__opened_hdf_file:
-            if args[0]._Simulation__data_h5 is not None:
-                args[0]._Simulation__data_h5.close()
             if file not in args[0].hdf_file_list:
                 raise ValueError("Selected file does not exist.")
+            if isinstance(args[0]._Simulation__data_h5, HDFSnapshot):
+                args[0]._Simulation__data_h5.close()
             args[0]._Simulation__opened_hdf_file = file
-            args[0]._Simulation__data_h5 = h5py.File(
-                os.path.join(args[0]._Simulation__hdf_path, file), 'r')
+            args[0]._Simulation__data_h5 = args[0].hdf_pool.open(
+                os.path.join(args[0]._Simulation__hdf_path, file))
         return func(*args, **kwargs)
     return wrapper
 
+def region_of_interest(func):
+    """
+    Restricts the quantity to a region of the grid, selected with the
+    optional arguments r_range, theta_range and phi_range. Each of them
+    is either a (min, max) tuple of coordinates (None leaves that side
+    open, plain numbers are in cm and radians) or a slice of the cell
+    indices. The region is applied on top of the ghost cells, so only
+    its cells are read from the timestep file and the grids used by the
+    other decorators match the returned data. As for the ghost cells,
+    the axes of length one are squeezed out.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        ranges = {axis: kwargs.pop(axis + '_range', None) for axis in
+                  ['r', 'theta', 'phi']}
+        if all(window is None for window in ranges.values()):
+            return func(*args, **kwargs)
+        gstatus = args[0].ghost.save_ghost_cells_status()
+        args[0].ghost.restrict(**_region_cells(args[0], ranges))
+        try:
+            return func(*args, **kwargs)
+        finally:
+            args[0].ghost.restore_default()
+            args[0].ghost.update_ghost_cells(**gstatus)
+    return wrapper
+
+def _region_cells(simulation, ranges):
+    """
+    Number of cells to remove at the two ends of each axis to restrict
+    the current grid to the region of interest.
+    """
+    axes = {'r': ('r_l', 'r_r', simulation.cell.radius, u.cm),
+            'theta': ('t_l', 't_r', simulation.cell.theta, u.radian),
+            'phi': ('p_l', 'p_r', simulation.cell.phi, u.radian)}
+    cells = {}
+    for dim, (axis, window) in enumerate(ranges.items(), start=1):
+        if window is None:
+            continue
+        if dim > simulation.dim:
+            raise ValueError(f"{axis}_range not available in a " \
+                             f"{simulation.dim}D simulation.")
+        left, right, coordinate, unit = axes[axis]
+        coordinate = coordinate(simulation.ghost)
+        size = len(coordinate)
+        if isinstance(window, slice):
+            start, stop, step = window.indices(size)
+            if step != 1:
+                raise ValueError(f"{axis}_range must be a contiguous slice.")
+        else:
+            values = coordinate.to(unit).value
+            vmin, vmax = [edge.to(unit).value if hasattr(edge, 'unit')
+                          else edge for edge in window]
+            start = 0 if vmin is None else \
+                int(np.searchsorted(values, vmin, 'left'))
+            stop = size if vmax is None else \
+                int(np.searchsorted(values, vmax, 'right'))
+        if stop <= start:
+            raise ValueError(f"No cells in the selected {axis}_range.")
+        cells[left] = start
+        cells[right] = size - stop
+    return cells
+
 def derive(func):
     """
     Decorator to calculate the derivative of a function.
@@ -107,6 +183,8 @@ def smooth(func):
         data = func(*args, **kwargs)
         if 'smooth' not in kwargs:
             return data
+        convolve, Gaussian1DKernel, Gaussian2DKernel, Box1DKernel, \
+            Box2DKernel = astropy_convolution()
         if 'smooth_window' in kwargs:
             window_points = kwargs['smooth_window']
             if window_points % 2 == 0:
@@ -195,6 +273,7 @@ def finite_differences(func):
                 ## Get radial shell averages
                 rave = _get_plane_avgs(args[0], dd, 'radius').data * np.ones(dd.shape)
             else:
+                from scipy.ndimage import uniform_filter
                 dV = args[0].cell.dVolume_integration(args[0].ghost)
                 rave = uniform_filter((dd * dV).value, size=3, mode='nearest') / \
                     uniform_filter((dV).value, size=3, mode='nearest')
@@ -223,6 +302,8 @@ def EMD_smooth(func):
         data = func(*args, **kwargs)
         if 'smooth' not in kwargs:
             return data
+        convolve, Gaussian1DKernel, Gaussian2DKernel, Box1DKernel, \
+            Box2DKernel = astropy_convolution()
         if 'smooth_window' in kwargs:
             window_points = kwargs['smooth_window']
             if window_points % 2 == 0:
@@ -343,6 +424,8 @@ def mask_points(func):
         
         if 'not' not in kwargs['mask']:
             mask = ~mask
+        if not data.flags.writeable:
+            data = data.copy()
         data[mask] = np.nan
         return data
     return wrapper
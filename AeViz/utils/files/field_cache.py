@@ -0,0 +1,286 @@
+import h5py
+import threading
+import numpy as np
+from collections import OrderedDict
+
+class FieldCache:
+    """
+    Least recently used cache of the arrays read from the timestep files
+    of the outp-hdf folder. Each array is stored under the key
+    (file, dataset, selection), so every field is read from disk only
+    once as long as it stays in the cache. When the stored arrays exceed
+    max_bytes, the least recently used ones are discarded.
+    hits and misses count the selections served from the cache and the
+    ones read from disk.
+    Datasets listed in blocks (e.g. hydro/data and thd/data) are read as
+    a whole block the first time one of their variables is selected,
+    and the variables are then returned as read-only views of the block.
+    The cache can be shared by several threads.
+    """
+    def __init__(self, max_bytes=2**30):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.blocks = {}
+        self.nvar_first = False
+        self.__arrays = OrderedDict()
+        self.__lock = threading.RLock()
+
+    def set_blocks(self, blocks=None, nvar_first=False):
+        """
+        Selects the datasets read as a whole block.
+        Input:
+            blocks: dictionary with the dataset names as keys and the
+                    sorted list of variable indices (last axis) to load
+                    as values, None to load all of them
+            nvar_first: stores the blocks with the variables along the
+                        first axis, so that each variable is contiguous
+                        in memory
+        """
+        with self.__lock:
+            self.blocks = {} if blocks is None else blocks
+            self.nvar_first = nvar_first
+            self.clear()
+
+    def get(self, key, copy=True):
+        """
+        Returns a copy of the cached array (or the array itself if copy
+        is False), or None if missing.
+        """
+        with self.__lock:
+            if key not in self.__arrays:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.__arrays.move_to_end(key)
+            data = self.__arrays[key]
+        if data.ndim == 0:
+            return data[()]
+        if copy:
+            return np.array(data)
+        return data
+
+    def put(self, key, data, copy=True):
+        """
+        Stores a copy of the array (or the array itself if copy is
+        False), evicting the least recently used ones if needed.
+        """
+        data = np.array(data) if copy else np.asarray(data)
+        with self.__lock:
+            if data.nbytes > self.max_bytes:
+                return
+            if key in self.__arrays:
+                self.nbytes -= self.__arrays.pop(key).nbytes
+            data.flags.writeable = False
+            self.__arrays[key] = data
+            self.nbytes += data.nbytes
+            while self.nbytes > self.max_bytes:
+                self.nbytes -= self.__arrays.popitem(last=False)[1].nbytes
+
+    def resize(self, max_bytes):
+        """
+        Changes the maximum size of the cache.
+        """
+        with self.__lock:
+            self.max_bytes = max_bytes
+            while self.nbytes > self.max_bytes:
+                self.nbytes -= self.__arrays.popitem(last=False)[1].nbytes
+
+    def clear(self):
+        with self.__lock:
+            self.__arrays = OrderedDict()
+            self.nbytes = 0
+
+    def stats(self):
+        """
+        Hits, misses, number of arrays and bytes stored.
+        """
+        with self.__lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'arrays': len(self.__arrays), 'bytes': self.nbytes}
+
+    def __len__(self):
+        return len(self.__arrays)
+
+class CachedHDFFile:
+    """
+    Timestep file whose dataset selections go through a FieldCache.
+    It exposes the same interface used by the Simulation methods on an
+    h5py.File: item lookup with 'group/dataset' paths, membership tests
+    and close().
+    """
+    def __init__(self, path, cache, rdcc_nbytes=None):
+        self.filename = path
+        self.cache = cache
+        self.__file = h5py.File(path, 'r', rdcc_nbytes=rdcc_nbytes)
+
+    def __getitem__(self, key):
+        data = self.__file[key]
+        if isinstance(data, h5py.Group):
+            return data
+        return CachedField(self, key.strip('/'), data)
+
+    def __contains__(self, key):
+        return key in self.__file
+
+    def keys(self):
+        return self.__file.keys()
+
+    def close(self):
+        self.__file.close()
+
+class HDFPool:
+    """
+    Least recently used pool of the timestep files opened by a
+    Simulation. Up to max_files files are kept open, so that switching
+    back and forth between timesteps neither reopens them nor loses
+    their HDF5 chunk cache, whose size per file is rdcc_nbytes (None
+    for the h5py default).
+    The pool can be shared by several threads. The files dropped from
+    the pool are not closed explicitly, they are closed once no reader
+    uses them anymore, while close() closes all the files in the pool.
+    """
+    def __init__(self, cache, max_files=4, rdcc_nbytes=None):
+        self.cache = cache
+        self.max_files = max(1, max_files)
+        self.rdcc_nbytes = rdcc_nbytes
+        self.__files = OrderedDict()
+        self.__lock = threading.RLock()
+
+    def open(self, path):
+        """
+        Returns the CachedHDFFile of the path, opening it if it is not
+        in the pool.
+        """
+        with self.__lock:
+            if path in self.__files:
+                self.__files.move_to_end(path)
+                return self.__files[path]
+            data_h5 = CachedHDFFile(path, self.cache, self.rdcc_nbytes)
+            self.__files[path] = data_h5
+            while len(self.__files) > self.max_files:
+                self.__files.popitem(last=False)
+            return data_h5
+
+    def resize(self, max_files=None, rdcc_nbytes=None):
+        """
+        Changes the number of files kept open and the chunk cache size.
+        The latter applies to the files opened afterwards, so the pool
+        is closed when it changes.
+        """
+        with self.__lock:
+            if max_files is not None:
+                self.max_files = max(1, max_files)
+                while len(self.__files) > self.max_files:
+                    self.__files.popitem(last=False)
+            if rdcc_nbytes is not None and rdcc_nbytes != self.rdcc_nbytes:
+                self.rdcc_nbytes = rdcc_nbytes
+                self.close()
+
+    def close(self):
+        """
+        Closes all the files in the pool.
+        """
+        with self.__lock:
+            while self.__files:
+                self.__files.popitem(last=False)[1].close()
+
+    def __contains__(self, path):
+        return path in self.__files
+
+    def __len__(self):
+        return len(self.__files)
+
+class CachedField:
+    """
+    Dataset of a CachedHDFFile. Selections made of integers, slices and
+    ellipses are looked up in the cache, the others are read from disk.
+    As for an h5py.Dataset, every selection returns a new array.
+    """
+    def __init__(self, hdf_file, key, dataset):
+        self.__file = hdf_file
+        self.__key = key
+        self.__dataset = dataset
+
+    def __getitem__(self, selection):
+        if self.__key in self.__file.cache.blocks:
+            data = self.__block_view(selection)
+            if data is not None:
+                return data
+        selection_key = _selection_key(selection)
+        if selection_key is None:
+            return self.__dataset[selection]
+        key = (self.__file.filename, self.__key, selection_key)
+        data = self.__file.cache.get(key)
+        if data is None:
+            data = self.__dataset[selection]
+            self.__file.cache.put(key, data)
+        return data
+
+    def __block_view(self, selection):
+        """
+        View of a single variable ([..., index] selection, optionally
+        preceded by the slices of the spatial axes) of the block, None if
+        the selection or the variable are not in the block.
+        """
+        if not (isinstance(selection, tuple) and len(selection) >= 2 and \
+            selection[-2] is Ellipsis and \
+                isinstance(selection[-1], (int, np.integer)) and \
+                    all(isinstance(item, slice) for item in selection[:-2])):
+            return None
+        spatial = selection[:-2]
+        cache = self.__file.cache
+        variables = cache.blocks[self.__key]
+        index = int(selection[-1]) % self.__dataset.shape[-1]
+        if variables is not None:
+            if index not in variables:
+                return None
+            index = variables.index(index)
+        key = (self.__file.filename, self.__key, 'block')
+        block = cache.get(key, copy=False)
+        if block is None:
+            if variables is None:
+                block = self.__dataset[...]
+            else:
+                block = self.__dataset[..., variables]
+            if cache.nvar_first:
+                block = np.ascontiguousarray(np.moveaxis(block, -1, 0))
+            block.flags.writeable = False
+            cache.put(key, block, copy=False)
+        if cache.nvar_first:
+            return block[index][spatial]
+        return block[spatial + (Ellipsis, index)]
+
+    @property
+    def shape(self):
+        return self.__dataset.shape
+
+    @property
+    def dtype(self):
+        return self.__dataset.dtype
+
+    @property
+    def ndim(self):
+        return self.__dataset.ndim
+
+    def __len__(self):
+        return len(self.__dataset)
+
+def _selection_key(selection):
+    """
+    Hashable version of a selection, None if it cannot be cached.
+    """
+    if not isinstance(selection, tuple):
+        selection = (selection,)
+    key = []
+    for item in selection:
+        if item is Ellipsis:
+            key.append('...')
+        elif isinstance(item, slice):
+            key.append(('slice', item.start, item.stop, item.step))
+        elif isinstance(item, (int, np.integer)):
+            key.append(int(item))
+        else:
+            return None
+    return tuple(key)
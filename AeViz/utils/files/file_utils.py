@@ -1,9 +1,7 @@
-import os, h5py
+import os, h5py, tempfile
 import numpy as np
-import pandas as pd
 import inspect
 from AeViz.units import aeseries, aerray, u
-import requests
 
 def list_module_functions(module):
     """
@@ -18,9 +16,11 @@ def list_module_functions(module):
         if obj.__module__ == module.__name__ 
     ]
 
-def load_file(path_folder, file_name):
+def load_file(path_folder, file_name, storage_path=None):
     """
-    Load data files, three attempts are made
+    Load data files. If storage_path is given, the parsed data are kept
+    in a binary sidecar there (see load_cached_file), otherwise the file
+    is parsed. To parse it, three attempts are made
     - Attempt 1: use of loadtxt method of NumPy
     - Attempt 2: use of loadtxt method of NumPy, reading only the first 
                  n columns, with n specified on the 2nd row of the .txt
@@ -39,6 +39,14 @@ def load_file(path_folder, file_name):
     """
     path = os.path.join(path_folder, file_name)
     assert os.path.exists(path), "Selected file does not exists"
+    if storage_path is not None:
+        return load_cached_file(path, storage_path)
+    return _parse_file(path)
+
+def _parse_file(path):
+    """
+    Parses a data file, with the attempts listed in load_file.
+    """
     try:
         data = np.loadtxt(path)
     except:
@@ -50,6 +58,7 @@ def load_file(path_folder, file_name):
             data = np.loadtxt(path, usecols=tuple(range(col_number)))
         except:
             try:
+                import pandas as pd
                 head = list(np.genfromtxt(path.replace('.dat', '.txt'),
                                           dtype=str, delimiter=',',
                                           skip_footer=1))
@@ -85,6 +94,109 @@ def load_file(path_folder, file_name):
                         
     return data
 
+def load_cached_file(path, storage_path):
+    """
+    Loads a log file (neu.dat, rho.dat, erg.dat, grw.dat...) through a
+    binary sidecar stored in storage_path as <file name>.h5.
+    The sidecar keeps the parsed data, together with the size and the
+    modification time of the file and the byte offset up to which it
+    has been parsed. If the file did not change, the data are read
+    from the sidecar. If lines have been appended (running
+    simulations), only the new lines are parsed and appended to the
+    sidecar. Otherwise the whole file is parsed again.
+    Returns a new array at each call.
+    """
+    sidecar = os.path.join(storage_path, os.path.basename(path) + '.h5')
+    stat = os.stat(path)
+    if os.path.exists(sidecar):
+        try:
+            data = _update_sidecar(path, sidecar, stat)
+        except (OSError, KeyError):
+            data = None
+        if data is not None:
+            return data
+    data = _parse_file(path)
+    with open(path, 'rb') as f:
+        f.seek(max(stat.st_size - 1, 0))
+        complete = f.read(1) == b'\n'
+    ## A partially written last line would be parsed again
+    if complete and data.ndim == 2:
+        _write_sidecar(path, sidecar, stat, data)
+    return data
+
+def _update_sidecar(path, sidecar, stat, tail_bytes=64):
+    """
+    Returns the data stored in the sidecar, after appending the lines
+    added to the file since it was written. None if the sidecar is out
+    of date and the file has to be parsed again.
+    The sidecar is opened for writing only if lines have to be
+    appended, so that several processes can read it at the same time.
+    """
+    with h5py.File(sidecar, 'r') as f:
+        if f.attrs['size'] == stat.st_size and \
+            f.attrs['mtime'] == stat.st_mtime_ns:
+            return f['data'][:int(f.attrs['rows'])]
+    with h5py.File(sidecar, 'r+') as f:
+        rows, offset = int(f.attrs['rows']), int(f.attrs['offset'])
+        if stat.st_size < offset:
+            return None
+        with open(path, 'rb') as log:
+            log.seek(max(offset - tail_bytes, 0))
+            if log.read(min(offset, tail_bytes)) != f['tail'][...].tobytes():
+                return None
+            new_lines = log.read(stat.st_size - offset)
+        new_lines = new_lines[:new_lines.rfind(b'\n') + 1]
+        if new_lines:
+            try:
+                new_data = np.loadtxt(new_lines.decode().splitlines(),
+                                      ndmin=2)
+            except ValueError:
+                return None
+            if new_data.shape[1] != f['data'].shape[1]:
+                return None
+            f['data'].resize(rows + new_data.shape[0], axis=0)
+            f['data'][rows:] = new_data
+            rows += new_data.shape[0]
+            offset += len(new_lines)
+            f.attrs['rows'] = rows
+            f.attrs['offset'] = offset
+            del f['tail']
+            f.create_dataset('tail', data=np.frombuffer(
+                new_lines[-tail_bytes:], dtype=np.uint8))
+        f.attrs['size'] = stat.st_size
+        f.attrs['mtime'] = stat.st_mtime_ns
+        return f['data'][:rows]
+
+def _write_sidecar(path, sidecar, stat, data, tail_bytes=64):
+    """
+    Writes the sidecar of a completely parsed file. The file is written
+    under a unique temporary name and then moved in place, so that
+    processes writing the same sidecar do not clash. If it cannot be
+    written, the data are just not cached.
+    """
+    tmp_path = None
+    try:
+        with open(path, 'rb') as log:
+            log.seek(max(stat.st_size - tail_bytes, 0))
+            tail = log.read()
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp',
+                                        prefix=os.path.basename(sidecar),
+                                        dir=os.path.dirname(sidecar))
+        os.close(fd)
+        with h5py.File(tmp_path, 'w') as f:
+            f.create_dataset('data', data=data,
+                             maxshape=(None, data.shape[1]), chunks=True)
+            f.create_dataset('tail', data=np.frombuffer(tail,
+                                                        dtype=np.uint8))
+            f.attrs['rows'] = data.shape[0]
+            f.attrs['offset'] = stat.st_size
+            f.attrs['size'] = stat.st_size
+            f.attrs['mtime'] = stat.st_mtime_ns
+        os.replace(tmp_path, sidecar)
+    except OSError:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
 def find_column_changing_line(path_folder, file_name, column=None):
     """
     Loads a data file and returns the number of the line at which
@@ -117,43 +229,85 @@ def find_column_changing_line(path_folder, file_name, column=None):
         line_number = None
     return line_number
 
-def save_hdf(save_path, dataset_keywords, dataset_values):
+def save_hdf(save_path, dataset_keywords, dataset_values, saved_steps=0):
     """
     Save data in hdf format
     dataset_keywords: list of strings, keywords for the datasets
     dataset_values: list of whatever you want, these are the values for
                     the datasets
+    saved_steps: number of timesteps already in the file. If larger than
+                 zero, only the following ones are appended along the
+                 last axis of the datasets, the others are rewritten.
+    Arrays are stored in chunked datasets resizable along the last
+    (time) axis.
     """
     assert len(dataset_keywords) == len(dataset_values), \
         "Number of keywords and values do not match"
-    file_out = h5py.File(save_path, 'w')
+    if saved_steps > 0 and os.path.exists(save_path):
+        file_out = h5py.File(save_path, 'a')
+    else:
+        file_out = h5py.File(save_path, 'w')
+        saved_steps = 0
     for (key, value) in zip(dataset_keywords, dataset_values):
-        if type(value) == dict:
-            group = file_out.create_group(key)
-            for (k, v) in value.items():
-                if type(v) == dict:
-                    subgroup = group.create_group(k)
-                    for (kk, vv) in v.items():
-                        if isinstance(vv, aerray):
-                            subgroup.create_dataset(
-                                kk if isinstance(kk, str) else str(kk),
-                                data = vv.value)
-                        else:
-                            subgroup.create_dataset(
-                                kk if isinstance(kk, str) else str(kk),
-                                data = vv)
-                else:
-                    if isinstance(v, aerray):
-                        group.create_dataset(
-                            k if isinstance(k, str) else str(k),
-                            data = v.value)
-                    else:
-                        group.create_dataset(
-                            k if isinstance(k, str) else str(k),
-                            data = v)
-        else:
-            file_out.create_dataset(key, data = value)
+        _write_hdf_value(file_out, key, value, saved_steps)
     file_out.close()
+
+def _write_hdf_value(group, key, value, saved_steps):
+    """
+    Writes a dictionary in a group or a value in a dataset, appending
+    the new timesteps when possible.
+    """
+    key = key if isinstance(key, str) else str(key)
+    if type(value) == dict:
+        if key in group and not isinstance(group[key], h5py.Group):
+            del group[key]
+        subgroup = group.require_group(key)
+        for (k, v) in value.items():
+            _write_hdf_value(subgroup, k, v, saved_steps)
+        return
+    if isinstance(value, aerray):
+        value = value.value
+    if key in group:
+        dataset = group[key]
+        if _append_hdf_steps(dataset, value, saved_steps):
+            return
+        del group[key]
+    if np.ndim(value) == 0:
+        group.create_dataset(key, data=value)
+    else:
+        shape = np.shape(value)
+        group.create_dataset(key, data=value, maxshape=shape[:-1] + (None,),
+                             chunks=_hdf_chunks(shape))
+
+def _hdf_chunks(shape, chunk_bytes=2**20, max_steps=1024):
+    """
+    Chunks of up to max_steps timesteps and about chunk_bytes bytes, so
+    that appending a few timesteps does not create a new chunk each
+    time.
+    """
+    step_size = max(8, 8 * int(np.prod(shape[:-1])))
+    return shape[:-1] + (max(1, min(max_steps, chunk_bytes // step_size)),)
+
+def _append_hdf_steps(dataset, value, saved_steps):
+    """
+    Appends the timesteps after saved_steps to a resizable dataset.
+    Returns False if the dataset has to be rewritten instead.
+    """
+    if not isinstance(dataset, h5py.Dataset) or dataset.ndim == 0 or \
+        dataset.maxshape[-1] is not None or dataset.shape[-1] != saved_steps:
+        return False
+    if h5py.check_string_dtype(dataset.dtype) is not None:
+        value = np.array(value, dtype=object)
+    else:
+        value = np.asarray(value)
+        if not np.can_cast(value.dtype, dataset.dtype):
+            return False
+    if value.ndim != dataset.ndim or value.shape[:-1] != dataset.shape[:-1] \
+        or value.shape[-1] < saved_steps:
+        return False
+    dataset.resize(value.shape[-1], axis=dataset.ndim - 1)
+    dataset[..., saved_steps:] = value[..., saved_steps:]
+    return True
     
 def create_series(time, *args):
     """
@@ -208,6 +362,7 @@ def load_asd(path, detector):
     if not os.path.exists(file_path):
         if not os.path.exists(os.path.join(path, 'psds')):
             os.mkdir(os.path.join(path, 'psds'))
+        import requests
         resp = requests.get(url[detector])
         with open(file_path, 'wb') as f:
             f.write(resp.content)
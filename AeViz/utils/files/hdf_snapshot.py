@@ -0,0 +1,200 @@
+import h5py
+import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from AeViz.utils.files.field_cache import _selection_key
+
+## Spatial selections smaller than this fraction of the grid are read
+## from disk as hyperslabs instead of loading the whole dataset.
+SLAB_FRACTION = 0.5
+
+class HDFSnapshot:
+    """
+    In-memory snapshot of a single timestep file of the outp-hdf folder.
+    Every dataset is read from disk the first time it is requested and
+    then kept in memory until the snapshot is closed. In this way all
+    the quantities derived from the same block (e.g. the hydro or the
+    thd variables) share a single read of the file. Selections of a
+    small region of the grid made before the whole dataset is needed
+    are read as hyperslabs.
+    It exposes the same interface used by the Simulation methods on an
+    h5py.File: item lookup with 'group/dataset' paths, membership tests
+    and close().
+    """
+    def __init__(self, path):
+        self.filename = path
+        self.__file = h5py.File(path, 'r')
+        self.__datasets = {}
+
+    def __getitem__(self, key):
+        key = key.strip('/')
+        if key not in self.__datasets:
+            data = self.__file[key]
+            if isinstance(data, h5py.Group):
+                return data
+            self.__datasets[key] = CachedDataset(data)
+        return self.__datasets[key]
+
+    def __contains__(self, key):
+        return key.strip('/') in self.__file
+
+    def keys(self):
+        return self.__file.keys()
+
+    def requested(self):
+        """
+        Datasets read so far, with None for the ones loaded as a whole
+        and the list of the selections for the ones read as hyperslabs.
+        """
+        return {key: dataset.requested() for (key, dataset) in
+                self.__datasets.items()}
+
+    def preload(self, requested):
+        """
+        Reads the datasets and hyperslabs listed by the requested method
+        of another snapshot.
+        """
+        for (key, selections) in requested.items():
+            if key not in self:
+                continue
+            if selections is None:
+                self[key].load()
+                continue
+            for selection in selections:
+                self[key].load(selection)
+
+    @property
+    def nbytes(self):
+        return sum(dataset.nbytes for dataset in self.__datasets.values())
+
+    def close(self):
+        """
+        Releases the cached datasets and closes the underlying file.
+        """
+        self.__datasets = {}
+        if self.__file:
+            self.__file.close()
+
+class CachedDataset:
+    """
+    Dataset held in memory. The whole dataset is loaded at the first
+    selection, unless it covers less than SLAB_FRACTION of the spatial
+    cells (the first three axes), in which case only the selected
+    hyperslab is read and kept. As for an h5py.Dataset, every selection
+    returns a new array, so the methods modifying their data in place
+    do not alter the cached values.
+    """
+    def __init__(self, dataset):
+        self.__dataset = dataset
+        self.__data = None
+        self.__slabs = {}
+
+    def __getitem__(self, key):
+        if self.__data is None:
+            if _selection_key(key) is not None and \
+                self.__spatial_fraction(key) < SLAB_FRACTION:
+                return np.array(self.load(key))
+            self.load()
+        return np.array(self.__data[key])
+
+    def load(self, key=None):
+        """
+        Reads from disk the whole dataset, or only the hyperslab of the
+        selection key, unless it is already in memory, and returns it.
+        """
+        if key is None:
+            if self.__data is None:
+                self.__data = self.__dataset[...]
+                self.__data.flags.writeable = False
+                self.__slabs = {}
+            return self.__data
+        slab_key = _selection_key(key)
+        if slab_key not in self.__slabs:
+            slab = np.asarray(self.__dataset[key])
+            slab.flags.writeable = False
+            self.__slabs[slab_key] = (key, slab)
+        return self.__slabs[slab_key][1]
+
+    def requested(self):
+        """
+        None if the whole dataset is loaded, otherwise the list of the
+        selections read as hyperslabs.
+        """
+        if self.__data is not None:
+            return None
+        return [key for (key, _) in self.__slabs.values()]
+
+    @property
+    def nbytes(self):
+        if self.__data is not None:
+            return self.__data.nbytes
+        return sum(slab.nbytes for (_, slab) in self.__slabs.values())
+
+    def __spatial_fraction(self, key):
+        """
+        Fraction of the spatial cells covered by a selection starting
+        with the slices of the phi, theta and radius axes.
+        """
+        shape = self.__dataset.shape
+        if not isinstance(key, tuple) or len(shape) < 3 or len(key) < 3 \
+            or not all(isinstance(item, slice) for item in key[:3]):
+            return 1
+        cells = np.prod([len(range(*item.indices(size))) for (item, size)
+                         in zip(key[:3], shape[:3])])
+        return cells / np.prod(shape[:3])
+
+    @property
+    def shape(self):
+        return self.__dataset.shape
+
+    @property
+    def dtype(self):
+        return self.__dataset.dtype
+
+    @property
+    def ndim(self):
+        return self.__dataset.ndim
+
+    def __len__(self):
+        return len(self.__dataset)
+
+def prefetch_snapshots(paths, depth=2, max_bytes=2**30):
+    """
+    Iterator over the snapshots of the timestep files in paths. While a
+    snapshot is processed, a background thread opens the next depth
+    files and reads the same datasets and hyperslabs requested on the
+    previous snapshot, so the disk reads overlap with the computation.
+    The prefetched snapshots in memory are limited to max_bytes, and
+    with depth 0 the files are just opened in order.
+    The snapshots are not closed by the iterator, except the prefetched
+    ones left when it is closed.
+    """
+    queue = deque()
+    submitted = 1
+    requested, nbytes = {}, 0
+    try:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            for (index, path) in enumerate(paths):
+                if queue:
+                    snapshot = queue.popleft().result()
+                else:
+                    snapshot = HDFSnapshot(path)
+                    submitted = index + 1
+                yield snapshot
+                requested, nbytes = snapshot.requested(), snapshot.nbytes
+                ahead = depth if nbytes == 0 else \
+                    min(depth, max_bytes // nbytes)
+                while submitted < len(paths) and submitted <= index + ahead:
+                    queue.append(executor.submit(_prefetch_snapshot,
+                                                 paths[submitted], requested))
+                    submitted += 1
+    finally:
+        while queue:
+            future = queue.popleft()
+            if not future.cancel() and future.exception() is None:
+                future.result().close()
+
+def _prefetch_snapshot(path, requested):
+    snapshot = HDFSnapshot(path)
+    snapshot.preload(requested)
+    return snapshot
@@ -0,0 +1,148 @@
+import os
+import h5py
+import tempfile
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+## Files scanned by each process of the parallel header scan
+SCAN_CHUNK = 32
+
+class TimeIndex:
+    """
+    Table of the simulation time of each timestep file of the outp-hdf
+    folder, stored in time_index.h5 in the storage folder together
+    with the size and modification time of the files. Only the files
+    that are new or changed since the table was last saved are opened,
+    with their headers read in parallel by a pool of processes.
+    The times are the ones stored in the files, i.e. not corrected for
+    the time of bounce.
+    """
+    save_name = 'time_index.h5'
+
+    def __init__(self, hdf_path, storage_path, n_workers=None):
+        self.hdf_path = hdf_path
+        self.storage_path = storage_path
+        self.n_workers = n_workers if n_workers is not None else \
+            min(8, os.cpu_count() or 1)
+        self.__table = None
+        self.__files = []
+        self.__times = np.zeros(0)
+
+    def refresh(self, file_list):
+        """
+        Brings the table up to date with the files in file_list and
+        returns their times, in the same order.
+        """
+        if self.__table is None:
+            self.__table = self.__load()
+        stats = {file: os.stat(os.path.join(self.hdf_path, file)) for file
+                 in file_list}
+        stats = {file: (stat.st_size, stat.st_mtime_ns) for (file, stat) in
+                 stats.items()}
+        to_scan = [file for file in file_list if file not in self.__table or
+                   self.__table[file][1:] != stats[file]]
+        if to_scan:
+            for (file, time) in zip(to_scan, self.__scan(to_scan)):
+                self.__table[file] = (time, ) + stats[file]
+            self.__save()
+        self.__files = list(file_list)
+        self.__times = np.array([self.__table[file][0] for file in file_list])
+        return self.__times
+
+    def times(self, file_list):
+        """
+        Times of the files in file_list.
+        """
+        if self.__table is None or file_list != self.__files:
+            return self.refresh(file_list)
+        return self.__times
+
+    def lookup(self, file_list, time, mode='ceil', offset=0):
+        """
+        Indices in file_list of the files at the requested times, which
+        can be a single value or an array. The offset (e.g. the time of
+        bounce) is subtracted from the times of the files beforehand.
+        Modes:
+            ceil: first file at or after the time
+            floor: last file at or before the time
+            nearest: file closest in time
+        Times outside the simulation return the first or the last file.
+        """
+        times = self.times(file_list) - offset
+        time = np.asarray(time, dtype=float)
+        if len(times) == 1:
+            return np.zeros(time.shape, dtype=int)
+        if mode == 'ceil':
+            index = np.searchsorted(times, time, 'left')
+        elif mode == 'floor':
+            index = np.searchsorted(times, time, 'right') - 1
+        elif mode == 'nearest':
+            index = np.clip(np.searchsorted(times, time, 'left'), 1,
+                            len(times) - 1)
+            index = index - ((time - times[index - 1]) <=
+                             (times[index] - time))
+        else:
+            raise ValueError(f"{mode} not in ['ceil', 'floor', 'nearest']")
+        return np.clip(index, 0, len(times) - 1)
+
+    def __scan(self, files):
+        paths = [os.path.join(self.hdf_path, file) for file in files]
+        if self.n_workers < 2 or len(paths) <= SCAN_CHUNK:
+            return _read_times(paths)
+        chunks = [paths[i:i + SCAN_CHUNK] for i in range(0, len(paths),
+                                                          SCAN_CHUNK)]
+        with ProcessPoolExecutor(max_workers=min(self.n_workers,
+                                                 len(chunks))) as executor:
+            return [time for times in executor.map(_read_times, chunks)
+                    for time in times]
+
+    def __load(self):
+        path = os.path.join(self.storage_path, self.save_name)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with h5py.File(path, 'r') as data:
+                files = [file.decode('utf-8') for file in data['files'][...]]
+                return {file: (time, int(size), int(mtime)) for
+                        (file, time, size, mtime) in
+                        zip(files, data['times'][...], data['sizes'][...],
+                            data['mtimes'][...])}
+        except (OSError, KeyError):
+            return {}
+
+    def __save(self):
+        """
+        Writes the table under a unique temporary name and moves it in
+        place, so that processes saving it at the same time do not
+        clash. If it cannot be written, the table is kept in memory
+        only.
+        """
+        files = sorted(self.__table)
+        path = os.path.join(self.storage_path, self.save_name)
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(suffix='.tmp',
+                                            prefix=self.save_name,
+                                            dir=self.storage_path)
+            os.close(fd)
+            with h5py.File(tmp_path, 'w') as data:
+                data.create_dataset('files', data=np.array(files, dtype='S'))
+                data.create_dataset('times', data=np.array(
+                    [self.__table[file][0] for file in files], dtype=float))
+                data.create_dataset('sizes', data=np.array(
+                    [self.__table[file][1] for file in files],
+                    dtype=np.int64))
+                data.create_dataset('mtimes', data=np.array(
+                    [self.__table[file][2] for file in files],
+                    dtype=np.int64))
+            os.replace(tmp_path, path)
+        except OSError:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+def _read_times(paths):
+    times = []
+    for path in paths:
+        with h5py.File(path, 'r') as data:
+            times.append(float(data['Parameters/t'][0]))
+    return times
@@ -239,6 +239,12 @@ In this particular case we are interested in calculating the streamlines
 of the magnetic field.
 """
 def strfunction2D(b1, b2, ax, ay, az, lx, ly, lz, plane):
+    """
+    Stream function of the field (b1, b2) on the (theta, radius) cells
+    of the last two axes. It is integrated along the radius on the first
+    theta row and then along theta on all the radial columns at once.
+    Leading axes, if any, are independent planes.
+    """
     if isinstance(b1, aerray):
         b1 = b1.value
     if isinstance(b2, aerray):
@@ -263,65 +269,83 @@ def strfunction2D(b1, b2, ax, ay, az, lx, ly, lz, plane):
     elif plane == 'xz':
         dF1 =   b2 * az
         dF2 = - b1 * ax
-        dl1 = ly
-        dl2 = ly
+        dl1 = np.broadcast_to(ly, b1.shape)
+        dl2 = np.broadcast_to(ly, b1.shape)
     elif plane == 'xy':
         dF1 =   b2 * ay
         dF2 = - b1 * ax
-        dl1 = lz
-        dl2 = lz
+        dl1 = np.broadcast_to(lz, b1.shape)
+        dl2 = np.broadcast_to(lz, b1.shape)
     
     sb = b1.shape
-    n1 = sb[0] + 1 #theta
-    n2 = sb[1] + 1 #radius
+    n1 = sb[-2] + 1 #theta
+    n2 = sb[-1] + 1 #radius
     
     #stream fct
-    F = np.zeros((n1, n2))
+    F = np.zeros(sb[:-2] + (n1, n2))
     dl1inv = 1. / dl1
     dl1inv = np.nan_to_num(dl1inv, nan = 0)
     dl2inv = 1. / dl2
     dl2inv = np.nan_to_num(dl2inv, nan = 0)
 
-    #integrate the streamfunction
-    for j in range(1, n1):
-        jj = min(j, n1 - 2)
-        F[j, 0] = (F[j, 0] * dl1[j - 1, 0] + dF2[j - 1, 0]) * dl2inv[jj, 0]
-    for i in range(1, n2):
-        ii = min(i, n2-2)
-        F[0, i] = (F[0, i - 1] * dl2[0, i - 1] + dF1[0, i - 1]) * dl2inv[0, ii]
-        for j in range(1, n1):
-            jj = min(j, n1-2)
-            F[j, i] = (F[j - 1, i] * dl1[j - 1, ii] + dF2[j - 1,ii]) \
-                * dl1inv[jj, ii]
-
-    F0 = F[0 : n1 - 1, 0 : n2 - 1] + F[1 : n1, 0 : n2 - 1] + \
-        F [0 : n1 - 1, 1 : n2] + F[1 : n1, 1 : n2]
+    #integrate the streamfunction, the last face uses the last cell
+    jj = np.minimum(np.arange(1, n1), n1 - 2)
+    ii = np.minimum(np.arange(1, n2), n2 - 2)
+    F[..., 1:, 0] = dF2[..., 0] * dl2inv[..., jj, 0]
+    F[..., 0, 1:] = _linear_recurrence(dl2[..., 0, :] * dl2inv[..., 0, ii],
+                                       dF1[..., 0, :] * dl2inv[..., 0, ii],
+                                       0., -1)
+    dl1inv = dl1inv[..., jj, :][..., ii]
+    F[..., 1:, 1:] = _linear_recurrence(dl1[..., ii] * dl1inv,
+                                        dF2[..., ii] * dl1inv,
+                                        F[..., 0, 1:], -2)
 
     if plane == 'yz':
-        F0[0 : n1 - 1, 0 : n2 - 1] = F[0 : n1 - 1, 0 : n2 - 1]
-        F[0 : n1 - 1, 0 : n2 - 1] = F[0 : n1 - 1, 0 : n2 - 1] * lx
+        F[..., : n1 - 1, : n2 - 1] = F[..., : n1 - 1, : n2 - 1] * lx
     elif plane == 'xz':
-        F0[0 : n1 - 1, 0 : n2 - 1] = F[0 : n1 - 1, 0 : n2 - 1]
-        F[0 : n1 - 1, 0 : n2 - 1] = F[0 : n1 - 1, 0 : n2 - 1] * ly
+        F[..., : n1 - 1, : n2 - 1] = F[..., : n1 - 1, : n2 - 1] * ly
     elif plane == 'xy':
-        F0[0 : n1 - 1, 0 : n2 - 1] = F[0 : n1 - 1, 0 : n2 - 1]
-        F[0 : n1 - 1, 0 : n2 - 1] = F[0 : n1 - 1, 0 : n2 - 1] * lz
-    
+        F[..., : n1 - 1, : n2 - 1] = F[..., : n1 - 1, : n2 - 1] * lz
 
-    FF = F[0 : n1 - 1, 0 : n2 - 1] + F[1 : n1, 0 : n2 - 1] + \
-        F[0 : n1 - 1, 1 : n2] + F[1 : n1, 1 : n2]
+    FF = F[..., 0 : n1 - 1, 0 : n2 - 1] + F[..., 1 : n1, 0 : n2 - 1] + \
+        F[..., 0 : n1 - 1, 1 : n2] + F[..., 1 : n1, 1 : n2]
     FF =  FF / 4.
-    F0 = F0 / 4.
     return FF
 
+def _linear_recurrence(a, b, x0, axis):
+    """
+    Solution of x[k] = a[k] * x[k - 1] + b[k] along axis, starting from
+    x0 (x[-1]). With P the cumulative product of a, it is evaluated as
+    x[k] = P[k] * (x0 + sum_{m <= k} b[m] / P[m]); when P vanishes or
+    leaves the safe range of the floats, the recurrence is stepped
+    along axis, still vectorized over the other axes.
+    """
+    a = np.moveaxis(np.asarray(a, dtype=float), axis, 0)
+    b = np.moveaxis(np.asarray(b, dtype=float), axis, 0)
+    with np.errstate(all='ignore'):
+        P = np.cumprod(a, axis=0)
+        x = P * (x0 + np.cumsum(b / P, axis=0))
+    P = np.abs(P)
+    if not (np.all(np.isfinite(x)) and np.all(P > 1e-100) and \
+        np.all(P < 1e100)):
+        x = np.empty(np.broadcast_shapes(a.shape, b.shape))
+        previous = x0
+        for k in range(len(x)):
+            previous = a[k] * previous + b[k]
+            x[k] = previous
+    return np.moveaxis(x, 0, axis)
+
 def strfct2D(b, cell, ghost, plane):
     """
-    plane: 'yz', 'xz', 'xy'
+    plane: 'yz', 'xz', 'xy', or a list of them to get a dictionary with
+           the stream function of each plane
     cell: object cell
     b magnetic field
     """
-    assert plane in ['yz', 'xz', 'xy'], "plane must be one of: \'yz\', "\
-        "\'xz\', \'xy\'"
+    planes = [plane] if type(plane) == str else list(plane)
+    for pl in planes:
+        assert pl in ['yz', 'xz', 'xy'], "plane must be one of: \'yz\', "\
+            "\'xz\', \'xy\'"
     ax = cell.ax(ghost)
     ay = cell.ay(ghost)
     az = cell.az(ghost)
@@ -329,27 +353,29 @@ def strfct2D(b, cell, ghost, plane):
     ly = cell.ly(ghost)
     lz = cell.lz(ghost)
 
-    if plane == 'yz':
-        b1 = b[..., 1] #theta b
-        b2 = b[..., 2] #phi b
-    elif plane == 'xz':
-        b1 = b[..., 0] #rad b
-        b2 = b[..., 2] #phi b
-    elif plane == 'xy':
-        b1 = b[..., 0] #rad b
-        b2 = b[..., 1] #theta b
+    F = {}
+    for pl in planes:
+        if pl == 'yz':
+            b1 = b[..., 1] #theta b
+            b2 = b[..., 2] #phi b
+        elif pl == 'xz':
+            b1 = b[..., 0] #rad b
+            b2 = b[..., 2] #phi b
+        elif pl == 'xy':
+            b1 = b[..., 0] #rad b
+            b2 = b[..., 1] #theta b
 
-    b1, b2, ax, ay, az, lx, ly, lz = get_stream_quantities(b1, b2, ax, ay, az,
-                                                           lx, ly, lz, plane)
+        quantities = get_stream_quantities(b1, b2, ax, ay, az, lx, ly, lz, pl)
 
-        
-    if type(b1) == list:
-        F = np.concatenate((np.flip(
-            strfunction2D(b1[0], b2[0], ax[0], ay[0], az[0], lx[0], ly[0],
-                          lz[0], plane), axis=0),
-            strfunction2D(b1[1], b2[1], ax[1], ay[1], az[1], lx[1], ly[1],
-                          lz[1], plane)), axis=0)
-    else:
-        F = strfunction2D(b1, b2, ax, ay, az, lx, ly, lz, plane)  
+        if type(quantities[0]) == list:
+            ## Both halves of the plane in a single integration
+            quantities = [np.stack([qq.value if isinstance(qq, aerray) else qq
+                                    for qq in q]) for q in quantities]
+            FF = strfunction2D(*quantities, pl)
+            F[pl] = np.concatenate((np.flip(FF[0], axis=0), FF[1]), axis=0)
+        else:
+            F[pl] = strfunction2D(*quantities, pl)
 
+    if type(plane) == str:
+        return F[plane]
     return F
\ No newline at end of file
@@ -3,8 +3,9 @@ from AeViz.utils.math_utils import IDL_derivative, gradient
 from AeViz.utils.files.string_utils import merge_strings
 from numpy.fft import fft, fftfreq
 import os, h5py
-from AeViz.utils.utils import check_existence, progressBar, checkpoints
 from AeViz.utils.files.file_utils import save_hdf, create_series
+from AeViz.utils.physics.load_save_radii_utils import radius_dependency
+from AeViz.utils.sweep_utils import Reducer, sweep
 from AeViz.spherical_harmonics.spherical_harmonics import SphericalHarmonics
 from AeViz.units.aeseries import aeseries, aerray
 from AeViz.units import u
@@ -562,105 +563,95 @@ def calculate_h(simulation, D=1, THETA=np.pi/2, PHI=0,
 
 ## 2D
 
-def NE220_2D_timeseries(simulation, save_checkpoints, D, radii,
-                        apply_correction):
+class NE220Reducer(Reducer):
     """
-    Calculates the NE220 from density and velocities for every timestep
-    of a 2D simulation. It also calculates the full, nucleus, convection
-    and outer core contributions to the strain.
+    NE220 of a 2D simulation, together with its full, nucleus,
+    convection and outer core contributions, for each timestep.
+    Input:
+        dependencies: dictionary with the innercore and PNS nucleus
+                      radii reducers. Missing ones are computed
+                      beforehand.
     """
-    if check_existence(simulation, 'NE220.h5'):
+    save_name = 'NE220.h5'
+    keywords = ['time', 'NE220', 'full_NE220', 'nucleus_NE220',
+                'convection_NE220', 'outer_NE220', 'NE220_corr']
+
+    def __init__(self, simulation, save_checkpoints=True, no_new=False,
+                 dependencies=None):
+        self.dependencies = {} if dependencies is None else dependencies
+        super().__init__(simulation, save_checkpoints, no_new)
+
+    def load(self):
+        if not self.exists():
+            print("No checkpoint found. Starting from step 0")
+            return
         time, NE220, full_NE220, nuc_NE220, conv_NE220, outer_NE220, \
-            NE220_rad_corr, processed_hdf = \
-            read_NE220(simulation)
+            NE220_rad_corr, processed_hdf = read_NE220(self.simulation)
         if processed_hdf is None:
-            save_hdf(os.path.join(simulation.storage_path, 'NE220.h5'),
+            save_hdf(os.path.join(self.simulation.storage_path, 'NE220.h5'),
                      ['time', 'NE220', 'full_NE220', 'nucleus_NE220',
-                      'convection_NE220', 'outer_NE220', 'NE220_corr', 'processed'],
+                      'convection_NE220', 'outer_NE220', 'NE220_corr',
+                      'processed'],
                      [time, NE220, full_NE220, nuc_NE220, conv_NE220,
                       outer_NE220, NE220_rad_corr,
-                      simulation.hdf_file_list[:len(time)]])
+                      self.simulation.hdf_file_list[:len(time)]])
             time, NE220, full_NE220, nuc_NE220, conv_NE220, outer_NE220, \
-                NE220_rad_corr, processed_hdf = \
-            read_NE220(simulation)
+                NE220_rad_corr, processed_hdf = read_NE220(self.simulation)
         if len(processed_hdf) == 0:
-            start_point = 0
-            processed_hdf = []
             print("No checkpoint found. Starting from step 0")
-        elif processed_hdf[-1].decode("utf-8") == simulation.hdf_file_list[-1] or \
-            simulation.no_new:
-            return calculate_strain_2D(simulation, D, time,
-                                       simulation.cell.radius(simulation.ghost),
-                                       NE220, full_NE220, nuc_NE220,
-                                       conv_NE220, outer_NE220, NE220_rad_corr,
-                                       radii)
+            return
+        self.data = {'time': time, 'NE220': NE220, 'full_NE220': full_NE220,
+                     'nucleus_NE220': nuc_NE220,
+                     'convection_NE220': conv_NE220,
+                     'outer_NE220': outer_NE220, 'NE220_corr': NE220_rad_corr}
+        if self.is_complete(processed_hdf):
+            self.complete = True
         else:
-            start_point = len(processed_hdf)
-            processed_hdf = [ff.decode("utf-8") for ff in processed_hdf]
-            print("Checkpoint found." \
-                "Starting from step {}".format(start_point))
-    else:
-        start_point = 0
-        processed_hdf = []
-        print("No checkpoint found. Starting from step 0")
-    checkpoint = checkpoints[simulation.dim]
-    findex = start_point
-    check_index = 0
-    progress_index = 0
-    dV = -simulation.cell.dVolume_integration(simulation.ghost)
-    dOmega = simulation.cell.dOmega(simulation.ghost)
-    ctheta = np.cos(simulation.cell.theta(simulation.ghost))[:, None]
-    inner_rad, igcells = simulation.innercore_radius(rad='full')
-    nuc_rad, ngcells = simulation.PNS_nucleus_radius(rad='full')
-
-    inner_rad = inner_rad.data
-    nuc_rad = nuc_rad.data
-
-    for file in simulation.hdf_file_list[start_point:]:
-        fNE220, ffull, finner, fnuc, fouter, corr = NE220_2D(simulation,
-            file, dV, dOmega, ctheta, inner_rad[..., findex], igcells,
-            nuc_rad[..., findex], ngcells)
-        try:
-            time = np.concatenate((time, simulation.time(file)))
-            NE220 = np.concatenate((NE220, fNE220[..., None]), axis=-1)
-            NE220_rad_corr = np.concatenate((NE220_rad_corr, corr[..., None]),
-                                            axis=-1)
-            full_NE220 = np.concatenate((full_NE220, ffull))
-            nuc_NE220 = np.concatenate((nuc_NE220, fnuc))
-            conv_NE220 = np.concatenate((conv_NE220, finner))
-            outer_NE220 = np.concatenate((outer_NE220, fouter))
-        except Exception as e:
-            print(e)
-            time = simulation.time(file)
-            NE220 = fNE220[..., None]
-            NE220_rad_corr = corr[..., None]
-            full_NE220 = ffull
-            nuc_NE220 = fnuc
-            conv_NE220 = finner
-            outer_NE220 = fouter
-        processed_hdf.append(file)
-        if save_checkpoints and check_index == checkpoint:
-            save_hdf(os.path.join(simulation.storage_path, 'NE220.h5'),
-                     ['time', 'NE220', 'full_NE220', 'nucleus_NE220',
-                      'convection_NE220', 'outer_NE220', 'NE220_corr', 'processed'],
-                     [time, NE220, full_NE220, nuc_NE220, conv_NE220,
-                      outer_NE220, NE220_rad_corr, processed_hdf])
-            print("Checkpoint reached, saving...")
-            check_index = 0
-        check_index += 1
-        progress_index += 1
-        findex += 1
-        progressBar(progress_index, len(simulation.hdf_file_list))
-    
-    print("Computations done, saving...")
-    save_hdf(os.path.join(simulation.storage_path, 'NE220.h5'),
-                     ['time', 'NE220', 'full_NE220', 'nucleus_NE220',
-                      'convection_NE220', 'outer_NE220', 'NE220_corr', 'processed'],
-                     [time, NE220, full_NE220, nuc_NE220, conv_NE220,
-                      outer_NE220, NE220_rad_corr, processed_hdf])
-    return calculate_strain_2D(simulation, D, time, simulation.cell.radius(simulation.ghost),
-                               NE220, full_NE220, nuc_NE220, conv_NE220,
-                               outer_NE220, NE220_rad_corr, radii)
+            self.resume(processed_hdf, 'NE220')
+
+    def setup(self):
+        simulation = self.simulation
+        for radius in ['innercore', 'nucleus']:
+            if radius not in self.dependencies:
+                self.dependencies[radius] = radius_dependency(simulation,
+                                                              radius)
+        self.dV = -simulation.cell.dVolume_integration(simulation.ghost)
+        self.dOmega = simulation.cell.dOmega(simulation.ghost)
+        self.ctheta = np.cos(simulation.cell.theta(simulation.ghost))[:, None]
+
+    def step(self, file, findex):
+        inner, nucleus = self.dependencies['innercore'], \
+            self.dependencies['nucleus']
+        fNE220, ffull, finner, fnuc, fouter, corr = NE220_2D(self.simulation,
+            file, self.dV, self.dOmega, self.ctheta, inner.value_at(findex),
+            inner.gcells, nucleus.value_at(findex), nucleus.gcells)
+        return {
+            'time': self.simulation.time(file),
+            'NE220': fNE220[..., None],
+            'full_NE220': ffull,
+            'nucleus_NE220': fnuc,
+            'convection_NE220': finner,
+            'outer_NE220': fouter,
+            'NE220_corr': corr[..., None]
+        }
+
+def NE220_2D_timeseries(simulation, save_checkpoints, D, radii,
+                        apply_correction):
+    """
+    Calculates the NE220 from density and velocities for every timestep
+    of a 2D simulation. It also calculates the full, nucleus, convection
+    and outer core contributions to the strain.
+    """
+    reducer = NE220Reducer(simulation, save_checkpoints, simulation.no_new)
+    sweep(simulation, [reducer])
+    return calculate_strain_2D(simulation, D, reducer.data['time'],
+                               simulation.cell.radius(simulation.ghost),
+                               reducer.data['NE220'],
+                               reducer.data['full_NE220'],
+                               reducer.data['nucleus_NE220'],
+                               reducer.data['convection_NE220'],
+                               reducer.data['outer_NE220'],
+                               reducer.data['NE220_corr'], radii)
 
 def Zha_correction_2D(dOmega, ctheta, r, rho, vr):
     """
@@ -879,116 +870,101 @@ def get_correction_evolution(simulation, r, radius, amplitude):
     return corr, rindex
 ## 3D
 
-def Qdot_timeseries(simulation, save_checkpoints, D, THETA, PHI, radii,
-                    apply_correction):
+class QdotReducer(Reducer):
     """
-    Calculates the NE220 from density and velocities for every timestep
-    of a 2D simulation. It also calculates the full, nucleus, convection
-    and outer core contributions to the strain.
+    Qdot of a 3D simulation for each timestep, split in the total,
+    innercore, nucleus and outer contributions.
+    Input:
+        dependencies: dictionary with the innercore and PNS nucleus
+                      radii reducers. Missing ones are computed
+                      beforehand.
     """
-    if check_existence(simulation, 'Qdot.h5'):
-        time, Qdot_radial, Qdot_corr, Qdot_total, Qdot_inner, Qdot_nucleus, Qdot_outer, processed_hdf = \
-            read_Qdot(simulation)
+    save_name = 'Qdot.h5'
+    keywords = ['time', 'Qdot_total', 'Qdot_inner', 'Qdot_nucleus',
+                'Qdot_outer', 'Qdot_radial', 'Qdot_corr']
+
+    def __init__(self, simulation, save_checkpoints=True, no_new=False,
+                 dependencies=None):
+        self.dependencies = {} if dependencies is None else dependencies
+        super().__init__(simulation, save_checkpoints, no_new)
+
+    def load(self):
+        if not self.exists():
+            print("No checkpoint found. Starting from step 0")
+            return
+        time, Qdot_radial, Qdot_corr, Qdot_total, Qdot_inner, Qdot_nucleus, \
+            Qdot_outer, processed_hdf = read_Qdot(self.simulation)
         if processed_hdf is None:
-            save_hdf(os.path.join(simulation.storage_path, 'Qdot.h5'),
+            save_hdf(os.path.join(self.simulation.storage_path, 'Qdot.h5'),
                      ['time', 'Qdot_total', 'Qdot_inner', 'Qdot_nucleus',
                       'Qdot_outer', 'Qdot_radial', 'Qdot_corr', 'processed'],
                      [time, Qdot_total, Qdot_inner, Qdot_nucleus, Qdot_outer,
                       Qdot_corr, Qdot_radial,
-                      simulation.hdf_file_list[:len(time)]])
-            time, Qdot_radial, Qdot_corr, Qdot_total, Qdot_inner, Qdot_nucleus, Qdot_outer, processed_hdf = \
-            read_Qdot(simulation)
+                      self.simulation.hdf_file_list[:len(time)]])
+            time, Qdot_radial, Qdot_corr, Qdot_total, Qdot_inner, \
+                Qdot_nucleus, Qdot_outer, processed_hdf = \
+                read_Qdot(self.simulation)
         if len(processed_hdf) == 0:
-            start_point = 0
-            processed_hdf = []
             print("No checkpoint found. Starting from step 0")
-        elif processed_hdf[-1].decode("utf-8") == simulation.hdf_file_list[-1] or \
-            simulation.no_new:
-            return calculate_strain_3D(simulation, D, THETA, PHI, time,
-                                       simulation.cell.radius(simulation.ghost),
-                                       Qdot_radial, Qdot_total, Qdot_inner,
-                                       Qdot_nucleus, Qdot_outer, Qdot_corr, radii,
-                                       apply_correction)
+            return
+        self.data = {'time': time, 'Qdot_total': Qdot_total,
+                     'Qdot_inner': Qdot_inner, 'Qdot_nucleus': Qdot_nucleus,
+                     'Qdot_outer': Qdot_outer, 'Qdot_radial': Qdot_radial,
+                     'Qdot_corr': Qdot_corr}
+        if self.is_complete(processed_hdf):
+            self.complete = True
         else:
-            start_point = len(processed_hdf)
-            processed_hdf = [ff.decode("utf-8") for ff in processed_hdf]
-            print("Checkpoint found." \
-                "Starting from step {}".format(start_point))
-    else:
-        start_point = 0
-        processed_hdf = []
-        print("No checkpoint found. Starting from step 0")
-    checkpoint = checkpoints[simulation.dim]
-    findex = start_point
-    check_index = 0
-    progress_index = 0
-    dV = simulation.cell.dVolume_integration(simulation.ghost)
-    dOmega = simulation.cell.dOmega(simulation.ghost)
-    inner_rad, igcells = simulation.innercore_radius(rad='full')
-    nuc_rad, ngcells = simulation.PNS_nucleus_radius(rad='full')
-
-    inner_rad = inner_rad.data
-    nuc_rad = nuc_rad.data
-        
-    grad, harm = get_spherical_harmonics(
+            self.resume(processed_hdf, 'Qdot')
+
+    def setup(self):
+        simulation = self.simulation
+        for radius in ['innercore', 'nucleus']:
+            if radius not in self.dependencies:
+                self.dependencies[radius] = radius_dependency(simulation,
+                                                              radius)
+        self.dV = simulation.cell.dVolume_integration(simulation.ghost)
+        self.dOmega = simulation.cell.dOmega(simulation.ghost)
+        self.grad, self.harm = get_spherical_harmonics(
                     simulation.cell.radius(simulation.ghost),
                     simulation.cell.theta(simulation.ghost),
                     simulation.cell.phi(simulation.ghost),
-                    dOmega)
-    
-    for file in simulation.hdf_file_list[start_point:]:
+                    self.dOmega)
+
+    def step(self, file, findex):
+        inner, nucleus = self.dependencies['innercore'], \
+            self.dependencies['nucleus']
         Qtot, Qinner, Qnuc, Qouter, Qradial, Qcorr = \
-            calculate_Qdot(simulation, grad, harm,
-                           file, dV, inner_rad[..., findex],
-                           igcells, nuc_rad[..., findex], ngcells)
-        try:
-            time = np.concatenate((time, simulation.time(file)))
-            Qdot_radial = np.concatenate((Qdot_radial, Qradial[..., None]),
-                                         axis=-1)
-            Qdot_total = np.concatenate((Qdot_total, Qtot[..., None]), axis=-1)
-            Qdot_inner = np.concatenate((Qdot_inner, Qinner[..., None]),
-                                        axis=-1)
-            Qdot_nucleus = np.concatenate((Qdot_nucleus, Qnuc[..., None]),
-                                          axis=-1)
-            Qdot_outer = np.concatenate((Qdot_outer, Qouter[..., None]),
-                                        axis=-1)
-            Qdot_corr = np.concatenate((Qdot_corr, Qcorr[..., None]),
-                                        axis=-1)
-        except Exception as e:
-            print(e)
-            time = simulation.time(file)
-            Qdot_radial = Qradial[..., None]
-            Qdot_total = Qtot[..., None]
-            Qdot_inner = Qinner[..., None]
-            Qdot_nucleus = Qnuc[..., None]
-            Qdot_outer = Qouter[..., None]
-            Qdot_corr = Qcorr[..., None]
-        processed_hdf.append(file)
-            
-        if save_checkpoints and check_index == checkpoint:
-            print("Checkpoint reached. Saving...")
-            save_hdf(os.path.join(simulation.storage_path, 'Qdot.h5'),
-                     ['time', 'Qdot_total', 'Qdot_inner', 'Qdot_nucleus',
-                      'Qdot_outer', 'Qdot_radial', 'Qdot_corr', 'processed'],
-                     [time, Qdot_total, Qdot_inner, Qdot_nucleus, Qdot_outer,
-                      Qdot_radial, Qdot_corr, processed_hdf])
-            check_index = 0
-        check_index += 1
-        progress_index += 1
-        findex += 1
-        progressBar(progress_index, len(
-            simulation.hdf_file_list[start_point:]))
-    
-    print("Computations done, saving...")
-    save_hdf(os.path.join(simulation.storage_path, 'Qdot.h5'),
-                     ['time', 'Qdot_total', 'Qdot_inner', 'Qdot_nucleus',
-                      'Qdot_outer', 'Qdot_radial', 'Qdot_corr', 'processed'],
-                     [time, Qdot_total, Qdot_inner, Qdot_nucleus, Qdot_outer,
-                      Qdot_radial, Qdot_corr, processed_hdf])
-    return calculate_strain_3D(simulation, D, THETA, PHI, time,
+            calculate_Qdot(self.simulation, self.grad, self.harm, file,
+                           self.dV, inner.value_at(findex), inner.gcells,
+                           nucleus.value_at(findex), nucleus.gcells)
+        return {
+            'time': self.simulation.time(file),
+            'Qdot_total': Qtot[..., None],
+            'Qdot_inner': Qinner[..., None],
+            'Qdot_nucleus': Qnuc[..., None],
+            'Qdot_outer': Qouter[..., None],
+            'Qdot_radial': Qradial[..., None],
+            'Qdot_corr': Qcorr[..., None]
+        }
+
+def Qdot_timeseries(simulation, save_checkpoints, D, THETA, PHI, radii,
+                    apply_correction):
+    """
+    Calculates the Qdot from density and velocities for every timestep
+    of a 3D simulation. It also calculates the full, nucleus, convection
+    and outer core contributions to the strain.
+    """
+    reducer = QdotReducer(simulation, save_checkpoints, simulation.no_new)
+    sweep(simulation, [reducer])
+    return calculate_strain_3D(simulation, D, THETA, PHI,
+                               reducer.data['time'],
                                simulation.cell.radius(simulation.ghost),
-                               Qdot_radial, Qdot_total, Qdot_inner,
-                               Qdot_nucleus, Qdot_outer, Qdot_corr, radii,
+                               reducer.data['Qdot_radial'],
+                               reducer.data['Qdot_total'],
+                               reducer.data['Qdot_inner'],
+                               reducer.data['Qdot_nucleus'],
+                               reducer.data['Qdot_outer'],
+                               reducer.data['Qdot_corr'], radii,
                                apply_correction)
 
 def Qdot_surface_correction(Qcorr, r1_ind, r2_ind):
@@ -1055,7 +1031,7 @@ def calculate_Qdot(simulation, gradY, Ylm, file_name, dV,
     v_t = simulation.theta_velocity(file_name)
     v_p = simulation.phi_velocity(file_name)
     rho_vr = rho * v_r
-    rho *= dV
+    rho = rho * dV
     Qdot = (rho * (v_r * gradY[0][0, ...] + v_t * gradY[0][1, ...] + v_p \
         * gradY[0][2, ...]))
     Qcorr = Ylm[0] * rho_vr
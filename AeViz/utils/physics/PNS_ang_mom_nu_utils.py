@@ -1,7 +1,7 @@
 import numpy as np
 import h5py, os
-from AeViz.utils.utils import (check_existence, progressBar, checkpoints)
-from AeViz.utils.files.file_utils import save_hdf, create_series
+from AeViz.utils.files.file_utils import create_series
+from AeViz.utils.sweep_utils import Reducer, sweep
 from AeViz.units import u
 from AeViz.grid.grid import grid
 from AeViz.units. aerray import aerray
@@ -111,99 +111,69 @@ def PNS_angular_momentum_neutrinos(simulation, file_name, PNS_radius,
     
     return Lx, Ly, Lz
 
+class AngularMomentumNuReducer(Reducer):
+    """
+    Angular momentum carried by the neutrinos through the PNS surface
+    for each timestep, stored in PNS_angular_momentum_nu.h5.
+    """
+    save_name = 'PNS_angular_momentum_nu.h5'
+    keywords = ['time', 'Lx', 'Ly', 'Lz']
+
+    def load(self):
+        if not self.exists():
+            print('No checkpoint found for the angular momentum file, ' \
+                  'starting from the beginning.\nPlease wait...')
+            return
+        time, Lx, Ly, Lz, processed_hdf = \
+            read_angular_mom_PNS_nu(self.simulation)
+        self.data = {'time': time, 'Lx': Lx, 'Ly': Ly, 'Lz': Lz}
+        if self.is_complete(processed_hdf):
+            self.complete = True
+        else:
+            self.resume(processed_hdf, 'the angular momentum file')
+
+    def setup(self):
+        simulation = self.simulation
+        self.PNS_r, self.g_cells = simulation.PNS_radius(rad='full')
+        self.PNS_r = self.PNS_r.data
+        self.av_r = simulation.PNS_radius(rad='avg').data
+        r = simulation.cell.radius(simulation.ghost)
+        self.dOmega = simulation.cell.dOmega(simulation.ghost)
+        self.gr = grid(simulation.dim, r,
+                       simulation.cell.theta(simulation.ghost),
+                       simulation.cell.phi(simulation.ghost))
+        while r.ndim < simulation.dim:
+            r = r[None, :]
+        self.r = r
+        if simulation.dim == 2:
+            self.indices = (np.arange(len(simulation.cell.theta(
+                simulation.ghost))), )
+        else:
+            self.indices = np.meshgrid(
+                np.arange(len(simulation.cell.phi(simulation.ghost))),
+                np.arange(len(simulation.cell.theta(simulation.ghost))),
+                indexing='ij')
+
+    def step(self, file, findex):
+        Lx, Ly, Lz = PNS_angular_momentum_neutrinos(self.simulation, file,
+                                                    self.PNS_r[..., findex],
+                                                    self.av_r[findex],
+                                                    self.indices, self.dOmega,
+                                                    self.gr, self.r,
+                                                    self.g_cells)
+        return {'time': self.simulation.time(file), 'Lx': Lx, 'Ly': Ly,
+                'Lz': Lz}
+
 def calculate_angular_mom_PNS_nu(simulation, save_checkpoints=True,
                                  no_new=False):
     if simulation.dim == 1:
         print('No angular momentum calculation for 1D simulations.')
         return None
-    if check_existence(simulation, 'PNS_angular_momentum_nu.h5'):
-        time, Lx, Ly, Lz, processed_hdf = \
-            read_angular_mom_PNS_nu(simulation)
-        if processed_hdf[-1].decode("utf-8") == simulation.hdf_file_list[-1] \
-            or no_new:
-            return create_aerrays(time, Lx, Ly, Lz)
-        else:
-            start_point = len(processed_hdf)
-            processed_hdf = [ff.decode("utf-8") for ff in processed_hdf]
-            print('Checkpoint found for the angular momentum file, starting' \
-                  ' from checkpoint.\nPlease wait...')
-    else:
-        start_point = 0
-        processed_hdf = []
-        print('No checkpoint found for the angular momentum file, starting' \
-              ' from the beginning.\nPlease wait...')
-    if (checkpoints[simulation.dim] == False) or (not save_checkpoints):
-        checkpoint = len(simulation.hdf_file_list)
-    else:
-        checkpoint = checkpoints[simulation.dim]
-    PNS_r, g_cells = simulation.PNS_radius(rad='full')
-    PNS_r = PNS_r.data
-    av_r = simulation.PNS_radius(rad='avg').data
-    r = simulation.cell.radius(simulation.ghost)
-    dOmega = simulation.cell.dOmega(simulation.ghost)
-    gr = grid(simulation.dim, r, simulation.cell.theta(simulation.ghost),
-              simulation.cell.phi(simulation.ghost))
-    while r.ndim < simulation.dim:
-        r = r[None, :]
-    
-    if simulation.dim == 2:
-        indices = (np.arange(len(simulation.cell.theta(simulation.ghost))), )
-    else:
-        indices = np.meshgrid(
-            np.arange(len(simulation.cell.phi(simulation.ghost))),
-            np.arange(len(simulation.cell.theta(simulation.ghost))),
-            indexing='ij')
-    findex = start_point
-    check_index = 0
-    progress_index = 0
-    total_points = len(simulation.hdf_file_list) - start_point
-    for file in simulation.hdf_file_list[start_point:]:
-        progressBar(progress_index, total_points, suffix='Computing neutrino '
-                    'angular momentum component...')
-        Lx_comp, Ly_comp, Lz_comp = PNS_angular_momentum_neutrinos(
-                                                    simulation, file,
-                                                    PNS_r[..., findex],
-                                                    av_r[findex],
-                                                    indices, dOmega, gr,
-                                                    r, g_cells)
-        try:
-            time = np.concatenate((time, simulation.time(file)))
-            Lx = {'nue': np.concatenate((Lx['nue'], Lx_comp['nue'])),
-                  'nua': np.concatenate((Lx['nua'], Lx_comp['nua'])),
-                  'nux': np.concatenate((Lx['nux'], Lx_comp['nux']))}
-            Ly = {'nue': np.concatenate((Ly['nue'], Ly_comp['nue'])),
-                  'nua': np.concatenate((Ly['nua'], Ly_comp['nua'])),
-                  'nux': np.concatenate((Ly['nux'], Ly_comp['nux']))}
-            Lz = {'nue': np.concatenate((Lz['nue'], Lz_comp['nue'])),
-                  'nua': np.concatenate((Lz['nua'], Lz_comp['nua'])),
-                  'nux': np.concatenate((Lz['nux'], Lz_comp['nux']))}
-        except Exception as e:
-            time = simulation.time(file)
-            Lx = {'nue': Lx_comp['nue'],
-                  'nua': Lx_comp['nua'],
-                  'nux': Lx_comp['nux']}
-            Ly = {'nue': Ly_comp['nue'],
-                  'nua': Ly_comp['nua'],
-                  'nux': Ly_comp['nux']}
-            Lz = {'nue': Lz_comp['nue'],
-                  'nua': Lz_comp['nua'],
-                  'nux': Lz_comp['nux']}
-        processed_hdf.append(file)
-        if (check_index >= checkpoint) and save_checkpoints:
-            print('Checkpoint reached, saving...\n')
-            save_hdf(os.path.join(simulation.storage_path, 
-                                  'PNS_angular_momentum_nu.h5'),
-                     ['time', 'Lx', 'Ly', 'Lz', 'processed'],
-                     [time, Lx, Ly, Lz, processed_hdf])
-            check_index = 0
-        check_index += 1
-        progress_index += 1
-        findex += 1
-    save_hdf(os.path.join(simulation.storage_path, 
-                        'PNS_angular_momentum_nu.h5'),
-            ['time', 'Lx', 'Ly', 'Lz', 'processed'],
-            [time, Lx, Ly, Lz, processed_hdf])
-    return create_aerrays(time, Lx, Ly, Lz)
+    reducer = AngularMomentumNuReducer(simulation, save_checkpoints, no_new)
+    sweep(simulation, [reducer], 'Computing neutrino angular momentum ' \
+          'component...')
+    data = reducer.data
+    return create_aerrays(data['time'], data['Lx'], data['Ly'], data['Lz'])
 
 def read_angular_mom_PNS_nu(simulation):
     """
@@ -0,0 +1,67 @@
+from AeViz.utils.sweep_utils import TimeReducer, sweep
+from AeViz.utils.physics.load_save_radii_utils import RadiusReducer
+from AeViz.utils.physics.load_save_mass_ene_utils import MassEnergyReducer
+from AeViz.utils.physics.kick_vel_utils import KickReducer
+from AeViz.utils.physics.profiles import (ProfilesReducer,
+                                          VelocityProfilesReducer)
+from AeViz.utils.physics.GW_utils import NE220Reducer, QdotReducer
+from AeViz.utils.physics.inertia import InertiaReducer
+
+def fused_postprocessing(simulation, rmax=None, neutrinos=True, profiles=True,
+                         GWs=True, isodensity=False, inertia=False,
+                         save_checkpoints=True, n_workers=None):
+    """
+    Computes the standard postprocessing of a supernova simulation in a
+    single sweep over the timesteps. Each file is opened and read once,
+    and all the quantities (time, radii, masses and energies, kick,
+    profiles, NE220 or Qdot and inertia moment) are computed on the same
+    in-memory snapshot. Each quantity is still saved in its own
+    checkpoint file and restarts from it.
+    Input:
+        rmax: maximum radius for the shock detection
+        neutrinos: computes the neutrino spheres
+        profiles: computes the radial and velocity profiles
+        GWs: computes NE220 (2D) or Qdot (3D)
+        isodensity: computes the isodensity lines
+        inertia: computes the inertia moment (needs the isodensity
+                 lines)
+        n_workers: number of processes among which the timesteps are
+                   split, by default simulation.n_workers
+    """
+    reducers = [TimeReducer(simulation)]
+    ## RADII
+    radii = {}
+    for radius in ['PNS', 'shock', 'innercore', 'nucleus']:
+        radii[radius] = RadiusReducer(simulation, radius, save_checkpoints,
+                                      rmax=rmax if radius == 'shock' else None)
+    radii['gain'] = RadiusReducer(simulation, 'gain', save_checkpoints,
+                                  dependencies={'PNS': radii['PNS']})
+    if neutrinos and simulation.evolved_qts['neudim'] > 0:
+        radii['neutrino'] = RadiusReducer(simulation, 'neutrino',
+                                          save_checkpoints)
+    if isodensity or inertia:
+        radii['isodensity'] = RadiusReducer(simulation, 'isodensity',
+                                            save_checkpoints)
+    reducers += list(radii.values())
+    ## MASSES, ENERGIES AND KICK
+    reducers.append(MassEnergyReducer(simulation, save_checkpoints,
+                        dependencies={key: radii[key] for key in
+                                      MassEnergyReducer.radii}))
+    reducers.append(KickReducer(simulation, save_checkpoints,
+                                dependencies={'PNS': radii['PNS']}))
+    ## PROFILES
+    if profiles:
+        reducers.append(ProfilesReducer(simulation, save_checkpoints))
+        reducers.append(VelocityProfilesReducer(simulation, save_checkpoints))
+    ## GWs
+    if GWs and simulation.dim > 1:
+        GW_reducer = NE220Reducer if simulation.dim == 2 else QdotReducer
+        reducers.append(GW_reducer(simulation, save_checkpoints,
+                            dependencies={'innercore': radii['innercore'],
+                                          'nucleus': radii['nucleus']}))
+    ## INERTIA
+    if inertia:
+        reducers.append(InertiaReducer(simulation, save_checkpoints,
+                            dependencies={'isodensity': radii['isodensity'],
+                                          'PNS': radii['PNS']}))
+    sweep(simulation, reducers, 'Postprocessing...', n_workers)
@@ -1,7 +1,8 @@
 import numpy as np
 import h5py, os
-from AeViz.utils.utils import (check_existence, progressBar, checkpoints)
-from AeViz.utils.files.file_utils import save_hdf, create_series
+from AeViz.utils.physics.load_save_radii_utils import radius_dependency
+from AeViz.utils.sweep_utils import Reducer, sweep
+from AeViz.utils.files.file_utils import create_series
 from AeViz.units import u
 from AeViz.units.constants import constants as c
 from AeViz.grid.grid import grid
@@ -122,111 +123,82 @@ def velocity_kick(simulation, file_name, PNS_radius, gcells, dV, dOmega, r400):
     
     return [-vx, -vy, -vz], nue_flux, nua_flux, nux_flux
 
-def calculate_kick(simulation, save_checkpoints=True, no_new=False):
-    PNSmass = simulation.PNS_mass_ene(comp='mass').data
-    if check_existence(simulation, 'kick_velocity.h5'):
-        time, hydro_v, nu_flux, processed_hdf = \
-            read_kick(simulation)
+class KickReducer(Reducer):
+    """
+    Momentum of the matter outside the PNS and momentum carried away by
+    neutrinos at 400 km for each timestep of the simulation.
+    Input:
+        dependencies: dictionary containing the PNS radius reducer. If
+                      not provided it is computed beforehand.
+    """
+    save_name = 'kick_velocity.h5'
+    keywords = ['time', 'hydro', 'nu_flux']
+
+    def __init__(self, simulation, save_checkpoints=True, no_new=False,
+                 dependencies=None):
+        self.dependencies = {} if dependencies is None else dependencies
+        super().__init__(simulation, save_checkpoints, no_new)
+
+    def load(self):
+        if not self.exists():
+            print('No checkpoint found for the kick file, starting' \
+                  ' from the beginning.\nPlease wait...')
+            return
+        time, hydro_v, nu_flux, processed_hdf = read_kick(self.simulation)
+        self.data = {'time': time, 'hydro': hydro_v, 'nu_flux': nu_flux}
         ## Retrocompatibility with old files
         if processed_hdf is None:
-            if len(simulation.hdf_file_list) == len(time):
-                save_hdf(os.path.join(simulation.storage_path, 
-                                  'kick_velocity.h5'),
-                     ['time', 'hydro', 'nu_flux', 'processed'],
-                     [time, hydro_v, nu_flux,
-                      simulation.hdf_file_list])
-                return integrate_momenta(time, PNSmass, hydro_v, nu_flux['nue'],
-                                         nu_flux['nua'], nu_flux['nux'])
+            if len(self.simulation.hdf_file_list) == len(time):
+                self.processed_hdf = self.simulation.hdf_file_list
+                self.save()
+                self.complete = True
             else:
-                start_point = 0
-                hydro_v = 0
-                nu_flux = 0
-                processed_hdf = []
-        elif processed_hdf[-1].decode("utf-8") == simulation.hdf_file_list[-1] \
-            or no_new:
-            return integrate_momenta(time, PNSmass, hydro_v, nu_flux['nue'],
-                                         nu_flux['nua'], nu_flux['nux'])
+                self.data = {}
+        elif self.is_complete(processed_hdf):
+            self.complete = True
         else:
-            start_point = len(processed_hdf)
-            processed_hdf = [ff.decode("utf-8") for ff in processed_hdf]
-            print('Checkpoint found for the kick file, starting' \
-                  ' from checkpoint.\nPlease wait...')
-    else:
-        start_point = 0
-        processed_hdf = []
-        print('No checkpoint found for the kick file, starting' \
-              ' from the beginning.\nPlease wait...')
-    if (checkpoints[simulation.dim] == False) or (not save_checkpoints):
-        checkpoint = len(simulation.hdf_file_list)
-    else:
-        checkpoint = checkpoints[simulation.dim]
-    ## Get the radii
-    PNS_radius, pgcells = simulation.PNS_radius(rad='full')
-    PNS_radius = PNS_radius.data
-    ## Get the grid
-    dV = simulation.cell.dVolume_integration(simulation.ghost)
-    dOmega = simulation.cell.dOmega(simulation.ghost)
-    r400 = np.argmax(simulation.cell.radius(simulation.ghost) >= \
-                     (400 * u.km))
-    ## Indices
-    findex = start_point
-    check_index = 0
-    progress_index = 0
-    total_points = len(simulation.hdf_file_list) - start_point
-    for file in simulation.hdf_file_list[start_point:]:
-        progressBar(progress_index, total_points, suffix='Computing...')
+            self.resume(processed_hdf, 'the kick file')
+
+    def setup(self):
+        simulation = self.simulation
+        if 'PNS' not in self.dependencies:
+            self.dependencies['PNS'] = radius_dependency(simulation, 'PNS')
+        self.dV = simulation.cell.dVolume_integration(simulation.ghost)
+        self.dOmega = simulation.cell.dOmega(simulation.ghost)
+        self.r400 = np.argmax(simulation.cell.radius(simulation.ghost) >= \
+                              (400 * u.km))
+
+    def step(self, file, findex):
         hydro_v_f, nue_flux_f, nua_flux_f, nux_flux_f = \
-                                            velocity_kick(simulation, file, 
-                                                    PNS_radius[..., findex],
-                                                    pgcells, dV, dOmega, r400)
-        try:
-            time = np.concatenate((time, simulation.time(file)))
-            hydro_v = {'x': np.concatenate((hydro_v['x'], hydro_v_f[0])),
-                       'y': np.concatenate((hydro_v['y'], hydro_v_f[1])),
-                       'z': np.concatenate((hydro_v['z'], hydro_v_f[2]))}
-            nu_flux['nue'] = {'x': np.concatenate((nu_flux['nue']['x'], nue_flux_f[0])),
-                              'y': np.concatenate((nu_flux['nue']['y'], nue_flux_f[1])),
-                              'z': np.concatenate((nu_flux['nue']['z'], nue_flux_f[2]))}
-            nu_flux['nua'] = {'x': np.concatenate((nu_flux['nua']['x'], nua_flux_f[0])),
-                              'y': np.concatenate((nu_flux['nua']['y'], nua_flux_f[1])),
-                              'z': np.concatenate((nu_flux['nua']['z'], nua_flux_f[2]))}
-            nu_flux['nux'] = {'x': np.concatenate((nu_flux['nux']['x'], nux_flux_f[0])),
-                              'y': np.concatenate((nu_flux['nux']['y'], nux_flux_f[1])),
-                              'z': np.concatenate((nu_flux['nux']['z'], nux_flux_f[2]))}
-        except Exception as e:
-            print('Error: ', e)
-            time = simulation.time(file)
-            hydro_v = {'x': hydro_v_f[0],
-                       'y': hydro_v_f[1],
-                       'z': hydro_v_f[2]}
-            nu_flux = {'nue': {'x': nue_flux_f[0],
-                               'y': nue_flux_f[1],
-                               'z': nue_flux_f[2]},
-                       'nua': {'x': nua_flux_f[0],
-                               'y': nua_flux_f[1],
-                               'z': nua_flux_f[2]},
-                       'nux': {'x': nux_flux_f[0],
-                               'y': nux_flux_f[1],
-                               'z': nux_flux_f[2]}
-                        }
-        processed_hdf.append(file)
-        if (check_index >= checkpoint) and save_checkpoints:
-            print('Checkpoint reached, saving...\n')
-            save_hdf(os.path.join(simulation.storage_path, 
-                                  'kick_velocity.h5'),
-                     ['time', 'hydro', 'nu_flux', 'processed'],
-                     [time, hydro_v, nu_flux, processed_hdf])
-            check_index = 0
-        check_index += 1
-        progress_index += 1
-        findex += 1
-    print('Computation completed, saving...')
-    save_hdf(os.path.join(simulation.storage_path, 
-                                  'kick_velocity.h5'),
-                     ['time', 'hydro', 'nu_flux', 'processed'],
-                     [time, hydro_v, nu_flux, processed_hdf])
-    return integrate_momenta(time, PNSmass, hydro_v, nu_flux['nue'],
-                             nu_flux['nua'], nu_flux['nux'])
+            velocity_kick(self.simulation, file,
+                          self.dependencies['PNS'].value_at(findex),
+                          self.dependencies['PNS'].gcells, self.dV,
+                          self.dOmega, self.r400)
+        return {
+            'time': self.simulation.time(file),
+            'hydro': {'x': hydro_v_f[0],
+                      'y': hydro_v_f[1],
+                      'z': hydro_v_f[2]},
+            'nu_flux': {'nue': {'x': nue_flux_f[0],
+                                'y': nue_flux_f[1],
+                                'z': nue_flux_f[2]},
+                        'nua': {'x': nua_flux_f[0],
+                                'y': nua_flux_f[1],
+                                'z': nua_flux_f[2]},
+                        'nux': {'x': nux_flux_f[0],
+                                'y': nux_flux_f[1],
+                                'z': nux_flux_f[2]}}
+        }
+
+def calculate_kick(simulation, save_checkpoints=True, no_new=False):
+    PNSmass = simulation.PNS_mass_ene(comp='mass').data
+    reducer = KickReducer(simulation, save_checkpoints, no_new)
+    sweep(simulation, [reducer])
+    return integrate_momenta(reducer.data['time'], PNSmass,
+                             reducer.data['hydro'],
+                             reducer.data['nu_flux']['nue'],
+                             reducer.data['nu_flux']['nua'],
+                             reducer.data['nu_flux']['nux'])
 
 def read_kick(simulation):
     """
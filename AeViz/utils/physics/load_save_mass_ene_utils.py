@@ -3,8 +3,9 @@ from AeViz.utils.physics.masses_energies_utils import (standard_mass_energy,
                                                PNS_mass_energy,
                                                unbound_mass_energy,
                                                mass_flux)
-from AeViz.utils.utils import (check_existence, progressBar, checkpoints)
-from AeViz.utils.files.file_utils import save_hdf, create_series
+from AeViz.utils.physics.load_save_radii_utils import radius_dependency
+from AeViz.utils.sweep_utils import Reducer, sweep
+from AeViz.utils.files.file_utils import create_series
 from AeViz.grid.grid import grid
 import os, h5py
 import numpy as np
@@ -12,172 +13,94 @@ from AeViz.units.aerray import aerray
 from AeViz.units import u
 
 
-def calculate_masses_energies(simulation, save_checkpoints=True, no_new=False):
-    if check_existence(simulation, 'masses_energies.h5'):
+class MassEnergyReducer(Reducer):
+    """
+    Masses and energies of the innercore, PNS core, gain region, PNS
+    and of the unbound material, together with the mass flux at 500 km
+    for each timestep of the simulation.
+    Input:
+        dependencies: dictionary of the radii reducers (innercore,
+                      nucleus, shock, gain and PNS). Missing ones are
+                      computed beforehand.
+    """
+    save_name = 'masses_energies.h5'
+    keywords = ['time', 'mass_flux', 'innercore', 'gain_region', 'PNS',
+                'unbound', 'PNS_core']
+    radii = ['innercore', 'nucleus', 'shock', 'gain', 'PNS']
+
+    def __init__(self, simulation, save_checkpoints=True, no_new=False,
+                 dependencies=None):
+        self.dependencies = {} if dependencies is None else dependencies
+        super().__init__(simulation, save_checkpoints, no_new)
+
+    def load(self):
+        if not self.exists():
+            print('No checkpoint found for the mass and energy file, ' \
+                  'starting from the beginning.\nPlease wait...')
+            return
         time, mdot, inner_me, gain_me, PNS_me, unb_me, nuc_me, \
-            processed_hdf = \
-            read_masses_energies(simulation)
+            processed_hdf = read_masses_energies(self.simulation)
+        self.data = {'time': time, 'mass_flux': mdot, 'innercore': inner_me,
+                     'gain_region': gain_me, 'PNS': PNS_me,
+                     'unbound': unb_me, 'PNS_core': nuc_me}
         ## Retrocompatibility option
         if processed_hdf is None:
-            if len(simulation.hdf_file_list) == len(time):
-                save_hdf(os.path.join(simulation.storage_path,
-                    'masses_energies.h5'),
-                    ['time', 'mass_flux', 'innercore', 'gain_region', 'PNS',
-                      'unbound', 'PNS_core', 'processed'],
-                    [time, mdot, inner_me, gain_me, PNS_me, unb_me, nuc_me,
-                    simulation.hdf_file_list])
-                return create_series(time, mdot, inner_me, gain_me, PNS_me,
-                                     unb_me, nuc_me)
+            if len(self.simulation.hdf_file_list) == len(time):
+                self.processed_hdf = self.simulation.hdf_file_list
+                self.save()
+                self.complete = True
             else:
-                start_point = 0
-                time = 0
-                mdot = 0
-                nuc_me = 0
-                inner_me = 0
-                gain_me = 0
-                PNS_me = 0
-                unb_data = 0
-                processed_hdf = []
-        elif processed_hdf[-1].decode("utf-8") == simulation.hdf_file_list[-1] \
-            or no_new:
-            return create_series(time, mdot, inner_me, gain_me, PNS_me, unb_me,
-                                 nuc_me)
+                self.data = {}
+        elif self.is_complete(processed_hdf):
+            self.complete = True
         else:
-            start_point = len(processed_hdf)
-            processed_hdf = [ff.decode("utf-8") for ff in processed_hdf]
-            print('Checkpoint found for the mass and energy file, starting' \
-                  ' from checkpoint.\nPlease wait...')
-    else:
-        start_point = 0
-        processed_hdf = []
-        print('No checkpoint found for the mass and energy file, starting' \
-              ' from the beginning.\nPlease wait...')
-    if (checkpoints[simulation.dim] == False) or (not save_checkpoints):
-        checkpoint = len(simulation.hdf_file_list)
-    else:
-        checkpoint = checkpoints[simulation.dim]
-    ## Get the radii
-    innercore_radius, igcells  = simulation.innercore_radius(rad='full')
-    PNS_core_radius, pcgcells  = simulation.PNS_nucleus_radius(rad='full')
-    shock_radius, sgcells      = simulation.shock_radius(rad='full')
-    gain_radius, ggcells       = simulation.gain_radius(rad='full')
-    PNS_radius, pgcells        = simulation.PNS_radius(rad='full')
-    innercore_radius = innercore_radius.data
-    PNS_core_radius = PNS_core_radius.data
-    shock_radius = shock_radius.data
-    gain_radius = gain_radius.data
-    PNS_radius = PNS_radius.data
-    ## Get the grid
-    if simulation.dim == 1:
-        gr = grid(1, simulation.cell.radius(simulation.ghost))
-        X, Y, Z = (gr.cartesian_grid(), 0, 0)
-    elif simulation.dim == 2:
-        gr = grid(2, simulation.cell.radius(simulation.ghost), 
-                  simulation.cell.theta(simulation.ghost))
-        X, Z = gr.cartesian_grid()
-        Y = 0 * X.unit
-    else:
-        gr = grid(3, simulation.cell.radius(simulation.ghost), 
-                  simulation.cell.theta(simulation.ghost),
-                  simulation.cell.phi(simulation.ghost))
-        X, Y, Z = gr.cartesian_grid()
+            self.resume(processed_hdf, 'the mass and energy file')
+
+    def setup(self):
+        simulation = self.simulation
+        ## Get the radii
+        for radius in self.radii:
+            if radius not in self.dependencies:
+                self.dependencies[radius] = radius_dependency(simulation,
+                                                              radius)
+        ## Get the grid
+        if simulation.dim == 1:
+            self.gr = grid(1, simulation.cell.radius(simulation.ghost))
+            self.X, self.Y, self.Z = (self.gr.cartesian_grid(), 0, 0)
+        elif simulation.dim == 2:
+            self.gr = grid(2, simulation.cell.radius(simulation.ghost), 
+                           simulation.cell.theta(simulation.ghost))
+            self.X, self.Z = self.gr.cartesian_grid()
+            self.Y = 0 * self.X.unit
+        else:
+            self.gr = grid(3, simulation.cell.radius(simulation.ghost), 
+                           simulation.cell.theta(simulation.ghost),
+                           simulation.cell.phi(simulation.ghost))
+            self.X, self.Y, self.Z = self.gr.cartesian_grid()
+        ## Get the volume elements
+        self.dV = simulation.cell.dVolume_integration(simulation.ghost)
+        self.dOmega = simulation.cell.dOmega(simulation.ghost)
+        self.radius_index = np.argmax(
+            simulation.cell.radius(simulation.ghost) >= 5e7)
 
-    ## Get the volume elements
-    dV = simulation.cell.dVolume_integration(simulation.ghost)
-    dOmega = simulation.cell.dOmega(simulation.ghost)
-    radius_index = np.argmax(simulation.cell.radius(simulation.ghost) >= 5e7)
-    ## Indices
-    findex = start_point
-    check_index = 0
-    progress_index = 0
-    total_points = len(simulation.hdf_file_list) - start_point
-    for file in simulation.hdf_file_list[start_point:]:
-        progressBar(progress_index, total_points, suffix='Computing...')
+    def step(self, file, findex):
+        simulation = self.simulation
+        radii = {key: (dep.value_at(findex), dep.gcells) for (key, dep) in
+                 self.dependencies.items()}
         in_data = standard_mass_energy(simulation, file,
-                                        innercore_radius[..., findex], 
-                                        igcells, dV)
+                                       *radii['innercore'], self.dV)
         nuc_data = standard_mass_energy(simulation, file,
-                                        PNS_core_radius[..., findex], 
-                                        pcgcells, dV)
-        gr_data = gain_region_mass_energy(simulation, file,
-                                          shock_radius[..., findex], sgcells,
-                                          gain_radius[..., findex], ggcells,
-                                          dV)
-        PNS_data = PNS_mass_energy(simulation, file, PNS_radius[..., findex],
-                                   pgcells, dV, (X, Y, Z), gr)
-        unb_data = unbound_mass_energy(simulation, file, dV)
-        try:
-            time = np.concatenate((time, simulation.time(file)))
-            mdot = np.concatenate((mdot, mass_flux(simulation, file, 
-                                                    dOmega, radius_index)))
-            ## PNS CORE
-            nuc_me['mass'] = np.concatenate((nuc_me['mass'], nuc_data[0]))
-            
-            nuc_me['kinetic_ene'] = np.concatenate((nuc_me['kinetic_ene'],
-                                                nuc_data[1]))
-            nuc_me['magnetic_ene'] = np.concatenate((nuc_me['magnetic_ene'],
-                                                nuc_data[2]))
-            nuc_me['rotational_ene'] = np.concatenate((
-                nuc_me['rotational_ene'], nuc_data[3]))
-            nuc_me['grav_ene'] = np.concatenate((
-                nuc_me['grav_ene'], nuc_data[4]))
-            nuc_me['total_ene'] = np.concatenate((
-                nuc_me['total_ene'], nuc_data[5]))
-            nuc_me['T_W'] = np.concatenate((
-                nuc_me['T_W'], nuc_data[6]))
-            ## INNERCORE
-            inner_me['mass'] = np.concatenate((inner_me['mass'], in_data[0]))
-            
-            inner_me['kinetic_ene'] = np.concatenate((inner_me['kinetic_ene'],
-                                                in_data[1]))
-            inner_me['magnetic_ene'] = np.concatenate((inner_me['magnetic_ene'],
-                                                in_data[2]))
-            inner_me['rotational_ene'] = np.concatenate((
-                inner_me['rotational_ene'], in_data[3]))
-            inner_me['grav_ene'] = np.concatenate((
-                inner_me['grav_ene'], in_data[4]))
-            inner_me['total_ene'] = np.concatenate((
-                inner_me['total_ene'], in_data[5]))
-            inner_me['T_W'] = np.concatenate((
-                inner_me['T_W'], in_data[6]))
-            ## GAIN
-            gain_me['mass'] = np.concatenate((gain_me['mass'], gr_data[0]))
-            gain_me['heating_ene'] = np.concatenate((gain_me['heating_ene'],
-                                                gr_data[1]))
-            ## PNS
-            PNS_me['mass'] = np.concatenate((PNS_me['mass'], PNS_data[0]))
-            PNS_me['kinetic_ene'] = np.concatenate((PNS_me['kinetic_ene'],
-                                                PNS_data[1]))
-            PNS_me['magnetic_ene'] = np.concatenate((PNS_me['magnetic_ene'],
-                                                PNS_data[2]))
-            PNS_me['rotational_ene'] = np.concatenate((
-                PNS_me['rotational_ene'], PNS_data[3]))
-            PNS_me['grav_ene'] = np.concatenate((
-                PNS_me['grav_ene'], PNS_data[4]))
-            PNS_me['total_ene'] = np.concatenate((
-                PNS_me['total_ene'], PNS_data[5]))
-            PNS_me['convective_ene'] = np.concatenate((
-                PNS_me['convective_ene'], PNS_data[6]))
-            PNS_me['L']['Lx'] = np.concatenate((PNS_me['L']['Lx'],
-                                                PNS_data[7]))
-            PNS_me['L']['Ly'] = np.concatenate((PNS_me['L']['Ly'],
-                                                PNS_data[8]))
-            PNS_me['L']['Lz'] = np.concatenate((PNS_me['L']['Lz'],
-                                                PNS_data[9]))
-            PNS_me['L']['L_tot'] = np.concatenate((PNS_me['L']['L_tot'],
-                                                PNS_data[10]))
-            ## EXPLOSION
-            unb_me['mass'] = np.concatenate((unb_me['mass'], unb_data[0]))
-            unb_me['energy'] = np.concatenate((unb_me['energy'], unb_data[1]))
-            unb_me['kinetic_ene'] = np.concatenate((unb_me['kinetic_ene'],
-                                                unb_data[2]))
-            unb_me['magnetic_ene'] = np.concatenate((unb_me['magnetic_ene'],
-                                                unb_data[3]))
-        except Exception as e:
-            print(e)
-            time = simulation.time(file)
-            mdot = mass_flux(simulation, file, dOmega, radius_index)
-            inner_me = {
+                                        *radii['nucleus'], self.dV)
+        gr_data = gain_region_mass_energy(simulation, file, *radii['shock'],
+                                          *radii['gain'], self.dV)
+        PNS_data = PNS_mass_energy(simulation, file, *radii['PNS'], self.dV,
+                                   (self.X, self.Y, self.Z), self.gr)
+        unb_data = unbound_mass_energy(simulation, file, self.dV)
+        return {
+            'time': simulation.time(file),
+            'mass_flux': mass_flux(simulation, file, self.dOmega,
+                                   self.radius_index),
+            'innercore': {
                 'mass': in_data[0],
                 'kinetic_ene': in_data[1],
                 'magnetic_ene': in_data[2],
@@ -185,21 +108,12 @@ def calculate_masses_energies(simulation, save_checkpoints=True, no_new=False):
                 'grav_ene': in_data[4],
                 'total_ene': in_data[5],
                 'T_W': in_data[6]
-            }
-            nuc_me = {
-                'mass': nuc_data[0],
-                'kinetic_ene': nuc_data[1],
-                'magnetic_ene': nuc_data[2],
-                'rotational_ene': nuc_data[3],
-                'grav_ene': nuc_data[4],
-                'total_ene': nuc_data[5],
-                'T_W': nuc_data[6]
-            }
-            gain_me = {
+            },
+            'gain_region': {
                 'mass': gr_data[0],
                 'heating_ene': gr_data[1]
-            }
-            PNS_me = {
+            },
+            'PNS': {
                 'mass': PNS_data[0],
                 'kinetic_ene': PNS_data[1],
                 'magnetic_ene': PNS_data[2],
@@ -213,36 +127,34 @@ def calculate_masses_energies(simulation, save_checkpoints=True, no_new=False):
                     'Lz': PNS_data[9],
                     'L_tot': PNS_data[10]
                 }
-            }
-            unb_me = {
+            },
+            'unbound': {
                 'mass': unb_data[0],
                 'energy': unb_data[1],
                 'kinetic_ene': unb_data[2],
                 'magnetic_ene': unb_data[3]
+            },
+            'PNS_core': {
+                'mass': nuc_data[0],
+                'kinetic_ene': nuc_data[1],
+                'magnetic_ene': nuc_data[2],
+                'rotational_ene': nuc_data[3],
+                'grav_ene': nuc_data[4],
+                'total_ene': nuc_data[5],
+                'T_W': nuc_data[6]
             }
-        processed_hdf.append(file)
-        if (check_index >= checkpoint) and save_checkpoints:
-            print('Checkpoint reached, saving...\n')
-            save_hdf(os.path.join(simulation.storage_path,
-                    'masses_energies.h5'),
-                     ['time', 'mass_flux', 'innercore', 'gain_region', 'PNS',
-                      'unbound', 'PNS_core', 'processed'],
-                     [time, mdot, inner_me, gain_me, PNS_me, unb_me, nuc_me,
-                      processed_hdf])
-            
-            check_index = 0
-        check_index += 1
-        progress_index += 1
-        findex += 1
-    print('Computation completed, saving...')
-    save_hdf(os.path.join(simulation.storage_path, 'masses_energies.h5'),
-                    ['time', 'mass_flux', 'innercore', 'gain_region', 'PNS',
-                    'unbound', 'PNS_core', 'processed'],
-                    [time, mdot, inner_me, gain_me, PNS_me, unb_me, nuc_me,
-                     processed_hdf])
-    time, mdot, inner_me, gain_me, PNS_me, unb_me, nuc_me, _ = \
-        read_masses_energies(simulation)
-    return create_series(time, mdot, inner_me, gain_me, PNS_me, unb_me, nuc_me)
+        }
+
+    def series(self):
+        time, mdot, inner_me, gain_me, PNS_me, unb_me, nuc_me, _ = \
+            read_masses_energies(self.simulation)
+        return create_series(time, mdot, inner_me, gain_me, PNS_me, unb_me,
+                             nuc_me)
+
+def calculate_masses_energies(simulation, save_checkpoints=True, no_new=False):
+    reducer = MassEnergyReducer(simulation, save_checkpoints, no_new)
+    sweep(simulation, [reducer])
+    return reducer.series()
 
 def read_masses_energies(simulation):
     masses_energies_data = h5py.File(os.path.join(simulation.storage_path, 
@@ -367,4 +279,5 @@ def read_masses_energies(simulation):
         data.append(masses_energies_data['processed'][...])
     else:
         data.append(None)
+    masses_energies_data.close()
     return data
\ No newline at end of file
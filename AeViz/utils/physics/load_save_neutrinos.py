@@ -1,6 +1,6 @@
 from typing import Literal
 import numpy as np
-from AeViz.utils.utils import progressBar, check_existence, checkpoints
+from AeViz.utils.sweep_utils import Reducer, sweep
 from AeViz.units.aeseries import aerray, aeseries
 from AeViz.units import u
 import h5py, os
@@ -8,79 +8,61 @@ from AeViz.utils.files.file_utils import save_hdf, create_series
 
 FILE_H5 = 'neutrino_luminosity.h5'
 
-def calculate_luminosity(simulation, save_checkpoints=True, rmax=5e7, no_new=False,
-                            **kwargs):
-    if check_existence(simulation, FILE_H5):
-        time, L, processed_hdf, r_lum = read_luminosity(simulation)
-        
-        if processed_hdf[-1].decode("utf-8") == simulation.hdf_file_list[-1] \
-          and r_lum == rmax:
-            return create_series(time, L['nue'], L['nua'], L['nux'])
-        elif processed_hdf[-1].decode("utf-8") != simulation.hdf_file_list[-1] \
-            or no_new:
-            start_point = len(processed_hdf)
-            processed_hdf = [ff.decode("utf-8") for ff in processed_hdf]
-            print('Checkpoint found for neutrino luminosity, starting' \
-                ' from checkpoint.\nPlease wait...')
-        elif r_lum != rmax:
-            start_point = 0
-            processed_hdf = []
-            print(f'Stored luminosity at r = {r_lum:.1e} cm. ' \
-                  f'Recomputing for r = {rmax:.1e} cm.\nPlease wait...')
-
-    else:
-        start_point = 0
-        processed_hdf = []
-        time = 0
-        L = {'nue' : 0.0, 'nua' : 0.0, 'nux' : 0.0}
-        print('No checkpoint found for neutrino luminosity, starting from' \
-            ' the beginning.\nPlease wait...')
-    if (checkpoints[simulation.dim] == False) or (not save_checkpoints):
-        checkpoint = len(simulation.hdf_file_list)
-    else:
-        checkpoint = checkpoints[simulation.dim]
+class LuminosityReducer(Reducer):
+    """
+    Neutrino luminosities of the three flavours at rmax for each
+    timestep, stored in neutrino_luminosity.h5 together with rmax.
+    """
+    save_name = FILE_H5
+    keywords = ['time', 'luminosity']
 
-    rmax *= u.cm
-    idx = np.argmin(simulation.cell.radius(simulation.ghost) < rmax)
-    check_index = 0
-    progress_index = 0
-    total_points = len(simulation.hdf_file_list) - start_point
-    for file in simulation.hdf_file_list[start_point:]:
-      progressBar(progress_index, total_points, suffix='Computing...')
+    def __init__(self, simulation, save_checkpoints=True, rmax=5e7,
+                 no_new=False, **kwargs):
+        self.rmax = rmax
+        self.kwargs = kwargs
+        super().__init__(simulation, save_checkpoints, no_new)
 
-      Lum = simulation.neutrino_luminosity(file, comp='all', **kwargs)
+    def load(self):
+        if not self.exists():
+            print('No checkpoint found for neutrino luminosity, starting ' \
+                  'from the beginning.\nPlease wait...')
+            return
+        time, L, processed_hdf, r_lum = read_luminosity(self.simulation)
+        if r_lum != self.rmax:
+            print(f'Stored luminosity at r = {r_lum:.1e} cm. ' \
+                  f'Recomputing for r = {self.rmax:.1e} cm.\nPlease wait...')
+            return
+        self.data = {'time': time, 'luminosity': L}
+        if self.is_complete(processed_hdf):
+            self.complete = True
+        else:
+            self.resume(processed_hdf, 'neutrino luminosity')
 
-      Lnuetot = np.nanmean(Lum[0][..., idx:idx+1]) * 4.0 * np.pi * rmax * rmax
-      Lnuatot = np.nanmean(Lum[1][..., idx:idx+1]) * 4.0 * np.pi * rmax * rmax
-      Lnuxtot = np.nanmean(Lum[2][..., idx:idx+1]) * 4.0 * np.pi * rmax * rmax
+    def setup(self):
+        self.r_lum = self.rmax * u.cm
+        self.idx = np.argmin(self.simulation.cell.radius(self.simulation.ghost)
+                             < self.r_lum)
 
-      try:
-        time = np.concatenate((time, simulation.time(file)))
-        L = {key: np.concatenate((L[key], Ltot), axis=-1)
-                  for (key, Ltot) in zip(['nue', 'nua', 'nux'],
-                                         [Lnuetot, Lnuatot, Lnuxtot])}
+    def step(self, file, findex):
+        Lum = self.simulation.neutrino_luminosity(
+            file, comp='all', r_range=slice(self.idx, self.idx + 1),
+            **self.kwargs)
+        surface = 4.0 * np.pi * self.r_lum * self.r_lum
+        return {'time': self.simulation.time(file),
+                'luminosity': {key: np.nanmean(Lnu) * surface for (key, Lnu) in
+                               zip(['nue', 'nua', 'nux'], Lum)}}
 
-      except Exception as e:
-        print(e)
-        time = simulation.time(file)
-        L = {key: Ltot for (key, Ltot) in zip(['nue', 'nua', 'nux'],
-                                         [Lnuetot, Lnuatot, Lnuxtot])}
-      processed_hdf.append(file)
-      if (check_index >= checkpoint and save_checkpoints):
-          print('Checkpoint reached, saving...\n')
-          save_hdf(os.path.join(simulation.storage_path, FILE_H5),
-                    ['time', 'luminosity', 'processed', 'rmax'],
-                    [time, L, processed_hdf, rmax])
-          check_index = 0
-      check_index += 1
-      progress_index += 1
-    
-    print('Computation completed, saving...')
-    save_hdf(os.path.join(simulation.storage_path, FILE_H5),
-                ['time', 'luminosity', 'processed', 'rmax'],
-                [time, L, processed_hdf, rmax])
-    print('Done!')
+    def save(self):
+        save_hdf(os.path.join(self.simulation.storage_path, self.save_name),
+                 ['time', 'luminosity', 'processed', 'rmax'],
+                 [self.data['time'], self.data['luminosity'],
+                  self.processed_hdf, self.rmax * u.cm], self.saved_steps)
 
+def calculate_luminosity(simulation, save_checkpoints=True, rmax=5e7,
+                         no_new=False, **kwargs):
+    reducer = LuminosityReducer(simulation, save_checkpoints, rmax, no_new,
+                                **kwargs)
+    sweep(simulation, [reducer])
     time, L, proc, r_lum = read_luminosity(simulation)
     return create_series(time, L['nue'], L['nua'], L['nux'])
     
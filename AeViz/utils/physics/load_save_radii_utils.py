@@ -6,7 +6,7 @@ import numpy as np
 from typing import Literal
 import os, h5py
 from AeViz.utils.math_utils import function_average_radii
-from AeViz.utils.utils import progressBar, check_existence, checkpoints
+from AeViz.utils.sweep_utils import Reducer, sweep
 from AeViz.units.aeseries import aerray, aeseries
 from AeViz.units import u
 from AeViz.utils.files.string_utils import merge_strings
@@ -31,211 +31,160 @@ save_names = {
     'isodensity': 'isodensities_radii.h5'
 }
 
-def calculate_radius(simulation, radius:Literal['PNS', 'innercore', 'gain', 
-                                             'neutrino', 'shock', 'nucleus',
-                                             'isodensity'],
-                     save_checkpoints=True, rmax=None, no_new=False):
+class RadiusReducer(Reducer):
     """
-    Calculates the selected radius for each timestep of the simulation.
+    Selected radius for each timestep of the simulation, together with
+    its maximum, minimum and average value. Radii are computed keeping
+    all the angular ghost cells.
     In case of neutrinos, since in some cases are not saved for each
     timestep, the timestep for which they are not saved is skipped.
-    If the save checkpoint flag is on, every 200 timesteps (for 3D
-    simulations) or 600 timesteps (for 2D simulations) the data is saved
-    in a hdf file.
     Input:
-
+        radius: which radius to compute
+        rmax: maximum radius for the shock detection
+        dependencies: dictionary of the reducers this radius depends on
+                      (the PNS radius for the gain radius). If not
+                      provided they are computed beforehand.
     """
-    if check_existence(simulation, save_names[radius]):
+    keywords = ['time', 'radii', 'max', 'min', 'avg', 'gcells']
+    ghost_cells = {'t_l': 0, 't_r': 0, 'p_l': 0, 'p_r': 0}
+
+    def __init__(self, simulation, radius:Literal['PNS', 'innercore', 'gain',
+                                                  'neutrino', 'shock',
+                                                  'nucleus', 'isodensity'],
+                 save_checkpoints=True, rmax=None, no_new=False,
+                 dependencies=None):
+        self.radius = radius
+        self.save_name = save_names[radius]
+        self.rmax = rmax
+        self.dependencies = {} if dependencies is None else dependencies
+        ## Ghost cells employed for the radii
+        simulation.ghost.update_ghost_cells(**self.ghost_cells)
+        self.ghost_dictionary = {key: list(value) for (key, value) in 
+                        simulation.ghost.return_ghost_dictionary().items()}
+        self.gcells = {}
+        for (key, value) in self.ghost_dictionary.items():
+            self.gcells[key[0]+'_l'] = value[0]
+            self.gcells[key[0]+'_r'] = value[1]
+        simulation.ghost.restore_default()
+        super().__init__(simulation, save_checkpoints, no_new)
+
+    def load(self):
+        if not self.exists():
+            print('No checkpoint found for ' + self.radius + ' radius, ' \
+                  'starting from the beginning.\nPlease wait...')
+            self.data = {'gcells': self.ghost_dictionary}
+            return
         time, full_radius, max_radius, min_radius, avg_radius, ghost_cells, \
-            processed_hdf = \
-            read_radius(simulation, radius)
+            processed_hdf = read_radius(self.simulation, self.radius)
+        self.data = {'time': time, 'radii': full_radius, 'max': max_radius,
+                     'min': min_radius, 'avg': avg_radius,
+                     'gcells': self.ghost_dictionary}
+        self.gcells = ghost_cells
         ## Retrocompatibility option
         if processed_hdf is None:
-            if len(simulation.hdf_file_list) == len(time):
-                save_hdf(os.path.join(simulation.storage_path,
-                                      save_names[radius]),
-                        ['time', 'radii', 'max', 'min', 'avg', 'gcells',
-                         'processed'],
-                        [time, full_radius, max_radius, min_radius, avg_radius,
-                        simulation.ghost.return_ghost_dictionary(),
-                        simulation.hdf_file_list])
-                return create_series(time, full_radius, max_radius,
-                                            min_radius, avg_radius, ghost_cells)
+            if len(self.simulation.hdf_file_list) == len(time):
+                self.processed_hdf = self.simulation.hdf_file_list
+                self.save()
+                self.complete = True
             else:
-                start_point = 0
-                time = 0
-                full_radius = 0
-                max_radius = 0
-                min_radius = 0
-                avg_radius = 0
-                ghost_cells = 0
-                processed_hdf = []
-        elif processed_hdf[-1].decode("utf-8") == simulation.hdf_file_list[-1] \
-            or no_new:
-            return create_series(time, full_radius, max_radius,
-                                        min_radius, avg_radius, ghost_cells)
+                self.data = {'gcells': self.ghost_dictionary}
+        elif self.is_complete(processed_hdf):
+            self.processed_hdf = processed_hdf
+            self.complete = True
         else:
-            start_point = len(processed_hdf)
-            processed_hdf = [ff.decode("utf-8") for ff in processed_hdf]
-            print('Checkpoint found for ' + radius + ' radius, starting' \
-                ' from checkpoint.\nPlease wait...')
-    else:
-        start_point = 0
-        processed_hdf = []
-        print('No checkpoint found for ' + radius + ' radius, starting from' \
-            ' the beginning.\nPlease wait...')
-    if (checkpoints[simulation.dim] == False) or (not save_checkpoints):
-        checkpoint = len(simulation.hdf_file_list)
-    else:
-        checkpoint = checkpoints[simulation.dim]
-    g = 0
-    dOmega = simulation.cell.dOmega(simulation.ghost)
-    simulation.ghost.update_ghost_cells(t_l = g, t_r = g, p_l = g, p_r = g)
-    check_index = 0
-    progress_index = 0
-    total_points = len(simulation.hdf_file_list) - start_point
-    if radius == 'gain':
-        PNS_rad, _ = simulation.PNS_radius(rad='full')
-    for file in simulation.hdf_file_list[start_point:]:
-        progressBar(progress_index, total_points, suffix='Computing...')
-        if radius == 'gain':
-            rad_step = functions[radius](simulation, file,
-                                         PNS_rad.data[..., check_index])   
+            self.resume(processed_hdf, self.radius + ' radius')
+
+    def setup(self):
+        self.dOmega = self.simulation.cell.dOmega(self.simulation.ghost)
+        if self.radius == 'gain' and 'PNS' not in self.dependencies:
+            self.dependencies['PNS'] = radius_dependency(self.simulation, 'PNS')
+
+    def step(self, file, findex):
+        if self.radius == 'gain':
+            rad_step = functions[self.radius](self.simulation, file,
+                                    self.dependencies['PNS'].value_at(findex))
         else:
             try:
-                if rmax is None:
-                    rad_step = functions[radius](simulation, file)
+                if self.rmax is None:
+                    rad_step = functions[self.radius](self.simulation, file)
                 else:
-                    rad_step = functions[radius](simulation, file, rmax)
+                    rad_step = functions[self.radius](self.simulation, file,
+                                                      self.rmax)
             except KeyError:
                 print('Missing dataset in file ' + file + \
                     ', skipping but adding as processed...')
-                check_index += 1
-                progress_index += 1
-                processed_hdf.append(file)
-                continue
+                return None
             except Exception as e:
                 print('Error in file ' + file)
                 raise e
-        if radius == 'neutrino':
-            try:
-                time = np.concatenate((time, simulation.time(file)))
-                full_radius = {key: np.concatenate((full_radius[key], 
-                                                    rad_step[i][..., None]),
-                                                    axis=-1)
-                               for (key, i) in zip(['nue', 'nua', 'nux'],
-                                                   range(3))}
-                nog_rad_step = {key: simulation.ghost.remove_ghost_cells_radii(
-                    rad_step[i], simulation.dim) for (key, i) in
-                    zip(['nue', 'nua', 'nux'], range(3))}
-                max_radius = {key: np.concatenate((max_radius[key],
-                                                   np.nanmax(nog_rad_step[key])))
-                              for key in ['nue', 'nua', 'nux']}
-                min_radius = {key: np.concatenate((min_radius[key], np.nanmin(nog_rad_step[key])))
-                              for key in ['nue', 'nua', 'nux']}
-                avg_radius = {key: np.concatenate((avg_radius[key],
-                                function_average_radii(nog_rad_step[key],
-                                                       simulation.dim, dOmega)))
-                                for key in ['nue', 'nua', 'nux']}
-            except Exception as e:
-                print(e)
-                time = simulation.time(file)
-                full_radius = {key: rad_step[i][..., None] for (key, i) in
-                               zip(['nue', 'nua', 'nux'], range(3))}
-                nog_rad_step = {key: simulation.ghost.remove_ghost_cells_radii(
-                    rad_step[i], simulation.dim) for (key, i) in
-                    zip(['nue', 'nua', 'nux'], range(3))}
-                max_radius = {key: np.nanmax(nog_rad_step[key])
-                              for key in ['nue', 'nua', 'nux']}
-                min_radius = {key: np.nanmin(nog_rad_step[key])
-                              for key in ['nue', 'nua', 'nux']}
-                avg_radius = {key: function_average_radii(
-                                    nog_rad_step[key], simulation.dim,
-                                    dOmega) for key in
-                                ['nue', 'nua', 'nux']}
-        elif radius == 'isodensity':
-            try:
-                time = np.concatenate((time, simulation.time(file)))
-                full_radius = {key: np.concatenate((full_radius[key], 
-                                                    rad_step[key][..., None]),
-                                                    axis=-1)
-                               for key in rad_step.keys()}
-                nog_rad_step = {key: simulation.ghost.remove_ghost_cells_radii(
-                    rad_step[key], simulation.dim) for key in rad_step.keys()}
-                max_radius = {key: np.concatenate((max_radius[key],
-                                                   np.nanmax(nog_rad_step[key])))
-                              for key in nog_rad_step.keys()}
-                min_radius = {key: np.concatenate((min_radius[key], np.nanmin(nog_rad_step[key])))
-                              for key in nog_rad_step.keys()}
-                avg_radius = {key: np.concatenate((avg_radius[key],
-                                function_average_radii(nog_rad_step[key],
-                                                       simulation.dim, dOmega)))
-                                for key in nog_rad_step.keys()}
-            except Exception as e:
-                print(e)
-                time = simulation.time(file)
-                full_radius = {key: rad_step[key][..., None] for key in 
-                               rad_step.keys()}
-                nog_rad_step = {key: simulation.ghost.remove_ghost_cells_radii(
-                    rad_step[key], simulation.dim) for key in rad_step.keys()}
-                max_radius = {key: np.nanmax(nog_rad_step[key])
-                              for key in nog_rad_step.keys()}
-                min_radius = {key: np.nanmin(nog_rad_step[key])
-                              for key in nog_rad_step.keys()}
-                avg_radius = {key: function_average_radii(nog_rad_step[key],
-                                                          simulation.dim,
-                                                          dOmega)
-                              for key in nog_rad_step.keys()}
-        else:
-            nog_rad_step = simulation.ghost.remove_ghost_cells_radii(rad_step,
-                                                               simulation.dim)
-            max_rad_step = np.nanmax(nog_rad_step)
-            min_rad_step = np.nanmin(nog_rad_step)
-            avg_rad_step = function_average_radii(nog_rad_step, 
-                                                simulation.dim, dOmega)
-            try:
-                time = np.concatenate((time, simulation.time(file)))
-                full_radius = np.concatenate((full_radius,
-                                            rad_step[..., None]),
-                                            axis=-1)
-                max_radius = np.concatenate((max_radius, max_rad_step))
-                min_radius = np.concatenate((min_radius, min_rad_step))
-                avg_radius = np.concatenate((avg_radius, avg_rad_step))
-            except Exception as e:
-                print(e)
-                time = simulation.time(file)
-                full_radius = rad_step[..., None]
-                max_radius = max_rad_step
-                min_radius = min_rad_step
-                avg_radius = avg_rad_step
-        processed_hdf.append(file)
-        if (check_index >= checkpoint and save_checkpoints):
-            print('Checkpoint reached, saving...\n')
-            save_hdf(os.path.join(simulation.storage_path, save_names[radius]),
-                     ['time', 'radii', 'max', 'min', 'avg', 'gcells',
-                      'processed'],
-                     [time, full_radius, max_radius, min_radius, avg_radius,
-                      simulation.ghost.return_ghost_dictionary(),
-                      processed_hdf])
-            check_index = 0
-        check_index += 1
-        progress_index += 1
-    print('Computation completed, saving...')
-    save_hdf(os.path.join(simulation.storage_path, save_names[radius]),
-                ['time', 'radii', 'max', 'min', 'avg', 'gcells', 'processed'],
-                [time, full_radius, max_radius, min_radius, avg_radius,
-                simulation.ghost.return_ghost_dictionary(), processed_hdf])
-    print('Done!')
-    ## Unpack the ghost cells
-    out_gcells = {}
-    for key in simulation.ghost.return_ghost_dictionary().keys():
-        out_gcells[key[0]+'_l'] = simulation.ghost.return_ghost_dictionary()[key][0]
-        out_gcells[key[0]+'_r'] = simulation.ghost.return_ghost_dictionary()[key][1]
-    simulation.ghost.restore_default()
-    time, full_radius, max_radius, min_radius, avg_radius, ghost_cells, \
-            _ = read_radius(simulation, radius)
-    return create_series(time, full_radius, max_radius, min_radius,
-                                avg_radius, out_gcells)
+        if self.radius == 'neutrino':
+            rad_step = {key: rad_step[i] for (key, i) in
+                        zip(['nue', 'nua', 'nux'], range(3))}
+        if type(rad_step) == dict:
+            nog_rad_step = {key: self.simulation.ghost.remove_ghost_cells_radii(
+                rad_step[key], self.simulation.dim) for key in rad_step.keys()}
+            return {
+                'time': self.simulation.time(file),
+                'radii': {key: rad_step[key][..., None] for key in
+                          rad_step.keys()},
+                'max': {key: np.nanmax(nog_rad_step[key]) for key in
+                        nog_rad_step.keys()},
+                'min': {key: np.nanmin(nog_rad_step[key]) for key in
+                        nog_rad_step.keys()},
+                'avg': {key: function_average_radii(nog_rad_step[key],
+                                                    self.simulation.dim,
+                                                    self.dOmega)
+                        for key in nog_rad_step.keys()}
+            }
+        nog_rad_step = self.simulation.ghost.remove_ghost_cells_radii(rad_step,
+                                                        self.simulation.dim)
+        return {
+            'time': self.simulation.time(file),
+            'radii': rad_step[..., None],
+            'max': np.nanmax(nog_rad_step),
+            'min': np.nanmin(nog_rad_step),
+            'avg': function_average_radii(nog_rad_step, self.simulation.dim,
+                                          self.dOmega)
+        }
+
+    def select(self, data, index, key=None):
+        if key is None:
+            return data['radii'][..., index]
+        return data['radii'][key][..., index]
+
+    def series(self):
+        time, full_radius, max_radius, min_radius, avg_radius, ghost_cells, \
+            _ = read_radius(self.simulation, self.radius)
+        return create_series(time, full_radius, max_radius, min_radius,
+                             avg_radius, ghost_cells)
+
+def radius_dependency(simulation, radius, save_checkpoints=True):
+    """
+    Returns the reducer of an already computed radius, computing it
+    first if needed.
+    """
+    calculate_radius(simulation, radius, save_checkpoints,
+                     no_new=simulation.no_new)
+    return RadiusReducer(simulation, radius, save_checkpoints, no_new=True)
+
+def calculate_radius(simulation, radius:Literal['PNS', 'innercore', 'gain', 
+                                             'neutrino', 'shock', 'nucleus',
+                                             'isodensity'],
+                     save_checkpoints=True, rmax=None, no_new=False):
+    """
+    Calculates the selected radius for each timestep of the simulation.
+    In case of neutrinos, since in some cases are not saved for each
+    timestep, the timestep for which they are not saved is skipped.
+    If the save checkpoint flag is on, every 20 timesteps (for 3D
+    simulations) or 400 timesteps (for 2D simulations) the data is saved
+    in a hdf file.
+    Input:
+
+    """
+    reducer = RadiusReducer(simulation, radius, save_checkpoints, rmax,
+                            no_new)
+    sweep(simulation, [reducer])
+    return reducer.series()
    
 def read_radius(simulation,
                 radius:Literal['PNS', 'innercore', 'gain',
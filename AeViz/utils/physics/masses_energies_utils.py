@@ -133,14 +133,14 @@ def mass_flux(simulation, file_name, dOmega, radius_index):
     """
     Callulates the flow of matter at the index
     """
+    shell = slice(radius_index, radius_index + 1)
+    flux = simulation.radial_velocity(file_name, r_range=shell) * \
+        simulation.rho(file_name, r_range=shell)
     if simulation.dim == 1:
         return -(4 * np.pi * \
                 simulation.cell.radius(simulation.ghost)[radius_index] ** 2 * \
-                np.sum(simulation.radial_velocity(file_name)[radius_index] * \
-                simulation.rho(file_name)[radius_index])).to(u.M_sun/u.s)
+                np.sum(flux)).to(u.M_sun/u.s)
     
     return  -(
         simulation.cell.radius(simulation.ghost)[radius_index] ** 2 * \
-            np.sum(dOmega *\
-                simulation.radial_velocity(file_name)[..., radius_index] * \
-            simulation.rho(file_name)[..., radius_index])).to(u.M_sun/u.s)
\ No newline at end of file
+            np.sum(dOmega * flux)).to(u.M_sun/u.s)
\ No newline at end of file
@@ -1,8 +1,8 @@
 import numpy as np
 from AeViz.utils.math_utils import function_average
 import os, h5py
-from AeViz.utils.utils import check_existence, progressBar, checkpoints
-from AeViz.utils.files.file_utils import save_hdf
+from AeViz.utils.utils import check_existence, progressBar
+from AeViz.utils.sweep_utils import Reducer, Accumulator, sweep
 from AeViz.units.aeseries import aerray, aeseries
 from AeViz.units import u
 from AeViz.utils.files.string_utils import merge_strings
@@ -57,10 +57,11 @@ def read_profile(simulation, profile, save_checkpoints):
             return make_series(t, simulation.cell.radius(simulation.ghost), pr,
                                profile)
         else:
-            derive_profiles(simulation, data, save_checkpoints)
+            data.close()
+            derive_profiles(simulation, save_checkpoints)
             return read_profile(simulation, profile, save_checkpoints)
     else:
-        derive_profiles(simulation, None, save_checkpoints)
+        derive_profiles(simulation, save_checkpoints)
         return read_profile(simulation, profile, save_checkpoints)
 
 def read_velocity_profile(simulation, profile, rms, save_checkpoints):
@@ -79,10 +80,12 @@ def read_velocity_profile(simulation, profile, rms, save_checkpoints):
             return make_velocity_series(t, simulation.cell.radius(simulation.ghost), pr,
                                profile, rms)
         else:
-            derive_velocity_profiles(simulation, data, save_checkpoints)
-            return read_velocity_profile(simulation, profile, rms, save_checkpoints)
+            data.close()
+            derive_velocity_profiles(simulation, save_checkpoints)
+            return read_velocity_profile(simulation, profile, rms,
+                                         save_checkpoints)
     else:
-        derive_velocity_profiles(simulation, None, save_checkpoints)
+        derive_velocity_profiles(simulation, save_checkpoints)
         return read_velocity_profile(simulation, profile, rms, save_checkpoints)
 
 def derive_profile(simulation, profile, **kwargs):
@@ -106,47 +109,32 @@ def derive_profile(simulation, profile, **kwargs):
         lb = merge_strings(r'$\sqrt{\langle ($', lb, r'$)^2\rangle_\Omega}$')
     else:
         lb = merge_strings(r'$\langle $', lb, r'$\rangle_\Omega$')
+    results = Accumulator(size=len(simulation.hdf_file_list))
     for (file, progress) in zip(simulation.hdf_file_list,
                          range(len(simulation.hdf_file_list))):
-        try:
-            time = np.concatenate((time, simulation.time(file)))
-            qt_local = qt(file, **kwargs)
-            if qt_local.shape[-1] != radius:
-                qt_av = np.zeros((radius, qt_local.shape[-1]))
-                for i in range(qt_local.shape[-1]):
-                    if kwargs['rms']:
-                        qt_av[:, i] = np.sqrt(function_average(qt_local[..., i] ** 2, 
-                                                   simulation.dim, 'Omega',
-                                                   dOmega))
-                    else:
-                        qt_av[:, i] = function_average(qt_local[..., i], 
-                                                   simulation.dim, 'Omega',
-                                                   dOmega)
-            else:
+        qt_local = qt(file, **kwargs)
+        if qt_local.shape[-1] != radius:
+            qt_av = np.zeros((radius, qt_local.shape[-1]))
+            for i in range(qt_local.shape[-1]):
                 if kwargs['rms']:
-                    qt_av = np.sqrt(function_average(qt(file, **kwargs) ** 2,
-                                             simulation.dim, 'Omega',
-                                             dOmega))
+                    qt_av[:, i] = np.sqrt(function_average(
+                        qt_local[..., i] ** 2, simulation.dim, 'Omega',
+                        dOmega))
                 else:
-                    qt_av = function_average(qt(file, **kwargs),
-                                             simulation.dim, 'Omega',
-                                             dOmega)
-            profiles = np.concatenate((profiles, qt_av[..., None]), axis=-1)
-        except:
-            time = simulation.time(file)
-            qt_local = qt(file, **kwargs)
-            if qt_local.shape[-1] != radius:
-                qt_av = np.zeros((radius, qt_local.shape[-1]))
-                for i in range(qt_local.shape[-1]):
-                    qt_av[:, i] = function_average(qt_local[..., i], 
+                    qt_av[:, i] = function_average(qt_local[..., i],
                                                    simulation.dim, 'Omega',
                                                    dOmega)
-            else:                                     
-                qt_av = function_average(qt(file, **kwargs), simulation.dim, 'Omega',
-                                            dOmega)
-            profiles = qt_av[..., None]
+        elif kwargs['rms']:
+            qt_av = np.sqrt(function_average(qt_local ** 2, simulation.dim,
+                                             'Omega', dOmega))
+        else:
+            qt_av = function_average(qt_local, simulation.dim, 'Omega',
+                                     dOmega)
+        results.append({'time': simulation.time(file),
+                        'profiles': qt_av[..., None]})
         progressBar(progress, len(simulation.hdf_file_list),
                     'Calculating profile')
+    time, profiles = results.view()['time'], results.view()['profiles']
     if profiles.ndim == 3:
         profiles = profiles.swapaxes(-2, -1)
     profiles.set(name=nm, label=lb, limits=lm, cmap=cm, log=lg)
@@ -155,52 +143,51 @@ def derive_profile(simulation, profile, **kwargs):
     return aeseries(profiles, time=time,
                     radius=simulation.cell.radius(simulation.ghost)) 
 
-def derive_profiles(simulation, data, save_checkpoints):
+class ProfilesReducer(Reducer):
     """
-    Calculates and saves the pressure, temperature, Ye, entropy, 
-    density, Rossby number, BV frequency, and convective flux radial
-    profiles in an hdf file.
+    Angle averaged pressure, temperature, Ye, entropy, density, Rossby
+    number, BV frequency, and convective flux radial profiles for each
+    timestep of the simulation.
     """
-    if data is None:
-        start_point = 0
-        processed_hdf = []
-    else:
-        time = data['time'][...] * u.s
-        start_point = len(data['processed'][...])
-        processed_hdf = [ff.decode("utf-8") for ff in data['processed'][...]]
-        print('Checkpoint found. Starting from timestep', start_point)
-        profiles = {'BV_frequency': data['profiles/BV_frequency'][...] * u.s ** (-2),
-                    'Rossby_number': data['profiles/Rossby_number'][...] * \
+    save_name = 'profiles.h5'
+    keywords = ['time', 'profiles']
+
+    def load(self):
+        if not self.exists():
+            return
+        data = h5py.File(os.path.join(self.simulation.storage_path,
+                                      self.save_name), 'r')
+        if 'processed' not in data.keys():
+            data.close()
+            return
+        processed_hdf = data['processed'][...]
+        self.data = {
+            'time': data['time'][...] * u.s,
+            'profiles': {
+                'BV_frequency': data['profiles/BV_frequency'][...] * \
+                    u.s ** (-2),
+                'Rossby_number': data['profiles/Rossby_number'][...] * \
                     u.dimensionless_unscaled,
-                    'Ye': data['profiles/Ye'][...] * u.dimensionless_unscaled,
-                    'temperature': data['profiles/temperature'][...] * u.MeV,
-                    'rho': data['profiles/rho'][...] * u.g / u.cm ** 3,
-                    'entropy': data['profiles/entropy'][...] * u.kBol / u.bry,
-                    'convective_flux': data['profiles/convective_flux'][...] * \
+                'Ye': data['profiles/Ye'][...] * u.dimensionless_unscaled,
+                'temperature': data['profiles/temperature'][...] * u.MeV,
+                'rho': data['profiles/rho'][...] * u.g / u.cm ** 3,
+                'entropy': data['profiles/entropy'][...] * u.kBol / u.bry,
+                'convective_flux': data['profiles/convective_flux'][...] * \
                     u.erg / u.s / u.cm ** 2,
-                    'gas_pressure': data['profiles/gas_pressure'][...] * u.Ba}
+                'gas_pressure': data['profiles/gas_pressure'][...] * u.Ba
+            }
+        }
         data.close()
-    
-    if (checkpoints[simulation.dim] == False) or (not save_checkpoints):
-        checkpoint = len(simulation.hdf_file_list)
-    else:
-        checkpoint = checkpoints[simulation.dim]
-    dOmega = simulation.cell.dOmega(simulation.ghost)
-    checkpoint_index = 0
-    progress_index = 0
-    total_points = len(simulation.hdf_file_list) - start_point
-    for file in simulation.hdf_file_list[start_point:]:
-        t_file = simulation.time(file, True)
-        T_av = function_average(simulation.temperature(file), simulation.dim,
-                                'Omega', dOmega)[..., None]
-        rho_av = function_average(simulation.rho(file), simulation.dim,
-                                  'Omega', dOmega)[..., None]
-        S_av = function_average(simulation.entropy(file), simulation.dim,
-                                'Omega', dOmega)[..., None]
-        P_av = function_average(simulation.gas_pressure(file), simulation.dim,
-                                'Omega', dOmega)[..., None]
-        Ye_av = function_average(simulation.Ye(file), simulation.dim, 'Omega',
-                                 dOmega)[..., None]
+        if self.is_complete(processed_hdf):
+            self.complete = True
+        else:
+            self.resume(processed_hdf, 'the profiles')
+
+    def setup(self):
+        self.dOmega = self.simulation.cell.dOmega(self.simulation.ghost)
+
+    def step(self, file, findex):
+        simulation, dOmega = self.simulation, self.dOmega
         BV_av = function_average(simulation.BV_frequency(file), simulation.dim,
                                  'Omega', dOmega)[..., None]
         if simulation.dim == 1:
@@ -210,88 +197,72 @@ def derive_profiles(simulation, data, save_checkpoints):
             Ro_av = function_average(simulation.Rossby_number(file), 
                                     simulation.dim, 'Omega', dOmega)[..., None]
             Fc_av = simulation.convective_flux(file)[..., None]
-        
-
-        try:
-            time = np.concatenate((time, t_file))
-            profiles = {
-                'BV_frequency': np.concatenate((profiles['BV_frequency'],
-                                                BV_av), axis=-1),
-                'Rossby_number': np.concatenate((profiles['Rossby_number'],
-                                                 Ro_av), axis=-1),
-                'Ye': np.concatenate((profiles['Ye'], Ye_av), axis=-1),
-                'temperature': np.concatenate((profiles['temperature'],
-                                               T_av), axis=-1),
-                'rho': np.concatenate((profiles['rho'], rho_av), axis=-1),
-                'entropy': np.concatenate((profiles['entropy'], S_av),
-                                          axis=-1),
-                'convective_flux': np.concatenate((profiles['convective_flux'],
-                                                    Fc_av), axis=-1),
-                'gas_pressure': np.concatenate((profiles['gas_pressure'],
-                                                    P_av), axis=-1)
-            }
-        except Exception as e:
-            print(e)
-            time = t_file
-            profiles = {
+        return {
+            'time': simulation.time(file, True),
+            'profiles': {
                 'BV_frequency': BV_av,
                 'Rossby_number': Ro_av,
-                'Ye': Ye_av,
-                'temperature': T_av,
-                'rho': rho_av,
-                'entropy': S_av,
+                'Ye': function_average(simulation.Ye(file), simulation.dim,
+                                       'Omega', dOmega)[..., None],
+                'temperature': function_average(simulation.temperature(file),
+                                                simulation.dim, 'Omega',
+                                                dOmega)[..., None],
+                'rho': function_average(simulation.rho(file), simulation.dim,
+                                        'Omega', dOmega)[..., None],
+                'entropy': function_average(simulation.entropy(file),
+                                            simulation.dim, 'Omega',
+                                            dOmega)[..., None],
                 'convective_flux': Fc_av,
-                'gas_pressure': P_av
+                'gas_pressure': function_average(simulation.gas_pressure(file),
+                                                 simulation.dim, 'Omega',
+                                                 dOmega)[..., None]
             }
-        processed_hdf.append(file)
-        if checkpoint_index >= checkpoint:
-            checkpoint_index = 0
-            print('Saving checkpoint...')
-            save_hdf(os.path.join(simulation.storage_path, 'profiles.h5'),
-                     ['time', 'profiles', 'processed'],
-                     [time, profiles, processed_hdf])
-        
-        progressBar(progress_index, total_points, 'Calculating profiles...')
-        progress_index += 1
-        checkpoint_index += 1
-    save_hdf(os.path.join(simulation.storage_path, 'profiles.h5'),
-             ['time', 'profiles', 'processed'],  [time, profiles,
-                                                  processed_hdf])
-    print('Profiles saved.')
+        }
 
-def derive_velocity_profiles(simulation, data, save_checkpoints):
+class VelocityProfilesReducer(Reducer):
     """
-    Calculates and saves the velocity and their rms radial
-    profiles in an hdf file.
+    Angle averaged velocities and their rms radial profiles for each
+    timestep of the simulation.
     """
-    if data is None:
-        start_point = 0
-        processed_hdf = []
-    else:
-        time = data['time'][...] * u.s
-        start_point = len(data['processed'][...])
-        processed_hdf = [ff.decode("utf-8") for ff in data['processed'][...]]
-        print('Checkpoint found. Starting from timestep', start_point)
-        profiles = {'radial_velocity': data['profiles/radial_velocity'][...] * u.cm / u.s,
-                    'radial_velocity_rms': data['profiles/radial_velocity_rms'][...] * u.cm / u.s,
-                    'theta_velocity': data['profiles/theta_velocity'][...] * u.cm / u.s,
-                    'theta_velocity_rms': data['profiles/theta_velocity_rms'][...] * u.cm / u.s,
-                    'phi_velocity': data['profiles/phi_velocity'][...] * u.cm / u.s,
-                    'phi_velocity_rms': data['profiles/phi_velocity_rms'][...] * u.cm / u.s,
-                    'omega': data['profiles/omega'][...] * 1 / u.s,
-                    'omega_rms': data['profiles/omega_rms'][...] * 1 / u.s,
-                    }
+    save_name = 'velocity_profiles.h5'
+    keywords = ['time', 'profiles']
+
+    def load(self):
+        if not self.exists():
+            return
+        data = h5py.File(os.path.join(self.simulation.storage_path,
+                                      self.save_name), 'r')
+        processed_hdf = data['processed'][...]
+        self.data = {
+            'time': data['time'][...] * u.s,
+            'profiles': {
+                'radial_velocity': data['profiles/radial_velocity'][...] * \
+                    u.cm / u.s,
+                'radial_velocity_rms': \
+                    data['profiles/radial_velocity_rms'][...] * u.cm / u.s,
+                'theta_velocity': data['profiles/theta_velocity'][...] * \
+                    u.cm / u.s,
+                'theta_velocity_rms': \
+                    data['profiles/theta_velocity_rms'][...] * u.cm / u.s,
+                'phi_velocity': data['profiles/phi_velocity'][...] * \
+                    u.cm / u.s,
+                'phi_velocity_rms': data['profiles/phi_velocity_rms'][...] * \
+                    u.cm / u.s,
+                'omega': data['profiles/omega'][...] * 1 / u.s,
+                'omega_rms': data['profiles/omega_rms'][...] * 1 / u.s,
+            }
+        }
         data.close()
-    if (checkpoints[simulation.dim] == False) or (not save_checkpoints):
-        checkpoint = len(simulation.hdf_file_list)
-    else:
-        checkpoint = checkpoints[simulation.dim]
-    dOmega = simulation.cell.dOmega(simulation.ghost)
-    checkpoint_index = 0
-    progress_index = 0
-    total_points = len(simulation.hdf_file_list) - start_point
-    for file in simulation.hdf_file_list[start_point:]:
-        t_loc = simulation.time(file, True)
+        if self.is_complete(processed_hdf):
+            self.complete = True
+        else:
+            self.resume(processed_hdf, 'the velocity profiles')
+
+    def setup(self):
+        self.dOmega = self.simulation.cell.dOmega(self.simulation.ghost)
+
+    def step(self, file, findex):
+        simulation, dOmega = self.simulation, self.dOmega
         vr_av = function_average(simulation.radial_velocity(file),
                                  simulation.dim, 'Omega', dOmega)[..., None]
         if simulation.dim > 1:
@@ -323,31 +294,12 @@ def derive_velocity_profiles(simulation, data, save_checkpoints):
             vth_av = np.zeros(vr_av.shape)
             vth_rms_av = np.zeros(vr_av.shape)
             vph_av = np.zeros(vr_av.shape)
-            vth_rms_av = np.zeros(vr_av.shape)
+            vph_rms_av = np.zeros(vr_av.shape)
             omg_av = np.zeros(vr_av.shape)
             omg_rms_av = np.zeros(vr_av.shape)
-        try:
-            time = np.concatenate((time, t_loc))
-            profiles = {
-                'radial_velocity': np.concatenate((profiles['radial_velocity'],
-                                                vr_av), axis=-1),
-                'radial_velocity_rms': np.concatenate((profiles['radial_velocity_rms'],
-                                                 vr_rms_av), axis=-1),
-                'theta_velocity': np.concatenate((profiles['theta_velocity'], vth_av), axis=-1),
-                'theta_velocity_rms': np.concatenate((profiles['theta_velocity_rms'],
-                                               vth_rms_av), axis=-1),
-                'phi_velocity': np.concatenate((profiles['phi_velocity'], vph_av), axis=-1),
-                'phi_velocity_rms': np.concatenate((profiles['phi_velocity_rms'], vph_rms_av),
-                                          axis=-1),
-                'omega': np.concatenate((profiles['omega'], omg_av),
-                                          axis=-1),
-                'omega_rms': np.concatenate((profiles['omega_rms'], omg_rms_av),
-                                          axis=-1),
-            }
-        except Exception as e:
-            print(e)
-            time = t_loc
-            profiles = {
+        return {
+            'time': simulation.time(file, True),
+            'profiles': {
                 'radial_velocity': vr_av,
                 'radial_velocity_rms': vr_rms_av,
                 'theta_velocity': vth_av,
@@ -357,19 +309,25 @@ def derive_velocity_profiles(simulation, data, save_checkpoints):
                 'omega': omg_av,
                 'omega_rms': omg_rms_av
             }
-        processed_hdf.append(file)
-        if checkpoint_index >= checkpoint:
-            checkpoint_index = 0
-            print('Saving checkpoint...')
-            save_hdf(os.path.join(simulation.storage_path, 'velocity_profiles.h5'),
-                     ['time', 'profiles', 'processed'],
-                     [time, profiles, processed_hdf])
-        progressBar(progress_index, total_points, 'Calculating velocity profiles...')
-        progress_index += 1
-        checkpoint_index += 1
-    save_hdf(os.path.join(simulation.storage_path, 'velocity_profiles.h5'),
-             ['time', 'profiles', 'processed'],  [time, profiles,
-                                                  processed_hdf])
+        }
+
+def derive_profiles(simulation, save_checkpoints):
+    """
+    Calculates and saves the pressure, temperature, Ye, entropy, 
+    density, Rossby number, BV frequency, and convective flux radial
+    profiles in an hdf file.
+    """
+    sweep(simulation, [ProfilesReducer(simulation, save_checkpoints)],
+          'Calculating profiles...')
+    print('Profiles saved.')
+
+def derive_velocity_profiles(simulation, save_checkpoints):
+    """
+    Calculates and saves the velocity and their rms radial
+    profiles in an hdf file.
+    """
+    sweep(simulation, [VelocityProfilesReducer(simulation, save_checkpoints)],
+          'Calculating velocity profiles...')
     print('Velocity profiles saved.')
 
 def make_series(time, radius, prof, name):
@@ -95,7 +95,7 @@ def PNS_nucleus(simulation, file_name):
     """
     radius = simulation.cell.radius(simulation.ghost)
     R_30Km_index = np.argmax(radius >= (30 * u.km))
-    s = simulation.entropy(file_name)[..., :R_30Km_index]
+    s = simulation.entropy(file_name, r_range=slice(0, R_30Km_index))
     S4Kb = np.argmax(s >= (4 * u.kBol / u.bry), axis=-1)
     return radius[S4Kb]
 
@@ -132,35 +132,37 @@ def shock_radius_1D(simulation, file_name, rmax):
     vr = simulation.radial_velocity(file_name)
     s = simulation.entropy(file_name)
     p = simulation.gas_pressure(file_name)
-    dS = IDL_derivative(r, s) * r / s
-    dvr = IDL_derivative(r, vr) * r / np.abs(vr)
-    dP = IDL_derivative(r, p) * r / p
-    for ir in range(len(dS) - 1):
-        if r[ir] > rmax:
-            continue
-        if dS[ir] < -7.5 and np.any(dvr[ir-5:ir+6] < -20) \
-            and dP[ir] < -10:
-            return r[ir]
-    return 0.0 * r.unit
+    dS = (IDL_derivative(r, s) * r / s).value
+    dvr = (IDL_derivative(r, vr) * r / np.abs(vr)).value
+    dP = (IDL_derivative(r, p) * r / p).value
+    n = len(dS)
+    ir = np.arange(n - 1)
+    ## Window dvr[ir-5:ir+6], negative starts wrap around as in slices
+    start = np.clip(np.where(ir - 5 < 0, ir - 5 + n, ir - 5), 0, n)
+    shock = (dS[:-1] < -7.5) & (dP[:-1] < -10) & \
+        window_any(dvr < -20, start, np.minimum(ir + 6, n)) & \
+        ~np.asarray(r[:-1] > rmax)
+    if not shock.any():
+        return 0.0 * r.unit
+    return r[np.argmax(shock)]
 
 def shock_radius_2D(simulation, file_name, rmax):
     vr = simulation.radial_velocity(file_name)
     r = simulation.cell.radius(simulation.ghost)
     p = simulation.gas_pressure(file_name)
-    dP = IDL_derivative(r, p) * r / p
-    dvr = IDL_derivative(r, vr) * r / np.abs(vr)
-    s = simulation.entropy(file_name)
-    shock_r = np.empty(dP.shape[0])
-    shock_r.fill(np.nan)
-    for it in range(dP.shape[0]):
-        for ir in reversed(range(dP.shape[1] - 1)):
-            if r[ir] > rmax:
-                continue
-            if (dP[it, ir] < -10) and \
-                (np.any(dvr[it, max(0,ir-5):min(ir+6, dP.shape[1]-1)] < -20)) \
-                and (np.abs(vr[it, ir]) > 1e8) and s[it, ir] < 400 :
-                shock_r[it] = r[ir]
-                break
+    dP = (IDL_derivative(r, p) * r / p).value
+    dvr = (IDL_derivative(r, vr) * r / np.abs(vr)).value
+    s = simulation.entropy(file_name).value
+    vr = vr.value
+    n = dP.shape[1]
+    ir = np.arange(n - 1)
+    shock = (dP[:, :-1] < -10) & (np.abs(vr[:, :-1]) > 1e8) & \
+        (s[:, :-1] < 400) & \
+        window_any(dvr < -20, np.maximum(0, ir - 5), np.minimum(ir + 6, n - 1)) \
+        & ~np.asarray(r[:-1] > rmax)
+    ## Outermost cell satisfying the conditions
+    index = n - 2 - np.argmax(shock[:, ::-1], axis=-1)
+    shock_r = np.where(shock.any(axis=-1), r.value[index], np.nan)
     ## COPY over the gcells
     if np.isnan(shock_r).all():
         return np.zeros(dP.shape[0]) * r.unit
@@ -174,25 +176,30 @@ def shock_radius_3D(simulation, file_name, rmax):
     p = simulation.gas_pressure(file_name)
     vr = simulation.radial_velocity(file_name)
     entr = simulation.entropy(file_name)
-    dP = IDL_derivative(r, p) * np.abs(r / p)
-    dvr = IDL_derivative(r, vr) * r / np.abs(simulation.soundspeed(file_name))
-    ds = IDL_derivative(r, entr) * np.abs(r / entr)
-    shock_r = np.empty((dP.shape[0], dP.shape[1]))
-    shock_r.fill(np.nan)
-    for ip in range(dP.shape[0]):
-        for it in range(dP.shape[1]):
-            for ir in range(dP.shape[2] - 1):
-                if r[ir] > rmax:
-                    continue
-                if (ds[ip, it, ir] < -0.15) and \
-                    (vr[ip, it, ir] >= 1) and \
-                    (dvr[ip, it, ir] <= -0.7) and \
-                    (dP[ip, it, ir] <= -0.7) and \
-                    (vr[ip, it, max(0, ir-10)] >= vr[ip, it, min(vr.shape[2],
-                                                                 ir+10)]):
-                    shock_r[ip, it] = r[ir]
-                    break
+    dP = (IDL_derivative(r, p) * np.abs(r / p)).value
+    dvr = (IDL_derivative(r, vr) * r / \
+        np.abs(simulation.soundspeed(file_name))).value
+    ds = (IDL_derivative(r, entr) * np.abs(r / entr)).value
+    vr = vr.value
+    n = dP.shape[2]
+    ir = np.arange(n - 1)
+    shock = (ds[..., :-1] < -0.15) & (vr[..., :-1] >= 1) & \
+        (dvr[..., :-1] <= -0.7) & (dP[..., :-1] <= -0.7) & \
+        (vr[..., np.maximum(0, ir - 10)] >= vr[..., np.minimum(n - 1, ir + 10)]) \
+        & ~np.asarray(r[:-1] > rmax)
+    ## Innermost cell satisfying the conditions
+    shock_r = np.where(shock.any(axis=-1), r.value[np.argmax(shock, axis=-1)],
+                       np.nan)
     return shock_r * r.unit
+
+def window_any(mask, start, stop):
+    """
+    For each index i along the last axis, whether mask is True
+    anywhere in the window [start[i], stop[i]).
+    """
+    counts = np.zeros(mask.shape[:-1] + (mask.shape[-1] + 1,), dtype=int)
+    np.cumsum(mask, axis=-1, out=counts[..., 1:])
+    return (stop > start) & (counts[..., stop] - counts[..., start] > 0)
     
 def shock_radius_3D_OLD(simulation, file_name):
     dP = IDL_derivative(simulation.cell.radius(simulation.ghost),
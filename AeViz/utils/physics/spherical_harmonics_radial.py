@@ -1,8 +1,8 @@
 from AeViz.spherical_harmonics.spherical_harmonics import SphericalHarmonics
 import numpy as np
 import scipy.special as sp
-from AeViz.utils.utils import (check_existence, progressBar, checkpoints)
 from AeViz.utils.files.file_utils import save_hdf
+from AeViz.utils.sweep_utils import Reducer, sweep
 import os, h5py
 from AeViz.units import u
 from typing import Literal
@@ -11,100 +11,77 @@ from AeViz.units import aerray, aeseries
 def Harmonics_decomposition_rho(simulation, file_name, theta, phi, dOmega, SpH,
                                 lmax = 4):
     rho = simulation.rho(file_name)
-    out_array = np.zeros((int(sp.factorial(lmax)) + 1, rho.shape[-1]))
-    harm_index = 0
-    for l in range( lmax + 1 ):
-        for m in range( -l, l + 1 ):
-            Ylm = SpH.Ylm_norm(m, l, theta, phi)
-            out_array[harm_index, :] = np.sum( rho * Ylm[..., None] * dOmega[..., None],
-                                        axis=tuple(range(simulation.dim-1)) )
-            harm_index += 1
-    return out_array
+    return SpH.project(rho, lmax, theta, phi, dOmega)
 
 def Harmonics_decomposition_rho_msum(simulation, file_name, theta, phi, dOmega,
                                      SpH, lmax = 40):
     rho = simulation.rho(file_name)
-    out_array = np.zeros((lmax+1, rho.shape[-1]))
-    harm_index = 0
-    for l in range( lmax + 1 ):
-        for m in range( -l, l + 1 ):
-            Ylm = SpH.Ylm_norm(m, l, theta, phi)
-            out_array[harm_index, :] += np.sum( rho * Ylm[..., None] * dOmega[..., None],
-                                        axis=tuple(range(simulation.dim-1)) )
-        harm_index += 1
-    return out_array
+    return SpH.project(rho, lmax, theta, phi, dOmega, msum=True)
    
-def calculate_rho_decomposition(simulation, save_checkpoints=True, msum=False,
-                                no_new=False):
-    if msum:
-        lmax = 40
-        fname = 'rho_decomposition_SpH_msum.h5'
-    else:
-        lmax = 4
-        fname = 'rho_decomposition_SpH.h5'
-    if check_existence(simulation, fname):
-        time, decomposition, processed_hdf = read_rho_decomposition(simulation, 
-                                                                    lmax, msum)
-        if processed_hdf[-1].decode("utf-8") == simulation.hdf_file_list[-1] \
-            or no_new:
-            return True
-        else:
-            start_point = len(processed_hdf)
-            processed_hdf = [ff.decode("utf-8") for ff in processed_hdf]
-            print('Checkpoint found for the harmonics decomposition file, ' \
-                  'starting from the beginning.\nPlease wait...')
-    else:
-        start_point = 0
-        processed_hdf = []
-        print('No checkpoint found for the harmonics decomposition file, ' \
-              'starting from the beginning.\nPlease wait...')
-    if (checkpoints[simulation.dim] == False) or (not save_checkpoints):
-        checkpoint = len(simulation.hdf_file_list)
-    else:
-        checkpoint = checkpoints[simulation.dim]
-    
-    ## Set up the spherical harmonics
-    SpH = SphericalHarmonics()
-    ## Get the angular component
-    dOmega = simulation.cell.dOmega(simulation.ghost)
-    theta = simulation.cell.theta(simulation.ghost)
-    phi = simulation.cell.phi(simulation.ghost)
-    findex = start_point
-    check_index = 0
-    progress_index = 0
-    total_points = len(simulation.hdf_file_list) - start_point
-    for file in simulation.hdf_file_list[start_point:]:
-        progressBar(progress_index, total_points,
-                    suffix='Computing spherical harmonics...')
+class RhoDecompositionReducer(Reducer):
+    """
+    Spherical harmonics decomposition of the density for each timestep,
+    either for each (l, m) up to l=4 or summed over m up to l=40.
+    """
+    keywords = ['time', 'decomposition']
+
+    def __init__(self, simulation, save_checkpoints=True, msum=False,
+                 no_new=False):
+        self.msum = msum
         if msum:
-            in_data = Harmonics_decomposition_rho_msum(simulation, file, theta,
-                                                       phi, dOmega, SpH)
+            self.lmax = 40
+            self.save_name = 'rho_decomposition_SpH_msum.h5'
+        else:
+            self.lmax = 4
+            self.save_name = 'rho_decomposition_SpH.h5'
+        super().__init__(simulation, save_checkpoints, no_new)
+
+    def load(self):
+        if not self.exists():
+            print('No checkpoint found for the harmonics decomposition ' \
+                  'file, starting from the beginning.\nPlease wait...')
+            return
+        time, decomposition, processed_hdf = read_rho_decomposition(
+            self.simulation, self.lmax, self.msum)
+        self.data = {'time': time, 'decomposition': decomposition}
+        if self.is_complete(processed_hdf):
+            self.complete = True
+        else:
+            self.resume(processed_hdf, 'the harmonics decomposition file')
+
+    def setup(self):
+        simulation = self.simulation
+        self.SpH = SphericalHarmonics()
+        self.dOmega = simulation.cell.dOmega(simulation.ghost)
+        self.theta = simulation.cell.theta(simulation.ghost)
+        self.phi = simulation.cell.phi(simulation.ghost)
+
+    def step(self, file, findex):
+        if self.msum:
+            in_data = Harmonics_decomposition_rho_msum(self.simulation, file,
+                                                       self.theta, self.phi,
+                                                       self.dOmega, self.SpH)
         else:
-            in_data = Harmonics_decomposition_rho(simulation, file, theta, phi,
-                                                  dOmega, SpH)
-        try:
-            time = np.concatenate((time, simulation.time(file)))
-            decomposition = np.concatenate((decomposition, in_data[..., None]),
-                                           axis=-1)
-        except Exception as e:
-            time = simulation.time(file)
-            decomposition = in_data[..., None]
-        processed_hdf.append(file)
-        if (check_index >= checkpoint) and save_checkpoints:
-            print('Checkpoint reached, saving...\n')
-            save_decomposition(simulation, decomposition, time, processed_hdf,
-                               lmax, msum)
-            
-            check_index = 0
-        check_index += 1
-        progress_index += 1
-        findex += 1
-    print('Computation completed, saving...')
-    save_decomposition(simulation, decomposition, time, processed_hdf, lmax,
-                       msum)
+            in_data = Harmonics_decomposition_rho(self.simulation, file,
+                                                  self.theta, self.phi,
+                                                  self.dOmega, self.SpH)
+        return {'time': self.simulation.time(file),
+                'decomposition': in_data[..., None]}
+
+    def save(self):
+        save_decomposition(self.simulation, self.data['decomposition'],
+                           self.data['time'], self.processed_hdf, self.lmax,
+                           self.msum, self.saved_steps)
+
+def calculate_rho_decomposition(simulation, save_checkpoints=True, msum=False,
+                                no_new=False):
+    reducer = RhoDecompositionReducer(simulation, save_checkpoints, msum,
+                                      no_new)
+    sweep(simulation, [reducer], 'Computing spherical harmonics...')
     return True
 
-def save_decomposition(simulation, decomposition, time, processed_hdf, lmax, msum):
+def save_decomposition(simulation, decomposition, time, processed_hdf, lmax, msum,
+                       saved_steps=0):
     keys = ['time']
     quantity = [time]
     if msum:
@@ -125,7 +102,7 @@ def save_decomposition(simulation, decomposition, time, processed_hdf, lmax, msu
     keys.append('processed')
     quantity.append(processed_hdf)
     save_hdf(os.path.join(simulation.storage_path, file_name),
-                keys, quantity)
+                keys, quantity, saved_steps)
     
 def read_rho_decomposition(simulation, lmax, msum):
     if msum:
@@ -159,62 +136,117 @@ def read_rho_decomposition(simulation, lmax, msum):
     decomposition_data.close()
     return data
     
-def get_sph_profile(simulation, l, m=None):
-    if m is None:
+## Decompositions read by load_sph_decomposition, stored with the size
+## and modification time of their files
+_DECOMPOSITIONS = {}
+
+## Maximum size of the blocks of profiles averaged at once
+_BLOCK_BYTES = 2**27
+
+def load_sph_decomposition(simulation, msum):
+    """
+    Time and list of the (radius, time) profiles of the stored harmonics
+    decomposition, either summed over m up to l=40 (msum) or for each
+    (l, m) up to l=4, in the order of save_decomposition. The profiles
+    are read once and kept until the file changes; the ones stored
+    contiguously are memory-mapped. They are read-only.
+    """
+    if msum:
         fname = 'rho_decomposition_SpH_msum.h5'
-        key = 'rho_l' + str(l)
+        keys = ['rho_l' + str(l) for l in range(40 + 1)]
     else:
         fname = 'rho_decomposition_SpH.h5'
-        key = 'rho_l' + str(l) + 'm' + str(m)
-    decomposition_data = h5py.File(os.path.join(simulation.storage_path, 
-                                            fname), 'r')
-    data = decomposition_data[key][...]
-    time = decomposition_data['time'][...]
-    decomposition_data.close()
-    return time, data
+        keys = ['rho_l' + str(l) + 'm' + str(m) for l in range(4 + 1)
+                for m in range(-l, l + 1)]
+    path = os.path.join(simulation.storage_path, fname)
+    stat = os.stat(path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    if path in _DECOMPOSITIONS and _DECOMPOSITIONS[path][0] == signature:
+        return _DECOMPOSITIONS[path][1:]
+    with h5py.File(path, 'r') as decomposition_data:
+        time = decomposition_data['time'][...]
+        profiles = [_dataset_array(path, decomposition_data[key]) for key in
+                    keys]
+    _DECOMPOSITIONS[path] = (signature, time, profiles)
+    return time, profiles
+
+def _dataset_array(path, dataset):
+    """
+    Memory map of a contiguous dataset, otherwise its data.
+    """
+    offset = dataset.id.get_offset()
+    if dataset.chunks is None and offset is not None:
+        return np.memmap(path, dtype=dataset.dtype, mode='r', offset=offset,
+                         shape=dataset.shape)
+    data = dataset[...]
+    data.flags.writeable = False
+    return data
+
+def _sph_index(l, m=None):
+    """
+    Position of (l, m) in the profiles of load_sph_decomposition.
+    """
+    if m is None:
+        return l
+    return l ** 2 + l + m
+
+def get_sph_profile(simulation, l, m=None):
+    time, profiles = load_sph_decomposition(simulation, m is None)
+    return np.array(time), np.array(profiles[_sph_index(l, m)])
+
+def _sph_region_average(simulation, profiles, r00, zero_norm=True,
+                        rhomin=None, rhomax=None, r=None, mode='radius'):
+    """
+    Profiles, normalized to r00 if zero_norm, at the radius r, or
+    averaged in radius (mode 'radius') or mass (mode 'mass') over the
+    region with density between rhomin and rhomax.
+    """
+    if r is not None:
+        radius = simulation.cell.radius(simulation.ghost)
+        rindex = np.argmax(radius >= r)
+        data = np.array([profile[rindex, ...] for profile in profiles])
+        if zero_norm:
+            data /= r00[rindex, ...]
+        return data
+    rho = simulation.radial_profile('rho').data.value
+    if rhomin is None:
+        rhomin = 0
+    if rhomax is None:
+        rhomax = rho.max()
+    mask = (rho >= rhomin) & (rho <= rhomax)
+    if mode == 'radius':
+        weight = simulation.cell.dr_integration(simulation.ghost).value[:, None] \
+            * np.ones(r00.shape)
+    elif mode == 'mass':
+        weight = np.array(rho, dtype=float)
+    weight[~mask] = np.nan
+    norm = np.nansum(weight, axis=0)
+    data = np.empty((len(profiles), ) + r00.shape[1:])
+    step = max(1, _BLOCK_BYTES // weight.nbytes)
+    for start in range(0, len(profiles), step):
+        block = np.stack(profiles[start:start + step])
+        if zero_norm:
+            block = block / r00
+        data[start:start + step] = np.nansum(block * weight, axis=1) / norm
+    return np.nan_to_num(data)
 
 def get_sph_profiles_r(simulation, l, m=None, zero_norm=True,
                        rhomin=None, rhomax=None, r=None, mode='radius'):
     rr = [rhomin, rhomax, r]
     assert rr.count(None) < 3, "Please provide at least one of the three " \
         "arguments: rhomin, rhomax, r"
-    if m is None:
-        time, r00 = get_sph_profile(simulation, 0)
-    else:
-        time, r00 = get_sph_profile(simulation, 0, 0)
-    _, rlm = get_sph_profile(simulation, l, m)
-    if zero_norm:
-        rlm /= r00
-    if r is not None:
-        radius = simulation.cell.radius(simulation.ghost)
-        rindex = np.argmax(radius >= r)
-        return time, rlm[rindex, ...]
-    else:
-        rho = simulation.radial_profile('rho').data.value
-        if rhomin is None:
-            rhomin = 0
-        if rhomax is None:
-            rhomax = rho.max()
-        mask = (rho >= rhomin) & (rho <= rhomax)        
-        rlm[~mask] = np.nan
-        ## Average over the selected region
-        if mode == 'radius':
-            dr = simulation.cell.dr_integration(simulation.ghost).value[:, None] * \
-                np.ones(rlm.shape)
-            rlm = rlm * dr
-            dr[~mask] = np.nan
-            rlm = np.nansum(rlm, axis=0) / np.nansum(dr, axis=0)
-            rlm = np.nan_to_num(rlm)
-        elif mode == 'mass':
-            rlm = rlm * rho
-            rho[~mask] = np.nan
-            rlm = np.nansum(rlm, axis=0) / np.nansum(rho, axis=0)
-            rlm = np.nan_to_num(rlm)
-        return time, rlm
+    time, profiles = load_sph_decomposition(simulation, m is None)
+    rlm = _sph_region_average(simulation, [profiles[_sph_index(l, m)]],
+                              profiles[0], zero_norm, rhomin, rhomax, r, mode)
+    return np.array(time), rlm[0]
     
 def get_data_for_barcode(simulation, lmax=None, lmin=None, rhomin=None,
                          msum=False, rhomax=None, r=None, zero_norm=True,
                          mode='radius'):
+    """
+    Profiles of all the l (msum) or (l, m) between lmin and lmax, read
+    and averaged at once.
+    """
     if lmax is None and msum:
         lmax = 40
     elif lmax is None:
@@ -225,99 +257,67 @@ def get_data_for_barcode(simulation, lmax=None, lmin=None, rhomin=None,
         Yscale = np.arange(lmin, int(sp.factorial(lmax)) + 1)
     else:
         Yscale = np.arange(lmin, lmax + 1)
+    rr = [rhomin, rhomax, r]
+    assert rr.count(None) < 3, "Please provide at least one of the three " \
+        "arguments: rhomin, rhomax, r"
+    time, profiles = load_sph_decomposition(simulation, msum)
     if msum:
-        for l in range(lmin, lmax + 1):
-            time, rlm = get_sph_profiles_r(simulation, l=l, m=None,
-                                           zero_norm=zero_norm, rhomin=rhomin,
-                                           rhomax=rhomax, r=r, mode=mode)
-            if l == lmin:
-                data = rlm[None, ...]
-            else:
-                data = np.concatenate((data, rlm[None, ...]), axis=0)
+        profiles_lm = profiles[_sph_index(lmin):_sph_index(lmax) + 1]
     else:
-        for l in range(lmin, lmax + 1):
-            for m in range(-l, l + 1):
-                time, rlm = get_sph_profiles_r(simulation, l=l, m=m,
-                                               zero_norm=zero_norm,
-                                               rhomin=rhomin, rhomax=rhomax,
-                                               r=r, mode=mode)
-                if l == lmin and m == -l:
-                    data = rlm[None, ...]
-                else:
-                    data = np.concatenate((data, rlm[None, ...]), axis=0)
-    return time, Yscale, data
+        profiles_lm = profiles[_sph_index(lmin, -lmin):
+                               _sph_index(lmax, lmax) + 1]
+    data = _sph_region_average(simulation, profiles_lm, profiles[0],
+                               zero_norm, rhomin, rhomax, r, mode)
+    return np.array(time), Yscale, data
     
-def Fourier_amplitude(simulation, save_checkpoints=True, no_new=False):
+class FourierReducer(Reducer):
     """
-    Computes the fourier amplitude for the first 20 ms in a 3D simulation
+    Fourier coefficients in phi (m up to 10) of the density around the
+    equator for each timestep of a 3D simulation.
     """
-    if check_existence(simulation, 'rho_fourier.h5'):
-        time, rhom_series, processed_hdf = read_rho_fourier(simulation)
-        if processed_hdf[-1].decode("utf-8") == simulation.hdf_file_list[-1] \
-            or no_new:
-            return True
+    save_name = 'rho_fourier.h5'
+    keywords = ['time', 'Pm']
+
+    def load(self):
+        if not self.exists():
+            print('No checkpoint found for the Fourier coefficients file, ' \
+                  'starting from the beginning.\nPlease wait...')
+            return
+        time, rhom_series, processed_hdf = read_rho_fourier(self.simulation)
+        self.data = {'time': time, 'Pm': rhom_series}
+        if self.is_complete(processed_hdf):
+            self.complete = True
         else:
-            start_point = len(processed_hdf)
-            processed_hdf = [ff.decode("utf-8") for ff in processed_hdf]
-            print('Checkpoint found for the Fourier coefficients file, ' \
-                  'starting from the checkpoint.\nPlease wait...')
-    else:
-        start_point = 0
-        processed_hdf = []
-        print('No checkpoint found for the Fourier coefficients file, ' \
-              'starting from the beginning.\nPlease wait...')
-    if (checkpoints[simulation.dim] == False) or (not save_checkpoints):
-        checkpoint = len(simulation.hdf_file_list)
-    else:
-        checkpoint = checkpoints[simulation.dim]
-    dtheta = simulation.cell.dtheta_integration(simulation.ghost).value
-    N_theta = len(dtheta) // 2
-    dtheta = dtheta[None, N_theta-2:N_theta+2, None]
-    theta_norm = dtheta.sum()
-    phi = simulation.cell.phi(simulation.ghost).value[:, None, None]
-    dphi = simulation.cell.dphi(simulation.ghost).value[:, None, None]
-    findex = start_point
-    check_index = 0
-    progress_index = 0
-    ## Compute all the stuff we can just one time
-    mexp = {}
-    for m in range(11):
-        mexp[m] = np.exp(1.j * m * phi) * dphi / theta_norm * dtheta
-    total_points = len(simulation.hdf_file_list) - start_point
-    for file in simulation.hdf_file_list[start_point:]:
-        progressBar(progress_index, total_points,
-                    suffix='Computing Fourier coefficients')
-        rho = simulation.rho(file).value[:, N_theta-2:N_theta+2, :]
+            self.resume(processed_hdf, 'the Fourier coefficients file')
+
+    def setup(self):
+        simulation = self.simulation
+        dtheta = simulation.cell.dtheta_integration(simulation.ghost).value
+        self.N_theta = len(dtheta) // 2
+        dtheta = dtheta[None, self.N_theta-2:self.N_theta+2, None]
+        theta_norm = dtheta.sum()
+        phi = simulation.cell.phi(simulation.ghost).value[:, None, None]
+        dphi = simulation.cell.dphi(simulation.ghost).value[:, None, None]
+        ## Compute all the stuff we can just one time
+        self.mexp = {}
+        for m in range(11):
+            self.mexp[m] = np.exp(1.j * m * phi) * dphi / theta_norm * dtheta
+
+    def step(self, file, findex):
+        rho = self.simulation.rho(file, theta_range=slice(self.N_theta-2,
+                                                          self.N_theta+2)).value
         ## Compute the radial m coefficients
         rhom = {}
         for m in range(11):
-            rhom[m] = np.sum(mexp[m] * rho, axis=(0, 1))
-        tm = simulation.time(file)
-        try:
-            time = np.concatenate((time, tm))
-            for m in range(11):
-                rhom_series[m] = np.concatenate((rhom_series[m],
-                                                 rhom[m][..., None]), axis=-1)
-        except Exception as e:
-            print(e)
-            time = tm
-            rhom_series = {}
-            for m in range(11):
-                rhom_series[m] = rhom[m][..., None]
+            rhom[m] = np.sum(self.mexp[m] * rho, axis=(0, 1))[..., None]
+        return {'time': self.simulation.time(file), 'Pm': rhom}
 
-        processed_hdf.append(file)
-        if (check_index >= checkpoint and save_checkpoints):
-            print('Checkpoint reached, saving...\n')
-            save_hdf(os.path.join(simulation.storage_path, 'rho_fourier.h5'),
-                     ['time', 'Pm', 'processed'],
-                     [time, rhom_series, processed_hdf])
-            check_index = 0
-        check_index += 1
-        progress_index += 1
-    print('Computation complete, saving...\n')
-    save_hdf(os.path.join(simulation.storage_path, 'rho_fourier.h5'),
-                     ['time', 'Pm', 'processed'],
-                     [time, rhom_series, processed_hdf])
+def Fourier_amplitude(simulation, save_checkpoints=True, no_new=False):
+    """
+    Computes the fourier amplitude for the first 20 ms in a 3D simulation
+    """
+    reducer = FourierReducer(simulation, save_checkpoints, no_new)
+    sweep(simulation, [reducer], 'Computing Fourier coefficients')
     return True
 
 def read_rho_fourier(simulation):
@@ -4,7 +4,7 @@ from AeViz.units.aeseries import aerray, aeseries
 from AeViz.units.constants import constants as c
 from AeViz.utils.files.file_utils import save_hdf, create_series
 from AeViz.utils.math_utils import function_average
-from AeViz.utils.utils import check_existence, progressBar, checkpoints
+from AeViz.utils.sweep_utils import Reducer, sweep
 from scipy.interpolate import Akima1DInterpolator
 from scipy.integrate import solve_ivp
 import h5py
@@ -97,78 +97,57 @@ def solve_tidal_love(xi, pres, mass, soundspeed, dens, radius):
     tidal_d = tidal_deformability(kappa2, xi)
     return kappa2, tidal_d
 
-def solve_tidal_love_profile(simulation, save_checkpoints=True):
+class TidalReducer(Reducer):
     """
-    Derives and saves the tidal love number and tidal deformability for
-    the PNS and PNS core.
+    Tidal love number and tidal deformability of the PNS and of the PNS
+    core for each timestep, stored in tidal.h5.
     """
-    if check_existence(simulation, 'tidal.h5'):
-        time, pns, core, processed_hdf = \
-            read_tidal(simulation)
-        if processed_hdf[-1].decode("utf-8") == simulation.hdf_file_list[-1] or \
-            simulation.no_new:
-            time = aerray(time, u.s, name='time', label=r'$t-t_\mathrm{b}$',
-                          limits=[-0.05, time[-1]])
-            lambda_pns = aerray(pns['lambda'], u.dimensionless_unscaled,
-                                name='lambda_pns',  limits=[0, 10000], log=True,
-                                label=r'$\Lambda_\mathrm{PNS}$')
-            kappa_pns = aerray(pns['kappa2'], u.dimensionless_unscaled,
-                               name='kappa_pns', limits=[0, 0.002],
-                               label=r'$\kappa_2^\mathrm{PNS}$')
-            lambda_core = aerray(core['lambda'], u.dimensionless_unscaled,
-                                name='lambda_core', limits=[0, 10000], log=True,
-                                label=r'$\Lambda_\mathrm{core}$')
-            kappa_core = aerray(core['kappa2'], u.dimensionless_unscaled,
-                               name='kappa_core', limits=[0, 0.002],
-                               label=r'$\kappa_2^\mathrm{core}$')
-            return create_series(time, lambda_pns, kappa_pns, lambda_core,
-                                  kappa_core)
+    save_name = 'tidal.h5'
+    keywords = ['time', 'PNS', 'PNS_core']
+
+    def load(self):
+        if not self.exists():
+            print('No checkpoint found for the tidal deformablity file, ' \
+                  'starting from the beginning.\nPlease wait...')
+            return
+        time, pns, core, processed_hdf = read_tidal(self.simulation)
+        self.data = {'time': time, 'PNS': pns, 'PNS_core': core}
+        if self.is_complete(processed_hdf) or self.simulation.no_new:
+            self.complete = True
         else:
-            start_point = len(processed_hdf)
-            processed_hdf = [ff.decode("utf-8") for ff in processed_hdf]
-            print('Checkpoint found for the tidal file, starting' \
-                  ' from checkpoint.\nPlease wait...')
-    else:
-        start_point = 0
-        processed_hdf = []
-        print('No checkpoint found for the tidal deformablity file, starting' \
-              ' from the beginning.\nPlease wait...')
-    if (checkpoints[simulation.dim] == False) or (not save_checkpoints):
-        checkpoint = len(simulation.hdf_file_list)
-    else:
-        checkpoint = checkpoints[simulation.dim]
-    ## Get the radii
-    PNS_radius = simulation.PNS_radius(rad='avg')
-    core_radius = simulation.PNS_radius(rad='avg')
-    ## Get the calculated profiles
-    rho_prof = simulation.radial_profile('rho')
-    pgas_prof = simulation.radial_profile('gas_pressure')
-    ## Convert to cactus units
-    t = PNS_radius.time
-    radius = to_cactus_len(rho_prof.radius)
-    rho_prof = to_cactus_dens(rho_prof.data)
-    pgas_prof = to_cactus_pres(pgas_prof.data)
-    PNS_radius = to_cactus_len(PNS_radius.data)
-    core_radius = to_cactus_len(core_radius.data)
-    dOmega = simulation.cell.dOmega(simulation.ghost)
-    dV = simulation.cell.dVolume_integration(simulation.ghost)
-    ## Indices
-    findex = start_point
-    check_index = 0
-    progress_index = 0
-    total_points = len(simulation.hdf_file_list) - start_point
-    for file in simulation.hdf_file_list[start_point:]:
-        progressBar(progress_index, total_points, suffix='Computing...')
-        if t[findex] < 0:
+            self.resume(processed_hdf, 'the tidal file')
+
+    def setup(self):
+        simulation = self.simulation
+        ## Get the radii
+        PNS_radius = simulation.PNS_radius(rad='avg')
+        core_radius = simulation.PNS_radius(rad='avg')
+        ## Get the calculated profiles
+        rho_prof = simulation.radial_profile('rho')
+        pgas_prof = simulation.radial_profile('gas_pressure')
+        ## Convert to cactus units
+        self.t = PNS_radius.time
+        self.radius = to_cactus_len(rho_prof.radius)
+        self.rho_prof = to_cactus_dens(rho_prof.data)
+        self.pgas_prof = to_cactus_pres(pgas_prof.data)
+        self.PNS_radius = to_cactus_len(PNS_radius.data)
+        self.core_radius = to_cactus_len(core_radius.data)
+        self.dOmega = simulation.cell.dOmega(simulation.ghost)
+        self.dV = simulation.cell.dVolume_integration(simulation.ghost)
+
+    def step(self, file, findex):
+        simulation, radius = self.simulation, self.radius
+        core_radius, PNS_radius = self.core_radius, self.PNS_radius
+        if self.t[findex] < 0:
             tidal_core, tidal_pns = 0, 0
             love_core, love_pns = 0, 0
         else:
             ##compute the speed of sound profile
             csound = to_cactus_vel(
                 function_average(simulation.soundspeed(file), simulation.dim,
-                                'Omega', dOmega))
+                                'Omega', self.dOmega))
             ##compute the mass profile
-            mass = np.cumsum(np.sum(simulation.rho(file) * dV,
+            mass = np.cumsum(np.sum(simulation.rho(file) * self.dV,
                             axis=tuple(range(simulation.dim - 1))).to(u.M_sun)) / u.M_sun
             ## compute the core and PNS radius indices
             core_index = np.argmax(radius > core_radius[findex])
@@ -176,58 +155,48 @@ def solve_tidal_love_profile(simulation, save_checkpoints=True):
             ## compute the tidal love number and tidal deformability
             love_core, tidal_core = solve_tidal_love(
                 mass[core_index] / core_radius[findex],
-                pgas_prof[:core_index, findex], mass[:core_index],
-                csound[:core_index], rho_prof[:core_index, findex],
+                self.pgas_prof[:core_index, findex], mass[:core_index],
+                csound[:core_index], self.rho_prof[:core_index, findex],
                 radius[:core_index])
             love_pns, tidal_pns = solve_tidal_love(
                 mass[pns_index] / PNS_radius[findex],
-                pgas_prof[:pns_index, findex], mass[:pns_index],
-                csound[:pns_index], rho_prof[:pns_index, findex],
+                self.pgas_prof[:pns_index, findex], mass[:pns_index],
+                csound[:pns_index], self.rho_prof[:pns_index, findex],
                 radius[:pns_index])
-        ## Save the results into dictionaries
-        try:
-            time = np.concatenate((time, [t[findex]]))
-            pns['kappa2'] = np.concatenate((pns['kappa2'], [love_pns]))
-            pns['lambda'] = np.concatenate((pns['lambda'], [tidal_pns]))
-            core['kappa2'] = np.concatenate((core['kappa2'], [love_core]))
-            core['lambda'] = np.concatenate((core['lambda'], [tidal_core]))
-        except Exception as e:
-            time = np.array([t[findex]])
-            pns = {'kappa2': np.array([love_pns]),
-                   'lambda': np.array([tidal_pns])}
-            core = {'kappa2': np.array([love_core]),
-                    'lambda': np.array([tidal_core])}
-        processed_hdf.append(file)
-        if (check_index >= checkpoint) and save_checkpoints:
-            print('Checkpoint reached, saving...\n')
-            save_hdf(os.path.join(simulation.storage_path, 'tidal.h5'),
-                     ['time', 'PNS', 'PNS_core', 'processed'],
-                     [time, pns, core, processed_hdf])
-            
-            check_index = 0
-        check_index += 1
-        progress_index += 1
-        findex += 1
-    print('Computation completed, saving...')
-    save_hdf(os.path.join(simulation.storage_path, 'tidal.h5'),
-                     ['time', 'PNS', 'PNS_core', 'processed'], 
-                     [time, pns, core, processed_hdf])
-    time = aerray(time, u.s, name='time', label=r'$t-t_\mathrm{b}$',
-                  limits=[-0.05, time[-1]])
-    lambda_pns = aerray(pns['lambda'], u.dimensionless_unscaled,
-                        name='lambda_pns',  limits=[0, 10000], log=True,
-                        label=r'$\Lambda_\mathrm{PNS}$')
-    kappa_pns = aerray(pns['kappa2'], u.dimensionless_unscaled,
-                       name='kappa_pns', limits=[0, 0.002],
-                        label=r'$\kappa_2^\mathrm{PNS}$')
-    lambda_core = aerray(core['lambda'], u.dimensionless_unscaled,
-                        name='lambda_core', limits=[0, 10000], log=True,
-                        label=r'$\Lambda_\mathrm{core}$')
-    kappa_core = aerray(core['kappa2'], u.dimensionless_unscaled,
-                        name='kappa_core', limits=[0, 0.002],
-                        label=r'$\kappa_2^\mathrm{core}$')
-    return create_series(time, lambda_pns, kappa_pns, lambda_core,
-                            kappa_core)
+        return {'time': np.array([self.t[findex]]),
+                'PNS': {'kappa2': np.array([love_pns]),
+                        'lambda': np.array([tidal_pns])},
+                'PNS_core': {'kappa2': np.array([love_core]),
+                             'lambda': np.array([tidal_core])}}
+
+    def series(self):
+        time, pns, core = self.data['time'], self.data['PNS'], \
+            self.data['PNS_core']
+        time = aerray(time, u.s, name='time', label=r'$t-t_\mathrm{b}$',
+                      limits=[-0.05, time[-1]])
+        lambda_pns = aerray(pns['lambda'], u.dimensionless_unscaled,
+                            name='lambda_pns',  limits=[0, 10000], log=True,
+                            label=r'$\Lambda_\mathrm{PNS}$')
+        kappa_pns = aerray(pns['kappa2'], u.dimensionless_unscaled,
+                           name='kappa_pns', limits=[0, 0.002],
+                           label=r'$\kappa_2^\mathrm{PNS}$')
+        lambda_core = aerray(core['lambda'], u.dimensionless_unscaled,
+                             name='lambda_core', limits=[0, 10000], log=True,
+                             label=r'$\Lambda_\mathrm{core}$')
+        kappa_core = aerray(core['kappa2'], u.dimensionless_unscaled,
+                            name='kappa_core', limits=[0, 0.002],
+                            label=r'$\kappa_2^\mathrm{core}$')
+        return create_series(time, lambda_pns, kappa_pns, lambda_core,
+                             kappa_core)
+
+def solve_tidal_love_profile(simulation, save_checkpoints=True):
+    """
+    Derives and saves the tidal love number and tidal deformability for
+    the PNS and PNS core.
+    """
+    reducer = TidalReducer(simulation, save_checkpoints)
+    sweep(simulation, [reducer])
+    return reducer.series()
 
 def read_tidal(simulation):
     """
@@ -0,0 +1,124 @@
+import numpy as np
+from typing import Literal
+
+class RadialRemap:
+    """
+    Interpolation of radial profiles, given on profile_radius, on the
+    cells at radius. The bracketing intervals and the interpolation
+    weights are computed once, so that the same remap can be applied to
+    all the profiles sharing the two grids.
+    Input:
+        radius: radii at which the profiles are needed
+        profile_radius: increasing radii of the profiles
+        kind: 'linear' or 'cubic' (monotone piecewise cubic Hermite
+              interpolation, as scipy PchipInterpolator)
+    The points outside profile_radius take the value at its closest
+    end.
+    """
+    def __init__(self, radius, profile_radius,
+                 kind: Literal['linear', 'cubic']='linear'):
+        if kind not in ['linear', 'cubic']:
+            raise ValueError(f"{kind} not in ['linear', 'cubic']")
+        self.radius = np.asarray(radius, dtype=float)
+        self.profile_radius = np.asarray(profile_radius, dtype=float)
+        self.kind = kind if len(self.profile_radius) > 2 else 'linear'
+        self.index = np.clip(np.searchsorted(self.profile_radius, self.radius,
+                                             'right') - 1, 0,
+                             len(self.profile_radius) - 2)
+        x0 = self.profile_radius[self.index]
+        self.dx = self.profile_radius[self.index + 1] - x0
+        self.offset = np.clip(self.radius - x0, 0, self.dx)
+        if self.kind == 'cubic':
+            t = self.offset / self.dx
+            self.weights = ((1 + 2 * t) * (1 - t) ** 2,
+                            t * (1 - t) ** 2 * self.dx,
+                            t ** 2 * (3 - 2 * t),
+                            t ** 2 * (t - 1) * self.dx)
+
+    def __call__(self, profile):
+        """
+        Interpolated profile at radius.
+        """
+        profile = np.asarray(profile, dtype=float)
+        y0 = profile[self.index]
+        y1 = profile[self.index + 1]
+        if self.kind == 'linear':
+            return y0 + (y1 - y0) / self.dx * self.offset
+        slopes = _pchip_slopes(self.profile_radius, profile)
+        return self.weights[0] * y0 + \
+            self.weights[1] * slopes[self.index] + \
+                self.weights[2] * y1 + \
+                    self.weights[3] * slopes[self.index + 1]
+
+def _pchip_slopes(x, y):
+    """
+    Derivatives at the nodes of the monotone cubic interpolation
+    (Fritsch & Carlson 1980, with the end points of scipy).
+    """
+    h = np.diff(x)
+    delta = np.diff(y) / h
+    slopes = np.zeros_like(y)
+    w1 = 2 * h[1:] + h[:-1]
+    w2 = h[1:] + 2 * h[:-1]
+    same_sign = delta[:-1] * delta[1:] > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inverse_mean = (w1 / delta[:-1] + w2 / delta[1:]) / (w1 + w2)
+        slopes[1:-1] = np.where(same_sign, 1 / inverse_mean, 0)
+    slopes[0] = _pchip_end_slope(h[0], h[1], delta[0], delta[1])
+    slopes[-1] = _pchip_end_slope(h[-1], h[-2], delta[-1], delta[-2])
+    return slopes
+
+def _pchip_end_slope(h0, h1, delta0, delta1):
+    slope = ((2 * h0 + h1) * delta0 - h0 * delta1) / (h0 + h1)
+    if np.sign(slope) != np.sign(delta0):
+        return 0.0
+    if np.sign(delta0) != np.sign(delta1) and abs(slope) > 3 * abs(delta0):
+        return 3 * delta0
+    return slope
+
+def radial_field(profile, nz, ny):
+    """
+    Read-only (nz, ny, nx) view of a radial profile of nx points.
+    """
+    return np.broadcast_to(profile, (nz, ny, len(profile)))
+
+def extend_radially(data, nx, fill=0):
+    """
+    Extends data, with the radius along the third axis, to nx radial
+    cells. The new cells are set to fill, which is either a number, a
+    radial profile on the new cells or an array broadcastable to them.
+    """
+    n0 = data.shape[2]
+    extended = np.empty(data.shape[:2] + (nx, ) + data.shape[3:],
+                        dtype=np.result_type(data, np.asarray(fill)))
+    extended[:, :, :n0, ...] = data
+    fill = np.asarray(fill)
+    if fill.ndim == 1 and data.ndim > 3:
+        fill = fill.reshape((-1, ) + (1, ) * (data.ndim - 3))
+    extended[:, :, n0:, ...] = fill
+    return extended
+
+def stream_extended(source, group, name, nx, fills=None, fill=0):
+    """
+    Writes the dataset source to group[name] with the radial axis (the
+    third one) extended to nx cells, one slab of the first axis at a
+    time, so that only a slab is in memory.
+    Input:
+        fills: dictionary with the indices of the last axis (the
+               variables) as keys and the values of their new cells as
+               values, as in extend_radially. A (nz, ny, new cells)
+               array sets different values on each slab. If None, all
+               the new cells are set to fill.
+        fill: value of the new cells of the variables not in fills
+    """
+    shape = source.shape[:2] + (nx, ) + source.shape[3:]
+    dataset = group.create_dataset(name, shape=shape, dtype=source.dtype)
+    for iz in range(shape[0]):
+        slab = extend_radially(source[iz:iz + 1], nx, fill)
+        for (index, values) in (fills or {}).items():
+            values = np.asarray(values)
+            if values.ndim == 3:
+                values = values[iz:iz + 1]
+            slab[:, :, source.shape[2]:, index] = values
+        dataset[iz:iz + 1] = slab
+    return dataset
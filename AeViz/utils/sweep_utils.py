@@ -0,0 +1,470 @@
+import os
+import numpy as np
+from AeViz.units.aerray import aerray
+from AeViz.utils.utils import progressBar, check_existence, checkpoints
+from AeViz.utils.files.file_utils import save_hdf
+
+## ---------------------------------------------------------------------
+## REDUCERS
+## ---------------------------------------------------------------------
+
+class Reducer:
+    """
+    Base class for a postprocessing quantity computed timestep by
+    timestep and stored in a checkpoint file inside the storage folder.
+    Subclasses have to define:
+        save_name: name of the checkpoint file
+        keywords: datasets saved in the checkpoint file, 'processed'
+                  excluded
+        load(): reads the checkpoint (if any) and sets start_point,
+                data, processed_hdf and complete
+        step(file, findex): computes a single timestep. Returns a
+                dictionary with the same structure of data, every value
+                with the time axis as the last one, or None if the
+                timestep has to be skipped.
+    Optional:
+        ghost_cells: ghost cells used while computing a step
+        setup(): quantities shared by all the timesteps, called once
+                 before the sweep starts
+    """
+    save_name = None
+    keywords = []
+    ghost_cells = None
+
+    def __init__(self, simulation, save_checkpoints=True, no_new=False):
+        self.simulation = simulation
+        self.save_checkpoints = save_checkpoints
+        self.no_new = no_new
+        self.start_point = 0
+        self.processed_hdf = []
+        self.complete = False
+        self.saved_steps = 0
+        self.data = {}
+        if (checkpoints[simulation.dim] == False) or (not save_checkpoints):
+            self.checkpoint = len(simulation.hdf_file_list)
+        else:
+            self.checkpoint = checkpoints[simulation.dim]
+        self.current = None
+        self.__check_index = 0
+        self.load()
+
+    def load(self):
+        pass
+
+    def setup(self):
+        pass
+
+    def step(self, file, findex):
+        raise NotImplementedError
+
+    def exists(self):
+        return check_existence(self.simulation, self.save_name)
+
+    def is_complete(self, processed_hdf):
+        """
+        Checks whether the processed file list reaches the last
+        timestep of the simulation.
+        """
+        if len(processed_hdf) == 0:
+            return False
+        last = processed_hdf[-1]
+        if type(last) is bytes:
+            last = last.decode("utf-8")
+        return last == self.simulation.hdf_file_list[-1] or self.no_new
+
+    def resume(self, processed_hdf, name):
+        """
+        Sets the starting point from an incomplete checkpoint.
+        """
+        self.processed_hdf = [ff.decode("utf-8") if type(ff) is bytes else ff
+                              for ff in processed_hdf]
+        self.start_point = len(self.processed_hdf)
+        self.saved_steps = self.start_point
+        print('Checkpoint found for ' + name + ', starting' \
+              ' from checkpoint.\nPlease wait...')
+
+    def compute(self, file, findex):
+        """
+        Computes a timestep with the ghost cells of the reducer. The
+        result is kept until the next timestep, so that the reducers
+        depending on this one can access it through value_at.
+        """
+        if self.ghost_cells is not None:
+            self.simulation.ghost.update_ghost_cells(**self.ghost_cells)
+        try:
+            step_data = self.step(file, findex)
+        finally:
+            if self.ghost_cells is not None:
+                self.simulation.ghost.restore_default()
+        self.current = (findex, step_data)
+        return step_data
+
+    def store(self, file, findex, step_data):
+        """
+        Stores a computed timestep, saving a checkpoint when needed.
+        """
+        if step_data is not None:
+            self.results.append(step_data)
+        self.processed_hdf.append(file)
+        self.__check_index += 1
+        if self.__check_index >= self.checkpoint and self.save_checkpoints:
+            print('Checkpoint reached, saving...\n')
+            self.flush()
+            self.__check_index = 0
+
+    def process(self, file, findex):
+        """
+        Computes and stores a timestep.
+        """
+        self.store(file, findex, self.compute(file, findex))
+
+    @property
+    def data(self):
+        """
+        Computed timesteps, as a dictionary of arrays with the time
+        along the last axis. The arrays are views of the results, so
+        nothing is copied.
+        """
+        return self.results.view()
+
+    @data.setter
+    def data(self, data):
+        self.results = Accumulator(data, len(self.simulation.hdf_file_list))
+
+    def save(self):
+        save_hdf(os.path.join(self.simulation.storage_path, self.save_name),
+                 self.keywords + ['processed'],
+                 [self.data[key] for key in self.keywords] + \
+                     [self.processed_hdf], self.saved_steps)
+
+    def flush(self):
+        """
+        Saves the results, so that only the following timesteps are
+        appended to the checkpoint file the next time.
+        """
+        self.save()
+        self.saved_steps = len(self.processed_hdf)
+
+    def value_at(self, findex, key=None):
+        """
+        Value of the main quantity of the reducer at the selected
+        timestep.
+        """
+        if self.current is not None and self.current[0] == findex and \
+            self.current[1] is not None:
+            return self.select(self.current[1], 0, key)
+        return self.select(self.data, findex, key)
+
+    def select(self, data, index, key=None):
+        """
+        Selects the main quantity at the index along the time axis of
+        data.
+        """
+        raise NotImplementedError
+
+    def prepare(self):
+        """
+        Runs the setup, remembering which attributes were there before
+        it. Only those are sent to the worker processes, which run the
+        setup again on their own.
+        """
+        self.__sent_attributes = list(self.__dict__.keys())
+        self.setup()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if '_Reducer__sent_attributes' in state:
+            state = {key: state[key] for key in
+                     state['_Reducer__sent_attributes']}
+        state.pop('simulation', None)
+        state['current'] = None
+        return state
+
+## ---------------------------------------------------------------------
+## RESULTS
+## ---------------------------------------------------------------------
+
+class Accumulator:
+    """
+    Append-only storage for the timesteps computed by a reducer. Each
+    array is kept in a buffer preallocated for the expected number of
+    timesteps, which grows geometrically if more are appended, so
+    appending a timestep never copies the previous ones.
+    Nested dictionaries (e.g. PNS_me['L']['Lx']) get nested
+    accumulators, while values that are not arrays (e.g. the ghost cells
+    of the radii) are stored as they are.
+    Input:
+        data: dictionary with the already computed timesteps (e.g. from
+              a checkpoint)
+        size: expected number of timesteps
+    """
+    def __init__(self, data=None, size=0):
+        self.size = size
+        self.__entries = {}
+        if data:
+            for (key, value) in data.items():
+                self.__entries[key] = self.__new_entry(value)
+
+    def __new_entry(self, value):
+        if type(value) == dict:
+            return Accumulator(value, self.size)
+        if isinstance(value, (np.ndarray, np.generic, int, float, complex)):
+            return SeriesBuffer(value, self.size)
+        return value
+
+    def append(self, step_data):
+        """
+        Appends a timestep, every value with the time as the last axis
+        (or a scalar).
+        """
+        for (key, value) in step_data.items():
+            if key not in self.__entries:
+                self.__entries[key] = self.__new_entry(value)
+            elif isinstance(self.__entries[key], (Accumulator, SeriesBuffer)):
+                self.__entries[key].append(value)
+            else:
+                self.__entries[key] = value
+
+    def view(self):
+        """
+        Dictionary with the arrays filled so far.
+        """
+        return {key: entry.view() if isinstance(entry, (Accumulator,
+                                                        SeriesBuffer))
+                else entry for (key, entry) in self.__entries.items()}
+
+class SeriesBuffer:
+    """
+    Buffer of a single array growing along the last axis. The unit and
+    labels of an aerray are kept, and the following values are
+    converted to the same unit.
+    """
+    def __init__(self, value, capacity=0):
+        value = self.__as_series(value)
+        self.__attributes = None
+        if isinstance(value, aerray):
+            self.__attributes = (value.unit, value.name, value.label,
+                                 value.cmap, value.limits, value.log)
+        self.__data = np.empty(value.shape[:-1] + (max(capacity,
+                                                       value.shape[-1]),),
+                               dtype=value.dtype)
+        self.length = 0
+        self.append(value)
+
+    @staticmethod
+    def __as_series(value):
+        if not isinstance(value, np.ndarray):
+            value = np.asarray(value)
+        if value.ndim == 0:
+            value = value[None]
+        return value
+
+    def append(self, value):
+        value = self.__as_series(value)
+        if self.__attributes is not None and isinstance(value, aerray) and \
+            value.unit != self.__attributes[0]:
+            value = value.to(self.__attributes[0])
+        value = np.asarray(value)
+        new_length = self.length + value.shape[-1]
+        if new_length > self.__data.shape[-1] or \
+            not np.can_cast(value.dtype, self.__data.dtype):
+            data = np.empty(self.__data.shape[:-1] + 
+                            (max(2 * self.__data.shape[-1], new_length),),
+                            dtype=np.result_type(self.__data, value))
+            data[..., :self.length] = self.__data[..., :self.length]
+            self.__data = data
+        self.__data[..., self.length:new_length] = value
+        self.length = new_length
+
+    def view(self):
+        data = self.__data[..., :self.length]
+        if self.__attributes is None:
+            return data
+        return aerray(data, *self.__attributes)
+
+    def __reduce__(self):
+        ## Only the filled part is pickled
+        return (SeriesBuffer, (self.view(),))
+
+class TimeReducer(Reducer):
+    """
+    Time of each timestep, stored in time.h5.
+    """
+    save_name = 'time.h5'
+    keywords = ['time']
+
+    def load(self):
+        from AeViz.units.aerray import aerray
+        from AeViz.units import u
+        import h5py
+        if not self.exists():
+            return
+        data = h5py.File(os.path.join(self.simulation.storage_path,
+                                      self.save_name), 'r')
+        time = aerray(data['time'][...], u.s, 'time', r'$t$', None,
+                      [None, None])
+        if 'processed' in data.keys():
+            processed_hdf = data['processed'][...]
+            data.close()
+        else:
+            processed_hdf = self.simulation.hdf_file_list[:len(time)]
+            data.close()
+            save_hdf(os.path.join(self.simulation.storage_path,
+                                  self.save_name),
+                     ['time', 'processed'], [time.value, processed_hdf])
+        self.data = {'time': time}
+        self.processed_hdf = [ff.decode("utf-8") if type(ff) is bytes else ff
+                              for ff in processed_hdf]
+        if self.processed_hdf[-1] == self.simulation.hdf_file_list[-1]:
+            self.complete = True
+        else:
+            self.start_point = len(self.processed_hdf)
+            self.saved_steps = self.start_point
+
+    def step(self, file, findex):
+        return {'time': self.simulation.time(file)}
+
+    def save(self):
+        save_hdf(os.path.join(self.simulation.storage_path, self.save_name),
+                 ['time', 'processed'],
+                 [self.data['time'].value, self.processed_hdf],
+                 self.saved_steps)
+
+    def select(self, data, index, key=None):
+        return data['time'][index]
+
+## ---------------------------------------------------------------------
+## SWEEP
+## ---------------------------------------------------------------------
+
+def sweep(simulation, reducers, suffix='Computing...', n_workers=None):
+    """
+    Runs all the reducers over the timesteps of the simulation, opening
+    each file only once. Every file is loaded as an in-memory snapshot,
+    so the datasets are read and decoded a single time and shared by
+    all the reducers.
+    Reducers are run in the given order, so a reducer depending on
+    another one (e.g. the gain radius on the PNS radius) must come
+    after it. Each reducer starts from its own checkpoint.
+    With more than one worker (by default simulation.n_workers) the
+    timesteps are split in chunks among a pool of processes, each one
+    with its own Simulation. The results are stored back in file order,
+    so the checkpoints are the same of the serial sweep.
+    """
+    reducers = [reducer for reducer in reducers if not reducer.complete]
+    if len(reducers) == 0:
+        return
+    if n_workers is None:
+        n_workers = simulation.n_workers
+    for reducer in reducers:
+        reducer.prepare()
+    start_point = min([reducer.start_point for reducer in reducers])
+    findices = list(range(start_point, len(simulation.hdf_file_list)))
+    if n_workers > 1 and len(findices) > 1:
+        parallel_sweep(simulation, reducers, findices, suffix, n_workers)
+    else:
+        serial_sweep(simulation, reducers, findices, suffix)
+    print('Computation completed, saving...')
+    for reducer in reducers:
+        reducer.flush()
+        reducer.complete = True
+    print('Done!')
+
+def serial_sweep(simulation, reducers, findices, suffix):
+    files = [simulation.hdf_file_list[findex] for findex in findices]
+    snapshots = simulation.prefetch_snapshots(files)
+    try:
+        for (progress_index, (findex, file, snapshot)) in \
+            enumerate(zip(findices, files, snapshots)):
+            progressBar(progress_index, len(findices), suffix=suffix)
+            simulation.load_snapshot(file, snapshot)
+            for reducer in reducers:
+                if findex < reducer.start_point:
+                    continue
+                reducer.process(file, findex)
+    finally:
+        snapshots.close()
+        simulation.release_snapshot()
+
+def parallel_sweep(simulation, reducers, findices, suffix, n_workers):
+    from concurrent.futures import ProcessPoolExecutor
+    n_workers = min(n_workers, len(findices))
+    ## Small chunks keep all the workers busy, while still letting the
+    ## checkpoints be saved as the sweep goes on
+    chunk_size = max(1, len(findices) // (4 * n_workers))
+    chunks = [[(findex, simulation.hdf_file_list[findex]) for findex in
+               findices[i:i + chunk_size]]
+              for i in range(0, len(findices), chunk_size)]
+    ## Do not let the workers inherit an opened file
+    simulation.close_files()
+    simulation_setup = (simulation.simulation_name,
+                        os.path.dirname(simulation.path), simulation.dim,
+                        getattr(simulation, 'tob', None), simulation.no_new,
+                        simulation.prefetch_depth, simulation.prefetch_bytes,
+                        simulation.ghost.save_ghost_cells_status(),
+                        simulation.field_cache.max_bytes,
+                        simulation.field_cache.blocks,
+                        simulation.field_cache.nvar_first,
+                        simulation.hdf_pool.max_files,
+                        simulation.hdf_pool.rdcc_nbytes)
+    progress_index = 0
+    with ProcessPoolExecutor(max_workers=n_workers,
+                             initializer=_start_worker,
+                             initargs=(simulation_setup, reducers)) as executor:
+        for chunk_results in executor.map(_sweep_chunk, chunks):
+            for (findex, file, steps) in chunk_results:
+                progressBar(progress_index, len(findices), suffix=suffix)
+                for (reducer, step_data) in zip(reducers, steps):
+                    if findex < reducer.start_point:
+                        continue
+                    reducer.store(file, findex, step_data)
+                progress_index += 1
+
+## Worker state, each process of the pool opens its own Simulation
+_worker = {}
+
+def _start_worker(simulation_setup, reducers):
+    from AeViz.simulation.simulation import Simulation
+    name, path, dim, tob, no_new, depth, max_bytes, ghost_status, \
+        cache_bytes, blocks, nvar_first, max_files, rdcc_nbytes = \
+        simulation_setup
+    simulation = Simulation(name, path, dim)
+    if tob is not None:
+        simulation.tob = tob
+    simulation.no_new = no_new
+    simulation.set_prefetch(depth, max_bytes)
+    ## Same cells of the caller, the ones removed beyond the ghost cells
+    ## (e.g. by restrict) are removed on top of them
+    simulation.ghost.update_ghost_cells(
+        **{key: min(value, simulation.ghost.ghost)
+           for (key, value) in ghost_status.items()})
+    simulation.ghost.restrict(
+        **{key: max(value - simulation.ghost.ghost, 0)
+           for (key, value) in ghost_status.items()})
+    simulation.field_cache.set_blocks(blocks, nvar_first)
+    simulation.set_cache_size(cache_bytes)
+    simulation.set_file_pool(max_files, rdcc_nbytes)
+    for reducer in reducers:
+        reducer.simulation = simulation
+        reducer.setup()
+    _worker['simulation'] = simulation
+    _worker['reducers'] = reducers
+
+def _sweep_chunk(chunk):
+    simulation, reducers = _worker['simulation'], _worker['reducers']
+    results = []
+    snapshots = simulation.prefetch_snapshots([file for (_, file) in chunk])
+    try:
+        for ((findex, file), snapshot) in zip(chunk, snapshots):
+            simulation.load_snapshot(file, snapshot)
+            steps = []
+            for reducer in reducers:
+                if findex < reducer.start_point:
+                    steps.append(None)
+                else:
+                    steps.append(reducer.compute(file, findex))
+            results.append((findex, file, steps))
+    finally:
+        snapshots.close()
+        simulation.release_snapshot()
+    return results
@@ -33,55 +33,31 @@ def check_existence(simulation, file_name):
     
 def time_array(simulation):
     """
-    Get the time array of the local simulation output.
+    Get the time array of the local simulation output, from the time
+    index of the simulation. For supernova simulations the time is
+    corrected for the time of bounce.
     """
     from AeViz.units.aerray import aerray
-    from AeViz.utils.files.file_utils import save_hdf
     from AeViz.units import u
-    import numpy as np
-    import h5py
-    if check_existence(simulation, 'time.h5'):
-        data = h5py.File(os.path.join(simulation.storage_path, 'time.h5'), 'r')
-        time_array = aerray(data['time'][...], u.s, 'time', r'$t$', None,
-                            [None, None])
-        if 'processed' in data.keys():
-            processed_hdf = data['processed'][...]
-            processed_hdf = [ff.decode("utf-8") for ff in processed_hdf]
-            data.close()
-        else:
-            processed_hdf = simulation.hdf_file_list[:len(time_array)]
-            data.close()
-            save_hdf(os.path.join(simulation.storage_path, 'time.h5'),
-                    ['time', 'processed'], [time_array.value, processed_hdf])
-        
-        if processed_hdf[-1] == simulation.hdf_file_list[-1]:
-            return time_array
-        else:
-            start_time = len(processed_hdf)
-    else:
-        start_time = 0
-        processed_hdf = []
-    progress_index = 0
-    total_index = len(simulation.hdf_file_list[start_time:])
-    for file_name in simulation.hdf_file_list[start_time:]:
-        try:
-            time_array = np.concatenate((time_array,
-                                         simulation.time(file_name)))
-        except:
-            time_array = simulation.time(file_name)
-        progressBar(progress_index, total_index, 'Storing timeseries')
-        progress_index += 1
-        processed_hdf.append(file_name)
-    save_hdf(os.path.join(simulation.storage_path, 'time.h5'),
-             ['time', 'processed'], [time_array.value, processed_hdf])
+    time_array = aerray(simulation.time_index.times(simulation.hdf_file_list),
+                        u.s, 'time', r'$t$')
+    if simulation.GEOM == 2:
+        time_array = time_array - simulation.tob
     time_array.set('time', r'$t$', None, [None, None])
     return time_array
 
 def restart_from(simulation, file_name):
     def cut_and_replace_dset(group, key, index):
+        if group[key].ndim == 0:
+            return
+        if group[key].maxshape[-1] is None:
+            group[key].resize(min(index, group[key].shape[-1]),
+                              axis=group[key].ndim - 1)
+            return
         truncated_data = group[key][..., :index]
         del group[key]
-        group.create_dataset(key, data=truncated_data)
+        group.create_dataset(key, data=truncated_data, chunks=True,
+                             maxshape=truncated_data.shape[:-1] + (None,))
 
     def cut_recursively(group, index):
         keys = list(group.keys())  # Make a copy of keys to avoid iteration issues
@@ -98,6 +74,10 @@ def restart_from(simulation, file_name):
     hdf_flist = simulation.hdf_file_list
     for fl in flist:
         data = h5py.File(os.path.join(simulation.storage_path, fl), 'a')
+        ## Skip the files that are not checkpoints (e.g. the time index)
+        if 'time' not in data.keys():
+            data.close()
+            continue
         if not 'processed' in data.keys():
             data.create_dataset('processed',
                                 data=hdf_flist[:len(data['time'][...])])
@@ -0,0 +1,181 @@
+"""
+Regression tests of the vectorized shock radius detection against the
+loop implementation it replaced, on random synthetic profiles.
+"""
+import numpy as np
+import pytest
+from AeViz.units import aerray, u
+from AeViz.utils.math_utils import IDL_derivative
+from AeViz.utils.physics.radii_utils import (shock_radius_1D, shock_radius_2D,
+                                             shock_radius_3D, window_any)
+
+class _Cell:
+    def __init__(self, radius):
+        self.__radius = radius
+
+    def radius(self, ghost):
+        return self.__radius
+
+class _Profiles:
+    """
+    Simulation-like object returning the same synthetic profiles for any
+    file.
+    """
+    def __init__(self, rng, shape):
+        n = shape[-1]
+        self.ghost = None
+        self.cell = _Cell(aerray(np.sort(rng.uniform(1e6, 1e9, n)), u.cm,
+                                 'radius', r'$r$', None, [1e6, 1e9]))
+        self.__vr = aerray(rng.normal(0, 2e9, shape), u.cm / u.s)
+        self.__s = aerray(np.exp(rng.normal(1, 2, shape)),
+                          u.dimensionless_unscaled)
+        self.__p = aerray(np.exp(rng.normal(60, 5, shape)),
+                          u.erg / u.cm ** 3)
+        self.__cs = aerray(rng.uniform(1e7, 1e9, shape), u.cm / u.s)
+
+    def radial_velocity(self, file_name):
+        return self.__vr
+
+    def entropy(self, file_name):
+        return self.__s
+
+    def gas_pressure(self, file_name):
+        return self.__p
+
+    def soundspeed(self, file_name):
+        return self.__cs
+
+## Loop implementations replaced by the vectorized ones
+
+def _shock_radius_1D_loop(simulation, file_name, rmax):
+    r = simulation.cell.radius(simulation.ghost)
+    vr = simulation.radial_velocity(file_name)
+    s = simulation.entropy(file_name)
+    p = simulation.gas_pressure(file_name)
+    dS = IDL_derivative(r, s) * r / s
+    dvr = IDL_derivative(r, vr) * r / np.abs(vr)
+    dP = IDL_derivative(r, p) * r / p
+    for ir in range(len(dS) - 1):
+        if r[ir] > rmax:
+            continue
+        if dS[ir] < -7.5 and np.any(dvr[ir-5:ir+6] < -20) \
+            and dP[ir] < -10:
+            return r[ir]
+    return 0.0 * r.unit
+
+def _shock_radius_2D_loop(simulation, file_name, rmax):
+    vr = simulation.radial_velocity(file_name)
+    r = simulation.cell.radius(simulation.ghost)
+    p = simulation.gas_pressure(file_name)
+    dP = IDL_derivative(r, p) * r / p
+    dvr = IDL_derivative(r, vr) * r / np.abs(vr)
+    s = simulation.entropy(file_name)
+    shock_r = np.empty(dP.shape[0])
+    shock_r.fill(np.nan)
+    for it in range(dP.shape[0]):
+        for ir in reversed(range(dP.shape[1] - 1)):
+            if r[ir] > rmax:
+                continue
+            if (dP[it, ir] < -10) and \
+                (np.any(dvr[it, max(0,ir-5):min(ir+6, dP.shape[1]-1)] < -20)) \
+                and (np.abs(vr[it, ir]) > 1e8) and s[it, ir] < 400 :
+                shock_r[it] = r[ir]
+                break
+    if np.isnan(shock_r).all():
+        return np.zeros(dP.shape[0]) * r.unit
+    return shock_r * r.unit
+
+def _shock_radius_3D_loop(simulation, file_name, rmax):
+    r = simulation.cell.radius(simulation.ghost)
+    p = simulation.gas_pressure(file_name)
+    vr = simulation.radial_velocity(file_name)
+    entr = simulation.entropy(file_name)
+    dP = IDL_derivative(r, p) * np.abs(r / p)
+    dvr = IDL_derivative(r, vr) * r / np.abs(simulation.soundspeed(file_name))
+    ds = IDL_derivative(r, entr) * np.abs(r / entr)
+    shock_r = np.empty((dP.shape[0], dP.shape[1]))
+    shock_r.fill(np.nan)
+    for ip in range(dP.shape[0]):
+        for it in range(dP.shape[1]):
+            for ir in range(dP.shape[2] - 1):
+                if r[ir] > rmax:
+                    continue
+                ## The loop read vr[..., ir+10] past the last cell, where
+                ## it raised an IndexError; the last cell is used instead
+                if (ds[ip, it, ir] < -0.15) and \
+                    (vr[ip, it, ir] >= 1) and \
+                    (dvr[ip, it, ir] <= -0.7) and \
+                    (dP[ip, it, ir] <= -0.7) and \
+                    (vr[ip, it, max(0, ir-10)] >= vr[ip, it,
+                                                     min(vr.shape[2] - 1,
+                                                         ir+10)]):
+                    shock_r[ip, it] = r[ir]
+                    break
+    return shock_r * r.unit
+
+def _values(radius):
+    return np.atleast_1d(np.asarray(radius.value, dtype=float))
+
+def _rmax(rng, simulation):
+    radius = simulation.cell.radius(simulation.ghost)
+    return rng.choice([radius[-1].value, rng.uniform(radius[0].value,
+                                                     radius[-1].value)]) * \
+        radius.unit
+
+## Less than 12 cells put every window across both ends of the grid
+@pytest.mark.parametrize('n', [8, 12, 25, 60])
+@pytest.mark.parametrize('seed', range(20))
+def test_shock_radius_1D(seed, n):
+    rng = np.random.default_rng(seed)
+    simulation = _Profiles(rng, (n, ))
+    rmax = _rmax(rng, simulation)
+    np.testing.assert_array_equal(
+        _values(shock_radius_1D(simulation, None, rmax)),
+        _values(_shock_radius_1D_loop(simulation, None, rmax)))
+
+@pytest.mark.parametrize('n', [8, 12, 25, 60])
+@pytest.mark.parametrize('seed', range(20))
+def test_shock_radius_2D(seed, n):
+    rng = np.random.default_rng(seed)
+    simulation = _Profiles(rng, (16, n))
+    rmax = _rmax(rng, simulation)
+    np.testing.assert_array_equal(
+        _values(shock_radius_2D(simulation, None, rmax)),
+        _values(_shock_radius_2D_loop(simulation, None, rmax)))
+
+## Less than 22 cells put every window across both ends of the grid
+@pytest.mark.parametrize('n', [8, 21, 30, 60])
+@pytest.mark.parametrize('seed', range(10))
+def test_shock_radius_3D(seed, n):
+    rng = np.random.default_rng(seed)
+    simulation = _Profiles(rng, (6, 5, n))
+    rmax = _rmax(rng, simulation)
+    np.testing.assert_array_equal(
+        _values(shock_radius_3D(simulation, None, rmax)),
+        _values(_shock_radius_3D_loop(simulation, None, rmax)))
+
+def test_shock_radius_finds_shocks():
+    """
+    The random profiles do contain shocks, so that the comparisons
+    above are not only between empty results.
+    """
+    found = [0, 0, 0]
+    for seed in range(20):
+        rng = np.random.default_rng(seed)
+        for (i, (shape, detect)) in enumerate([((60, ), shock_radius_1D),
+                                               ((16, 60), shock_radius_2D),
+                                               ((6, 5, 60), shock_radius_3D)]):
+            simulation = _Profiles(rng, shape)
+            radius = simulation.cell.radius(simulation.ghost)
+            found[i] += np.count_nonzero(np.nan_to_num(_values(
+                detect(simulation, None, radius[-1]))))
+    assert all(found)
+
+def test_window_any():
+    rng = np.random.default_rng(0)
+    mask = rng.random((3, 20)) < 0.1
+    start = rng.integers(0, 21, 20)
+    stop = rng.integers(0, 21, 20)
+    expected = np.array([[mask[j, a:b].any() for (a, b) in zip(start, stop)]
+                         for j in range(3)])
+    np.testing.assert_array_equal(window_any(mask, start, stop), expected)
@@ -0,0 +1,100 @@
+"""
+Tests of the parallel sweeps against the serial ones, on a small
+synthetic 2D simulation.
+"""
+import os
+import numpy as np
+import h5py
+import f90nml
+import pytest
+from AeViz.simulation.simulation import Simulation
+from AeViz.utils.files.path_utils import local_storage_folder, pltf
+from AeViz.utils.physics.spherical_harmonics_radial import (
+    calculate_rho_decomposition, read_rho_decomposition)
+
+_GHOST = 4
+_HYDRO = ['I_RH', 'I_EN', 'I_VX', 'I_VY', 'I_VZ', 'I_YE']
+_THD = ['I_EOSERR', 'I_LRTZ', 'I_DENS', 'I_EINT', 'I_ENTH', 'I_PELE',
+        'I_TELE', 'I_NELE', 'I_PION', 'I_TION', 'I_NION', 'I_VELX', 'I_VELY',
+        'I_VELZ', 'I_TMPR', 'I_ENTR', 'I_GAMM', 'I_HEAT', 'I_DELP', 'I_SMOMX',
+        'I_SMOMY', 'I_SMOMZ', 'I_PGAS', 'I_CSND', 'I_BHEX']
+
+def _grid_file(path, name, edges):
+    n = len(edges) - 1
+    np.savetxt(os.path.join(path, 'grid', name),
+               np.column_stack([np.arange(1, n + 1), edges[:-1],
+                                0.5 * (edges[:-1] + edges[1:]), edges[1:]]))
+
+def _make_simulation(root, name, nr=40, nt=8, nfiles=6):
+    path = os.path.join(root, name)
+    for folder in ['pars', 'grid', 'outp-hdf', 'log']:
+        os.makedirs(os.path.join(path, folder))
+    indices = {key: i + 1 for (i, key) in enumerate(_HYDRO)}
+    indices.update({key: i + 1 for (i, key) in enumerate(_THD)})
+    f90nml.Namelist({
+        'VARSPARS': {'GEOMETRY': 2, 'EVOLVE_X': 1, 'EVOLVE_Y': 1,
+                     'EVOLVE_Z': 0, 'veldim': 3, 'entropie': 1,
+                     'tempratr': 1, 'y_edim': 1, 'comp_dim': 0,
+                     'cpot_dim': 0, 'neudim': 1, 'magdim': 1},
+        'GRIDPARS': {'STENCIL': _GHOST},
+        'IINDICES': indices,
+        'GRAVPARS': {'LAPSE_FORM': 0, 'MDPOT': 1},
+        'PHYSSYST': {'RELATIVISTIC': True},
+    }).write(os.path.join(path, 'pars', 'start.pars'))
+    r_edges = np.logspace(5, 9, nr + 2 * _GHOST + 1)
+    t_edges = np.linspace(-_GHOST, nt + _GHOST, nt + 2 * _GHOST + 1) * \
+        np.pi / nt
+    _grid_file(path, 'grid.x.dat', r_edges)
+    _grid_file(path, 'grid.y.dat', t_edges)
+    _grid_file(path, 'grid.z.dat', np.array([0, 2 * np.pi]))
+    _grid_file(path, 'grid.e.dat', np.logspace(0, 2.5, 7))
+    rng = np.random.default_rng(0)
+    shape = (1, nt + 2 * _GHOST, nr + 2 * _GHOST)
+    for (i, time) in enumerate(np.linspace(0.15, 0.45, nfiles)):
+        with h5py.File(os.path.join(path, 'outp-hdf', 'h%05d.h5' % i),
+                       'w') as data_h5:
+            data_h5['hydro/data'] = np.exp(rng.normal(25, 3, shape +
+                                                      (len(_HYDRO), )))
+            data_h5['thd/data'] = np.exp(rng.normal(0, 1, shape +
+                                                    (len(_THD), )))
+            data_h5['Parameters/t'] = np.array([time])
+    time = np.linspace(0, 0.5, 200)
+    np.savetxt(os.path.join(path, 'log', 'rho.dat'),
+               np.column_stack([np.arange(200), np.zeros(200), time,
+                                np.where(time < 0.2, 1e13, 3e14)]))
+
+@pytest.fixture
+def simulation_folder(tmp_path, monkeypatch):
+    """
+    Synthetic simulation, with the local storage folder inside the
+    temporary folder.
+    """
+    monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+    os.makedirs(tmp_path / 'home')
+    local_storage_folder(pltf())
+    for name in ['serial', 'parallel']:
+        _make_simulation(str(tmp_path / 'sims'), name)
+    return str(tmp_path / 'sims')
+
+def _rho_decomposition(simulation_folder, name, n_workers):
+    simulation = Simulation(name, simulation_folder, 2)
+    simulation.ghost.update_ghost_cells(r_l=1, r_r=2, t_l=3)
+    simulation.ghost.restrict(r_l=5)
+    simulation.set_cache_size(2**20)
+    simulation.set_file_pool(2)
+    simulation.set_workers(n_workers)
+    calculate_rho_decomposition(simulation)
+    time, decomposition, processed_hdf = read_rho_decomposition(simulation,
+                                                                4, False)
+    return simulation, np.asarray(time), np.asarray(decomposition)
+
+def test_parallel_sweep_ghost_cells(simulation_folder):
+    serial, serial_time, serial_decomposition = \
+        _rho_decomposition(simulation_folder, 'serial', 1)
+    parallel, parallel_time, parallel_decomposition = \
+        _rho_decomposition(simulation_folder, 'parallel', 2)
+    radius = serial.cell.radius(serial.ghost)
+    assert serial_decomposition.shape == (25, len(radius), 6)
+    np.testing.assert_array_equal(parallel_time, serial_time)
+    np.testing.assert_array_equal(parallel_decomposition,
+                                  serial_decomposition)